@@ -7,7 +7,12 @@ import io
 import csv
 from fastapi.responses import StreamingResponse
 
-from backend.models.pagination import Paginated, PaginationParams
+from backend.models.pagination import (
+    Paginated,
+    PaginationParams,
+    CursorPaginated,
+    CursorPaginationParams,
+)
 
 from ...services.academics import HiringService
 
@@ -184,6 +189,26 @@ def get_hiring_summary_overview(
     )
 
 
+@api.get("/summary/{term_id}/cursor", tags=["Hiring"])
+def get_hiring_summary_overview_by_cursor(
+    term_id: str,
+    cursor: str = "",
+    page_size: int = 100,
+    filter: str = "",
+    subject: User = Depends(registered_user),
+    hiring_service: HiringService = Depends(),
+) -> CursorPaginated[HiringAssignmentSummaryOverview]:
+    """
+    Returns a page of the state of hiring as a summary by cursor.
+    """
+    pagination_params = CursorPaginationParams(
+        cursor=cursor, page_size=page_size, filter=filter
+    )
+    return hiring_service.get_hiring_summary_overview_by_cursor(
+        subject, term_id, pagination_params
+    )
+
+
 @api.get("/summary/{term_id}/csv", tags=["Hiring"])
 def get_hiring_summary_csv(
     term_id: str,
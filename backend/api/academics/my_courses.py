@@ -20,7 +20,12 @@ from ...models.office_hours.course_site import (
     UpdatedCourseSite,
 )
 from ...models.office_hours.course_site_details import CourseSiteDetails
-from ...models.pagination import PaginationParams, Paginated
+from ...models.pagination import (
+    PaginationParams,
+    Paginated,
+    CursorPaginated,
+    CursorPaginationParams,
+)
 
 __authors__ = ["Kris Jordan", "Ajay Gandecha"]
 __copyright__ = "Copyright 2024"
@@ -86,6 +91,30 @@ def get_course_site_roster(
     )
 
 
+@api.get("/{course_site_id}/roster/cursor", tags=["My Courses"])
+def get_course_site_roster_by_cursor(
+    course_site_id: int,
+    cursor: str = "",
+    page_size: int = 10,
+    order_by: str = "",
+    filter: str = "",
+    subject: User = Depends(registered_user),
+    course_site_svc: CourseSiteService = Depends(),
+) -> CursorPaginated[CourseMemberOverview]:
+    """
+    Get a page of the roster for a course by cursor.
+
+    Returns:
+        CursorPaginated[CourseMemberOverview]
+    """
+    pagination_params = CursorPaginationParams(
+        cursor=cursor, page_size=page_size, order_by=order_by, filter=filter
+    )
+    return course_site_svc.get_course_site_roster_by_cursor(
+        subject, course_site_id, pagination_params
+    )
+
+
 @api.get("/{course_site_id}/oh-events/current", tags=["My Courses"])
 def get_current_oh_events(
     course_site_id: int,
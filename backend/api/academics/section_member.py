@@ -3,7 +3,7 @@
 from fastapi import APIRouter, Depends, HTTPException
 
 
-from ..authentication import registered_user
+from ..authentication import authenticated_pid, registered_user
 
 from ...models.academics.section_member import SectionMember
 from ...models.academics.section_member_details import SectionMemberDetails
@@ -29,13 +29,16 @@ openapi_tags = {
 @api.get("/{id}", response_model=SectionMember, tags=["Academics"])
 def get_section_member_by_id(
     id: int,
-    subject: User = Depends(registered_user),
+    _pid_onyen: tuple[int, str] = Depends(authenticated_pid),
     section_member_svc: SectionMemberService = Depends(),
 ) -> SectionMember:
     """
+    The SectionMember is not specific to the subject, so only the bearer token's claims are
+    needed, without loading the subject from the database.
+
     Args:
         id (int): The unique identifier of the SectionMember.
-        subject (User): The currently logged-in user.
+        _pid_onyen (tuple[int, str]): The PID and Onyen of the authenticated user.
         section_member_svc (SectionMemberService): Service dependency to interact with Section Membership data.
 
     Returns:
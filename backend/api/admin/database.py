@@ -0,0 +1,31 @@
+"""Diagnostics of the database connection pool.
+
+This API is for administrative purposes only."""
+
+from fastapi import APIRouter, Depends
+from ...database import engine
+from ...services import PermissionService
+from ...models import User, PoolStats
+from ..authentication import registered_user
+
+
+__authors__ = ["Kris Jordan"]
+__copyright__ = "Copyright 2024"
+__license__ = "MIT"
+
+openapi_tags = {
+    "name": "(Admin) Database",
+    "description": "Diagnostics of the database connection pool.",
+}
+
+api = APIRouter(prefix="/api/admin/database")
+
+
+@api.get("/pool", tags=["(Admin) Database"])
+def get_pool_stats(
+    subject: User = Depends(registered_user),
+    permission_service: PermissionService = Depends(),
+) -> PoolStats:
+    """Occupancy of the connection pool in the serving process and the time checkouts waited."""
+    permission_service.enforce(subject, "database.pool", "database/")
+    return engine.pool.telemetry.snapshot(engine.pool)
@@ -0,0 +1,38 @@
+"""Diagnostics of the permission system.
+
+This API is for administrative purposes only."""
+
+from fastapi import APIRouter, Depends
+from ...services import PermissionService
+from ...models import User, CacheStats, PermissionMetrics
+from ..authentication import registered_user
+
+
+__authors__ = ["Kris Jordan"]
+__copyright__ = "Copyright 2024"
+__license__ = "MIT"
+
+openapi_tags = {
+    "name": "(Admin) Permissions",
+    "description": "Diagnostics of the permissions granted to users and roles.",
+}
+
+api = APIRouter(prefix="/api/admin/permissions")
+
+
+@api.get("/cache", tags=["(Admin) Permissions"])
+def get_permission_cache_stats(
+    subject: User = Depends(registered_user),
+    permission_service: PermissionService = Depends(),
+) -> CacheStats:
+    """Hit and miss counters of the compiled permissions cache in the serving process."""
+    return permission_service.get_cache_stats(subject)
+
+
+@api.get("/metrics", tags=["(Admin) Permissions"])
+def get_permission_metrics(
+    subject: User = Depends(registered_user),
+    permission_service: PermissionService = Depends(),
+) -> list[PermissionMetrics]:
+    """Permission checks, permission queries, and matching time of each route in the serving process."""
+    return permission_service.get_metrics(subject)
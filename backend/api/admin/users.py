@@ -2,7 +2,14 @@
 
 from fastapi import APIRouter, Depends, HTTPException
 from ...services import UserService, UserPermissionException
-from ...models import User, Paginated, PaginationParams
+from ...models import (
+    User,
+    Paginated,
+    PaginationParams,
+    CursorPaginated,
+    CursorPaginationParams,
+    CacheStats,
+)
 from ..authentication import registered_user
 
 
@@ -35,3 +42,28 @@ def list_users(
         return user_service.list(subject, pagination_params)
     except UserPermissionException as e:
         raise HTTPException(status_code=403, detail=str(e))
+
+
+@api.get("/cursor", tags=["(Admin) Users"])
+def list_users_by_cursor(
+    subject: User = Depends(registered_user),
+    user_service: UserService = Depends(),
+    cursor: str = "",
+    page_size: int = 10,
+    order_by: str = "first_name",
+    filter: str = "",
+) -> CursorPaginated[User]:
+    """List users a page at a time via cursor pagination query parameters."""
+    pagination_params = CursorPaginationParams(
+        cursor=cursor, page_size=page_size, order_by=order_by, filter=filter
+    )
+    return user_service.list_by_cursor(subject, pagination_params)
+
+
+@api.get("/cache", tags=["(Admin) Users"])
+def get_authenticated_user_cache_stats(
+    subject: User = Depends(registered_user),
+    user_service: UserService = Depends(),
+) -> CacheStats:
+    """Hit ratio and lookup latency of the authenticated user cache in the serving process."""
+    return user_service.get_authenticated_cache_stats(subject)
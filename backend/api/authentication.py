@@ -56,11 +56,26 @@ In development, the proxy is not present. Instead, there are two options for aut
 Finally, the `authenticated_pid` function ensures a user is authenticated with PID and Onyen, 
 but does not require that the user be registered in the database. This is only really useful 
 for routes used in the process of registering a user.
+
+Routes declare how much of the user they need by the dependency they use:
+
+    `authenticated_pid`
+        Claims only: the PID and Onyen of the bearer token, without a database query.
+
+    `registered_user`
+        A registered user, served from a short-lived, process-wide cache.
+
+    `fresh_registered_user`
+        A registered user loaded from the database, for routes that modify the user.
+
+Decoded bearer tokens are cached for the lifetime of the token, so repeated requests with the
+same token verify its signature only once per process.
 """
 
 import jwt
 import requests
 from datetime import datetime, timedelta
+from time import time
 from fastapi import APIRouter, Header, HTTPException, Request, Response, Depends
 from fastapi.exceptions import HTTPException
 from fastapi.security import HTTPBearer
@@ -68,6 +83,7 @@ from fastapi.security.http import HTTPAuthorizationCredentials
 from fastapi.responses import RedirectResponse
 from ..env import getenv
 from ..services import UserService, GitHubService
+from ..services.cache import TTLCache
 from ..models import User
 
 
@@ -83,17 +99,42 @@ _JWT_SECRET = getenv("JWT_SECRET")
 _JST_ALGORITHM = "HS256"
 
 
-def registered_user(
-    user_service: UserService = Depends(),
-    token: HTTPAuthorizationCredentials | None = Depends(HTTPBearer()),
+_TOKEN_LIFETIME = timedelta(days=90)
+
+decoded_tokens: TTLCache[str, dict] = TTLCache(
+    "auth.decoded_tokens", ttl=_TOKEN_LIFETIME, maxsize=4096
+)
+"""Claims of verified bearer tokens, keyed by the encoded token.
+
+Entries are checked against the token's own expiration on every use, so a cached token is never
+accepted after it expires."""
+
+
+def _decode_token(credentials: str) -> dict:
+    """Returns the claims of a bearer token, verifying its signature only if not yet cached.
+
+    Raises:
+        jwt.exceptions.InvalidTokenError: If the token is invalid or expired.
+    """
+    claims = decoded_tokens.get_or_compute(
+        credentials,
+        lambda: jwt.decode(credentials, _JWT_SECRET, algorithms=[_JST_ALGORITHM]),
+    )
+    if "exp" in claims and claims["exp"] <= time():
+        decoded_tokens.invalidate(credentials)
+        raise jwt.exceptions.ExpiredSignatureError("Signature has expired")
+    return claims
+
+
+def _user_of_token(
+    user_service: UserService,
+    token: HTTPAuthorizationCredentials | None,
+    fresh: bool,
 ) -> User:
-    """Returns the authenticated user or raises a 401 HTTPException if the user is not authenticated."""
     if token:
         try:
-            auth_info = jwt.decode(
-                token.credentials, _JWT_SECRET, algorithms=[_JST_ALGORITHM]
-            )
-            user = user_service.get(auth_info["pid"])
+            auth_info = _decode_token(token.credentials)
+            user = user_service.get_authenticated(auth_info["pid"], fresh=fresh)
             if user:
                 return user
         except:
@@ -101,17 +142,34 @@ def registered_user(
     raise HTTPException(status_code=401, detail="Unauthorized")
 
 
+def registered_user(
+    user_service: UserService = Depends(),
+    token: HTTPAuthorizationCredentials | None = Depends(HTTPBearer()),
+) -> User:
+    """Returns the authenticated user or raises a 401 HTTPException if the user is not authenticated.
+
+    The user may be served from a cache up to 30 seconds old. Routes that modify the user should
+    depend on `fresh_registered_user` instead."""
+    return _user_of_token(user_service, token, fresh=False)
+
+
+def fresh_registered_user(
+    user_service: UserService = Depends(),
+    token: HTTPAuthorizationCredentials | None = Depends(HTTPBearer()),
+) -> User:
+    """Returns the authenticated user loaded from the database or raises a 401 HTTPException if the user is not authenticated."""
+    return _user_of_token(user_service, token, fresh=True)
+
+
 def authenticated_pid(
     token: HTTPAuthorizationCredentials | None = Depends(HTTPBearer()),
 ) -> tuple[int, str]:
     """Returns the authenticated user's PID and Onyen or raises a 401 HTTPException if the user is not authenticated."""
     if token:
         try:
-            auth_info = jwt.decode(
-                token.credentials, _JWT_SECRET, algorithms=[_JST_ALGORITHM]
-            )
+            auth_info = _decode_token(token.credentials)
             return int(auth_info["pid"]), auth_info["uid"]
-        except jwt.exceptions.InvalidSignatureError:
+        except jwt.exceptions.InvalidTokenError:
             ...
     raise HTTPException(status_code=401, detail="Unauthorized")
 
@@ -199,7 +257,7 @@ def github_oauth(code: str):
 @api.post("/oauth/github", include_in_schema=False)
 def github_link(
     code: str,
-    subject: User = Depends(registered_user),
+    subject: User = Depends(fresh_registered_user),
     github_service: GitHubService = Depends(),
 ):
     """Link the user's GitHub account with their CSXL account."""
@@ -212,7 +270,8 @@ def github_link(
 
 @api.delete("/oauth/github", include_in_schema=False)
 def github_unlink(
-    subject: User = Depends(registered_user), github_service: GitHubService = Depends()
+    subject: User = Depends(fresh_registered_user),
+    github_service: GitHubService = Depends(),
 ):
     """Unlink user's GitHub account with their CSXL account."""
     github_service.remove_association(subject)
@@ -265,7 +324,7 @@ def _handle_auth_in_production(
 
 def _generate_token(uid: any, pid: any):
     token = jwt.encode(
-        {"uid": uid, "pid": pid, "exp": datetime.now() + timedelta(days=90)},
+        {"uid": uid, "pid": pid, "exp": datetime.now() + _TOKEN_LIFETIME},
         _JWT_SECRET,
         algorithm=_JST_ALGORITHM,
     )
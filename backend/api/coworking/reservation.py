@@ -4,7 +4,7 @@ This API is used to make and manage reservations."""
 
 from fastapi import APIRouter, Depends, HTTPException
 from typing import Sequence
-from datetime import datetime
+from datetime import datetime, timedelta
 
 from backend.models.room import Room
 from ..authentication import registered_user
@@ -15,7 +15,7 @@ from ...models.coworking import (
     ReservationRequest,
     ReservationPartial,
     ReservationState,
-    ReservationMapDetails
+    ReservationMapDetails,
 )
 
 __authors__ = ["Kris Jordan, Yuvraj Jain"]
@@ -74,12 +74,32 @@ def cancel_reservation(
 @api.get("/room-reservation/", tags=["Coworking"])
 def get_reservations_for_rooms_by_date(
     date: datetime,
+    slot_minutes: int = 30,
     subject: User = Depends(registered_user),
     reservation_svc: ReservationService = Depends(),
 ) -> ReservationMapDetails:
-    """See available rooms for any given day."""
+    """See available rooms for any given day, in time slots of `slot_minutes` minutes."""
     try:
-        return reservation_svc.get_map_reserved_times_by_date(date, subject)
+        return reservation_svc.get_map_reserved_times_by_date(
+            date, subject, timedelta(minutes=slot_minutes)
+        )
+    except Exception as e:
+        raise HTTPException(status_code=404, detail=str(e))
+
+
+@api.get("/room-reservation/range", tags=["Coworking"])
+def get_reservations_for_rooms_by_date_range(
+    start: datetime,
+    days: int = 7,
+    slot_minutes: int = 30,
+    subject: User = Depends(registered_user),
+    reservation_svc: ReservationService = Depends(),
+) -> list[ReservationMapDetails]:
+    """See available rooms for each of `days` consecutive days beginning with `start`."""
+    try:
+        return reservation_svc.get_map_reserved_times_by_date_range(
+            start, days, subject, timedelta(minutes=slot_minutes)
+        )
     except Exception as e:
         raise HTTPException(status_code=404, detail=str(e))
 
@@ -5,7 +5,7 @@ This API is used to retrieve and update a user's profile."""
 from fastapi import APIRouter, Depends
 from ..authentication import registered_user
 from ...services.coworking import StatusService
-from ...models import User
+from ...models import User, CacheStats
 from ...models.coworking import Status
 
 __authors__ = ["Kris Jordan"]
@@ -31,3 +31,11 @@ def get_coworking_status(
     Finally, it provides a list of upcoming hours.
     """
     return status_svc.get_coworking_status(subject)
+
+
+@api.get("/cache", tags=["Coworking"])
+def get_coworking_status_cache_stats(
+    subject: User = Depends(registered_user), status_svc: StatusService = Depends()
+) -> CacheStats:
+    """Hit and miss counters of the shared XL status snapshot in the serving process."""
+    return status_svc.get_cache_stats(subject)
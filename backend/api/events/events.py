@@ -2,11 +2,20 @@
 
 Event routes are used to create, retrieve, and update Events."""
 
+import csv
+import io
 from fastapi import APIRouter, Depends, HTTPException
+from fastapi.responses import StreamingResponse
 from datetime import datetime, timedelta
-from typing import Sequence
+from typing import Iterator, Literal, Sequence
 from backend.models.public_user import PublicUser
-from backend.models.pagination import EventPaginationParams, Paginated, PaginationParams
+from backend.models.pagination import (
+    EventPaginationParams,
+    Paginated,
+    PaginationParams,
+    CursorPaginated,
+    EventCursorPaginationParams,
+)
 
 from backend.services.organization import OrganizationService
 
@@ -14,6 +23,7 @@ from ...services.event import EventService
 from ...services.user import UserService
 from ...services.exceptions import ResourceNotFoundException, UserPermissionException
 from ...models.event import EventDraft, EventOverview, EventStatusOverview
+from ...models.event_registration import EventRegistrationExportRow
 from ...models.coworking.time_range import TimeRange
 from ...api.authentication import registered_user
 from ...models.user import User
@@ -34,6 +44,9 @@ openapi_tags = {
     "description": "Create, update, delete, and retrieve CS Events.",
 }
 
+EXPORT_CHUNK_SIZE = 64 * 1024
+"""Approximate number of characters of an export sent at a time."""
+
 
 @api.get("/unauthenticated/paginate", tags=["Events"])
 def list_events(
@@ -78,6 +91,57 @@ def list_events(
     return event_service.get_paginated_events(pagination_params, subject)
 
 
+@api.get("/unauthenticated/paginate/cursor", tags=["Events"])
+def list_events_by_cursor_unauthenticated(
+    event_service: EventService = Depends(),
+    cursor: str = "",
+    page_size: int = 10,
+    order_by: str = "start",
+    ascending: str = "true",
+    filter: str = "",
+    range_start: str = "",
+    range_end: str = "",
+) -> CursorPaginated[EventOverview]:
+    """List events in time range a page at a time via cursor pagination query parameters."""
+
+    pagination_params = EventCursorPaginationParams(
+        cursor=cursor,
+        page_size=page_size,
+        order_by=order_by,
+        ascending=ascending,
+        filter=filter,
+        range_start=range_start,
+        range_end=range_end,
+    )
+    return event_service.get_events_by_cursor(pagination_params, None)
+
+
+@api.get("/paginate/cursor", tags=["Events"])
+def list_events_by_cursor(
+    subject: User = Depends(registered_user),
+    event_service: EventService = Depends(),
+    cursor: str = "",
+    page_size: int = 10,
+    order_by: str = "start",
+    ascending: str = "true",
+    filter: str = "",
+    range_start: str = "",
+    range_end: str = "",
+) -> CursorPaginated[EventOverview]:
+    """List events in time range a page at a time via cursor pagination query parameters."""
+
+    pagination_params = EventCursorPaginationParams(
+        cursor=cursor,
+        page_size=page_size,
+        order_by=order_by,
+        ascending=ascending,
+        filter=filter,
+        range_start=range_start,
+        range_end=range_end,
+    )
+    return event_service.get_events_by_cursor(pagination_params, subject)
+
+
 @api.get("/unauthenticated/status", tags=["Events"])
 def get_status(
     event_service: EventService = Depends(),
@@ -310,3 +374,71 @@ def get_registered_users_of_event(
         )
     except UserPermissionException as e:
         raise HTTPException(status_code=403, detail=str(e))
+
+
+@api.get("/{event_id}/registrations/export", tags=["Events"])
+def export_event_registrations(
+    event_id: int,
+    format: Literal["csv", "ndjson"] = "csv",
+    subject: User = Depends(registered_user),
+    event_service: EventService = Depends(),
+) -> StreamingResponse:
+    """
+    Export the registrations of an event as CSV or newline-delimited JSON.
+
+    The export is streamed as registrations are read, so it may be used for events with any
+    number of registrations.
+
+    Args:
+        event_id: an int representing a unique Event
+        format: the format of the export, either `csv` or `ndjson`
+        subject: a valid User model representing the currently logged in User
+        event_service: a valid EventService
+
+    Returns:
+        StreamingResponse: The registrations of the event, as an attachment
+    """
+    rows = event_service.export_registrations(subject, event_id)
+    if format == "csv":
+        response = StreamingResponse(_csv_chunks(rows), media_type="text/csv")
+    else:
+        response = StreamingResponse(
+            _ndjson_chunks(rows), media_type="application/x-ndjson"
+        )
+    response.headers["Content-Disposition"] = (
+        f"attachment; filename=event-{event_id}-registrations.{format}"
+    )
+    return response
+
+
+def _csv_chunks(rows: Iterator[EventRegistrationExportRow]) -> Iterator[str]:
+    """Writes rows as CSV with a header, yielding the output a chunk at a time."""
+    buffer = io.StringIO()
+    writer = csv.DictWriter(
+        buffer, fieldnames=list(EventRegistrationExportRow.model_fields)
+    )
+    writer.writeheader()
+    for row in rows:
+        writer.writerow(row.model_dump(mode="json"))
+        if buffer.tell() >= EXPORT_CHUNK_SIZE:
+            yield _drain(buffer)
+    yield _drain(buffer)
+
+
+def _ndjson_chunks(rows: Iterator[EventRegistrationExportRow]) -> Iterator[str]:
+    """Writes rows as newline-delimited JSON, yielding the output a chunk at a time."""
+    buffer = io.StringIO()
+    for row in rows:
+        buffer.write(row.model_dump_json())
+        buffer.write("\n")
+        if buffer.tell() >= EXPORT_CHUNK_SIZE:
+            yield _drain(buffer)
+    yield _drain(buffer)
+
+
+def _drain(buffer: io.StringIO) -> str:
+    """Returns the contents of a buffer and empties it."""
+    chunk = buffer.getvalue()
+    buffer.seek(0)
+    buffer.truncate()
+    return chunk
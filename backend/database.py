@@ -1,8 +1,11 @@
 """SQLAlchemy DB Engine and Session niceties for FastAPI dependency injection."""
 
+from typing import Any
+
 import sqlalchemy
 from sqlalchemy.orm import Session
 from .env import getenv
+from .pool_telemetry import InstrumentedQueuePool
 
 __authors__ = ["Kris Jordan"]
 __copyright__ = "Copyright 2023"
@@ -24,7 +27,33 @@ def _in_production() -> bool:
     return getenv("MODE") == "production"
 
 
-engine = sqlalchemy.create_engine(_engine_str(), echo=not _in_production())
+def _pool_options() -> dict[str, Any]:
+    """Helper function for reading the connection pool's settings from environment variables.
+
+    Each setting defaults to SQLAlchemy's own default when its variable is undefined. Each worker
+    process has its own pool, so a deployment opens up to `workers * (POSTGRES_POOL_SIZE +
+    POSTGRES_MAX_OVERFLOW)` connections, which must stay below the server's `max_connections`.
+    """
+    options: dict[str, Any] = {
+        "poolclass": InstrumentedQueuePool,
+        "pool_size": int(getenv("POSTGRES_POOL_SIZE", "5")),
+        "max_overflow": int(getenv("POSTGRES_MAX_OVERFLOW", "10")),
+        "pool_timeout": float(getenv("POSTGRES_POOL_TIMEOUT", "30")),
+        "pool_recycle": int(getenv("POSTGRES_POOL_RECYCLE", "-1")),
+        "pool_pre_ping": getenv("POSTGRES_POOL_PRE_PING", "false").lower() == "true",
+    }
+    statement_timeout = int(getenv("POSTGRES_STATEMENT_TIMEOUT", "0"))
+    if statement_timeout > 0:
+        # Milliseconds a statement may run before Postgres cancels it, set per connection.
+        options["connect_args"] = {
+            "options": f"-c statement_timeout={statement_timeout}"
+        }
+    return options
+
+
+engine = sqlalchemy.create_engine(
+    _engine_str(), echo=not _in_production(), **_pool_options()
+)
 """Application-level SQLAlchemy database engine."""
 
 
@@ -18,12 +18,14 @@ from .user_entity import UserEntity
 from .role_entity import RoleEntity
 from .permission_entity import PermissionEntity
 from .user_role_table import user_role_table
+from .user_effective_permission_entity import UserEffectivePermissionEntity
 
 from .room_entity import RoomEntity
 
 from .organization_entity import OrganizationEntity
 from .event_entity import EventEntity
 from .event_registration_entity import EventRegistrationEntity
+from .trigram_indexes import TRIGRAM_INDEXED_COLUMNS
 
 from .application_entity import ApplicationEntity
 from .section_application_table import section_application_table
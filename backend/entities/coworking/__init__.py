@@ -1,4 +1,5 @@
 from .operating_hours_entity import OperatingHoursEntity
 from .reservation_entity import ReservationEntity
 from .reservation_seat_table import reservation_seat_table
+from .room_reservation_usage_entity import RoomReservationUsageEntity
 from .seat_entity import SeatEntity
@@ -0,0 +1,132 @@
+"""Definition of the ledger of room reservation time counted against each user's weekly room limit."""
+
+from datetime import date, timedelta
+from sqlalchemy import DDL, Date, ForeignKey, Interval, Select, event, func, select
+from sqlalchemy.orm import Mapped, mapped_column
+from ..entity_base import EntityBase
+
+__authors__ = ["Kris Jordan"]
+__copyright__ = "Copyright 2024"
+__license__ = "MIT"
+
+
+class RoomReservationUsageEntity(EntityBase):
+    """Serves as the database model schema defining the shape of the `coworking__room_reservation_usage` table.
+
+    Each row totals the duration of a user's room reservations starting on a day that count against
+    the weekly room limit, which are those neither cancelled nor checked out. Rows are maintained by
+    database triggers on the `coworking__reservation` and `coworking__reservation_user` tables, so
+    the table is never written to directly, except when `RECONCILE` rebuilds it."""
+
+    # Name for the room reservation usage table in the PostgreSQL database
+    __tablename__ = "coworking__room_reservation_usage"
+
+    # The user the reservations are for
+    user_id: Mapped[int] = mapped_column(
+        ForeignKey("user.id", ondelete="CASCADE"), primary_key=True
+    )
+    # The day the reservations start on
+    day: Mapped[date] = mapped_column(Date, primary_key=True)
+    # The total duration of the reservations
+    duration: Mapped[timedelta] = mapped_column(Interval, nullable=False)
+
+    @classmethod
+    def usage(cls, user_id: int, first_day: date, last_day: date) -> Select:
+        """Selects a user's total room reservation time on the days from `first_day` to `last_day`.
+
+        The days are read from the primary key, so the lookup reads at most one row per day.
+        """
+        return select(func.sum(cls.duration)).where(
+            cls.user_id == user_id, cls.day.between(first_day, last_day)
+        )
+
+
+COUNTED = "{0}.room_id IS NOT NULL AND {0}.state NOT IN ('CANCELLED', 'CHECKED_OUT')"
+"""SQL condition on a reservation row whether it counts against the weekly room limit."""
+
+SYNC_ON_RESERVATION = f"""
+CREATE OR REPLACE FUNCTION coworking__room_reservation_usage__on_reservation() RETURNS trigger AS $$
+BEGIN
+    IF {COUNTED.format('OLD')} THEN
+        UPDATE coworking__room_reservation_usage AS usage
+        SET duration = usage.duration - (OLD."end" - OLD.start)
+        FROM coworking__reservation_user AS party
+        WHERE party.reservation_id = OLD.id
+            AND usage.user_id = party.user_id
+            AND usage.day = CAST(OLD.start AS date);
+    END IF;
+    IF TG_OP = 'DELETE' THEN
+        RETURN OLD;
+    END IF;
+    IF {COUNTED.format('NEW')} THEN
+        INSERT INTO coworking__room_reservation_usage (user_id, day, duration)
+        SELECT party.user_id, CAST(NEW.start AS date), NEW."end" - NEW.start
+        FROM coworking__reservation_user AS party WHERE party.reservation_id = NEW.id
+        ON CONFLICT (user_id, day) DO UPDATE
+        SET duration = coworking__room_reservation_usage.duration + EXCLUDED.duration;
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE OR REPLACE TRIGGER coworking__room_reservation_usage__reservation
+AFTER UPDATE OF state, start, "end", room_id ON coworking__reservation
+FOR EACH ROW EXECUTE FUNCTION coworking__room_reservation_usage__on_reservation();
+
+CREATE OR REPLACE TRIGGER coworking__room_reservation_usage__reservation_delete
+BEFORE DELETE ON coworking__reservation
+FOR EACH ROW EXECUTE FUNCTION coworking__room_reservation_usage__on_reservation();
+"""
+"""Moves the time of a reservation whose state, time, or room changes, for every user it is for.
+
+Deleted reservations are subtracted before they are deleted, while their users are still linked.
+Inserted reservations have no users yet, so they are counted as their users are linked."""
+
+SYNC_ON_RESERVATION_USER = f"""
+CREATE OR REPLACE FUNCTION coworking__room_reservation_usage__on_reservation_user() RETURNS trigger AS $$
+BEGIN
+    IF TG_OP = 'DELETE' THEN
+        UPDATE coworking__room_reservation_usage AS usage
+        SET duration = usage.duration - (reservation."end" - reservation.start)
+        FROM coworking__reservation AS reservation
+        WHERE reservation.id = OLD.reservation_id
+            AND {COUNTED.format('reservation')}
+            AND usage.user_id = OLD.user_id
+            AND usage.day = CAST(reservation.start AS date);
+    ELSE
+        INSERT INTO coworking__room_reservation_usage (user_id, day, duration)
+        SELECT NEW.user_id, CAST(reservation.start AS date), reservation."end" - reservation.start
+        FROM coworking__reservation AS reservation
+        WHERE reservation.id = NEW.reservation_id AND {COUNTED.format('reservation')}
+        ON CONFLICT (user_id, day) DO UPDATE
+        SET duration = coworking__room_reservation_usage.duration + EXCLUDED.duration;
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE OR REPLACE TRIGGER coworking__room_reservation_usage__reservation_user
+AFTER INSERT OR DELETE ON coworking__reservation_user
+FOR EACH ROW EXECUTE FUNCTION coworking__room_reservation_usage__on_reservation_user();
+"""
+"""Adds or subtracts the time of a reservation as its users are linked or unlinked."""
+
+RECONCILE = f"""
+LOCK TABLE coworking__room_reservation_usage IN EXCLUSIVE MODE;
+DELETE FROM coworking__room_reservation_usage;
+INSERT INTO coworking__room_reservation_usage (user_id, day, duration)
+SELECT party.user_id, CAST(reservation.start AS date), sum(reservation."end" - reservation.start)
+FROM coworking__reservation AS reservation
+JOIN coworking__reservation_user AS party ON party.reservation_id = reservation.id
+WHERE {COUNTED.format('reservation')}
+GROUP BY party.user_id, CAST(reservation.start AS date);
+"""
+"""Rebuilds the ledger from the reservation rows.
+
+The lock waits for transactions that have already updated the ledger to finish and keeps the
+triggers of others from updating it until the rebuild commits, so no change is lost or counted
+twice. Days whose reservations have all left the limit are dropped."""
+
+# The triggers are installed once every table they reference exists.
+event.listen(EntityBase.metadata, "after_create", DDL(SYNC_ON_RESERVATION))
+event.listen(EntityBase.metadata, "after_create", DDL(SYNC_ON_RESERVATION_USER))
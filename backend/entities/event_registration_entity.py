@@ -1,6 +1,6 @@
 """Definition of SQLAlchemy table-backed object mapping entity for Event Registrations."""
 
-from sqlalchemy import ForeignKey
+from sqlalchemy import ForeignKey, Update, func, select, update
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from backend.entities.event_entity import EventEntity
@@ -63,6 +63,27 @@ class EventRegistrationEntity(EntityBase):
             registration_type=model.registration_type,
         )
 
+    @classmethod
+    def recount_registrations(cls) -> Update:
+        """
+        Class method that creates a statement recounting the attendees registered for every event
+
+        The EventService keeps each event's `number_registered` in step with the registrations it
+        creates and deletes, so registrations inserted directly must be followed by this statement.
+
+        Returns:
+            Update: Statement updating the `number_registered` of every event
+        """
+        attendees = (
+            select(func.count())
+            .where(
+                cls.event_id == EventEntity.id,
+                cls.registration_type == RegistrationType.ATTENDEE,
+            )
+            .scalar_subquery()
+        )
+        return update(EventEntity).values(number_registered=attendees)
+
     def to_model(self) -> EventRegistration:
         """
         Converts an `EventRegistrationEntity` into an `EventRegistration` model object
@@ -0,0 +1,54 @@
+"""Trigram indexes accelerating substring search of the text columns searched by the services.
+
+A B-tree index cannot answer `ILIKE '%query%'`, so without these indexes every search scans its
+whole table. The pg_trgm extension indexes the three-character substrings of each value, letting
+Postgres find the rows containing a query of three or more characters with a bitmap index scan.
+
+The indexes are only created when the database server ships the pg_trgm extension. Searches
+behave the same either way; they are only slower without the indexes.
+"""
+
+from sqlalchemy import DDL, event, text
+from .entity_base import EntityBase
+
+__authors__ = ["Kris Jordan"]
+__copyright__ = "Copyright 2024"
+__license__ = "MIT"
+
+
+TRIGRAM_INDEXED_COLUMNS: dict[str, dict[str, str]] = {
+    "user": {
+        "first_name": "first_name",
+        "last_name": "last_name",
+        "onyen": "onyen",
+        "email": "email",
+        "pid": "CAST(pid AS VARCHAR)",
+    },
+    "event": {"name": "name", "description": "description"},
+    "organization": {"name": "name", "slug": "slug"},
+}
+"""The expressions indexed in each table, by the name of the column they search."""
+
+
+def _pg_trgm_available(ddl, target, bind, **kw) -> bool:
+    """Whether the database server the metadata is being created in ships pg_trgm."""
+    return (
+        bind.execute(
+            text("SELECT 1 FROM pg_available_extensions WHERE name = 'pg_trgm'")
+        ).first()
+        is not None
+    )
+
+
+CREATE_TRIGRAM_INDEXES = "CREATE EXTENSION IF NOT EXISTS pg_trgm;\n" + "\n".join(
+    f'CREATE INDEX IF NOT EXISTS {table}__{column}_trgm_idx ON "{table}" '
+    f"USING gin (({expression}) gin_trgm_ops);"
+    for table, columns in TRIGRAM_INDEXED_COLUMNS.items()
+    for column, expression in columns.items()
+)
+
+event.listen(
+    EntityBase.metadata,
+    "after_create",
+    DDL(CREATE_TRIGRAM_INDEXES).execute_if(callable_=_pg_trgm_available),
+)
@@ -0,0 +1,139 @@
+"""Definition of the table flattening the permissions each user holds directly and through their roles."""
+
+from sqlalchemy import (
+    DDL,
+    Computed,
+    ForeignKey,
+    Index,
+    Select,
+    String,
+    event,
+    literal,
+    select,
+)
+from sqlalchemy.orm import Mapped, mapped_column
+from .entity_base import EntityBase
+
+__authors__ = ["Kris Jordan"]
+__copyright__ = "Copyright 2024"
+__license__ = "MIT"
+
+
+def _like_pattern(column: str) -> str:
+    """SQL expression translating a permission glob pattern into an equivalent LIKE pattern."""
+    escaped = (
+        f"replace(replace(replace({column}, '\\', '\\\\'), '%', '\\%'), '_', '\\_')"
+    )
+    return f"replace({escaped}, '*', '%')"
+
+
+class UserEffectivePermissionEntity(EntityBase):
+    """Serves as the database model schema defining the shape of the `user_effective_permission` table.
+
+    Each row pairs a user with a permission they hold, either granted to them directly or to one of
+    their roles. Rows are maintained by database triggers on the `permission` and `user_role` tables,
+    so the table is never written to directly."""
+
+    # Name for the user effective permission table in the PostgreSQL database
+    __tablename__ = "user_effective_permission"
+    __table_args__ = (
+        Index(
+            "ix_user_effective_permission__by_resource_prefix",
+            "resource_prefix",
+            "action_like",
+            "resource_like",
+            "user_id",
+        ),
+    )
+
+    # The user holding the permission
+    user_id: Mapped[int] = mapped_column(
+        ForeignKey("user.id", ondelete="CASCADE"), primary_key=True
+    )
+    # The permission held, removed along with the permission
+    permission_id: Mapped[int] = mapped_column(
+        ForeignKey("permission.id", ondelete="CASCADE"), primary_key=True
+    )
+    # Copies of the permission's patterns, so a user's permissions are read without a join
+    action: Mapped[str] = mapped_column(String)
+    resource: Mapped[str] = mapped_column(String)
+    # The patterns as LIKE patterns, so the holders of a permission can be found in SQL
+    action_like: Mapped[str] = mapped_column(String, Computed(_like_pattern("action")))
+    resource_like: Mapped[str] = mapped_column(
+        String, Computed(_like_pattern("resource"))
+    )
+    # The resource pattern up to its first wildcard, or the whole resource when it has none
+    resource_prefix: Mapped[str] = mapped_column(
+        String, Computed("split_part(resource, '*', 1)")
+    )
+
+    @classmethod
+    def holders(cls, action: str, resource: str) -> Select:
+        """Selects the ids of the users holding a permission to carry out an action on a resource.
+
+        An index on a pattern column cannot find the patterns matching a given value. Instead, a
+        pattern can only match resources starting with its `resource_prefix`, so the candidate
+        permissions are found by looking up every prefix of the resource in the index. Only those
+        few candidates are matched against the action and resource patterns.
+        """
+        prefixes = [resource[:end] for end in range(len(resource) + 1)]
+        return select(cls.user_id).where(
+            cls.resource_prefix.in_(prefixes),
+            literal(action).like(cls.action_like),
+            literal(resource).like(cls.resource_like),
+        )
+
+
+SYNC_ON_PERMISSION = """
+CREATE OR REPLACE FUNCTION user_effective_permission__on_permission() RETURNS trigger AS $$
+BEGIN
+    IF TG_OP = 'UPDATE' THEN
+        DELETE FROM user_effective_permission WHERE permission_id = OLD.id;
+    END IF;
+    INSERT INTO user_effective_permission (user_id, permission_id, action, resource)
+    SELECT NEW.user_id, NEW.id, NEW.action, NEW.resource WHERE NEW.user_id IS NOT NULL
+    UNION
+    SELECT user_role.user_id, NEW.id, NEW.action, NEW.resource
+    FROM user_role WHERE user_role.role_id = NEW.role_id
+    ON CONFLICT DO NOTHING;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE OR REPLACE TRIGGER user_effective_permission__permission
+AFTER INSERT OR UPDATE ON permission
+FOR EACH ROW EXECUTE FUNCTION user_effective_permission__on_permission();
+"""
+"""Expands an inserted or updated permission to its user or to every member of its role.
+
+Deleted permissions are removed by the foreign key's ON DELETE CASCADE."""
+
+SYNC_ON_USER_ROLE = """
+CREATE OR REPLACE FUNCTION user_effective_permission__on_user_role() RETURNS trigger AS $$
+BEGIN
+    IF TG_OP IN ('UPDATE', 'DELETE') THEN
+        DELETE FROM user_effective_permission
+        USING permission
+        WHERE user_effective_permission.user_id = OLD.user_id
+            AND user_effective_permission.permission_id = permission.id
+            AND permission.role_id = OLD.role_id;
+    END IF;
+    IF TG_OP IN ('INSERT', 'UPDATE') THEN
+        INSERT INTO user_effective_permission (user_id, permission_id, action, resource)
+        SELECT NEW.user_id, permission.id, permission.action, permission.resource
+        FROM permission WHERE permission.role_id = NEW.role_id
+        ON CONFLICT DO NOTHING;
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE OR REPLACE TRIGGER user_effective_permission__user_role
+AFTER INSERT OR UPDATE OR DELETE ON user_role
+FOR EACH ROW EXECUTE FUNCTION user_effective_permission__on_user_role();
+"""
+"""Adds or removes the permissions of a role as users join or leave it."""
+
+# The triggers are installed once every table they reference exists.
+event.listen(EntityBase.metadata, "after_create", DDL(SYNC_ON_PERMISSION))
+event.listen(EntityBase.metadata, "after_create", DDL(SYNC_ON_USER_ROLE))
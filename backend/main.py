@@ -1,11 +1,18 @@
 """Entrypoint of backend API exposing the FastAPI `app` to be served by an application server such as uvicorn."""
 
+from contextlib import asynccontextmanager
 from pathlib import Path
 from fastapi import FastAPI, Request
+from fastapi.routing import APIRoute
 from fastapi.responses import JSONResponse
 from fastapi.middleware.gzip import GZipMiddleware
 
 from backend.services.coworking.reservation import ReservationException
+from backend.services.coworking.sweeper import ReservationSweeper
+from backend.services.permission_listener import PermissionCacheListener
+from .database import engine
+from .env import getenv
+from .services.permission_metrics import measure_request, route_permission_metrics
 
 from .api.events import events
 
@@ -28,6 +35,8 @@ from .api.office_hours import (
 )
 from .api.admin import users as admin_users
 from .api.admin import roles as admin_roles
+from .api.admin import permissions as admin_permissions
+from .api.admin import database as admin_database
 from .api.admin import facts as admin_facts
 
 from .services.exceptions import (
@@ -35,6 +44,7 @@ from .services.exceptions import (
     ResourceNotFoundException,
     CoursePermissionException,
     CourseDataScrapingException,
+    InvalidCursorException,
 )
 
 __authors__ = ["Kris Jordan"]
@@ -45,6 +55,19 @@ description = """
 Welcome to the UNC Computer Science **Experience Labs** RESTful Application Programming Interface.
 """
 
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Runs background workers for the lifetime of the application process."""
+    reservation_sweeper = ReservationSweeper(engine)
+    reservation_sweeper.start()
+    permission_cache_listener = PermissionCacheListener(engine)
+    permission_cache_listener.start()
+    yield
+    permission_cache_listener.stop()
+    reservation_sweeper.stop()
+
+
 # Metadata to improve the usefulness of OpenAPI Docs /docs API Explorer
 app = FastAPI(
     title="UNC CS Experience Labs API",
@@ -62,17 +85,36 @@ app = FastAPI(
         application.openapi_tags,
         admin_users.openapi_tags,
         admin_roles.openapi_tags,
+        admin_permissions.openapi_tags,
+        admin_database.openapi_tags,
         health.openapi_tags,
         my_courses.openapi_tags,
         hiring.openapi_tags,
         admin_facts.openapi_tags,
         article.openapi_tags,
     ],
+    lifespan=lifespan,
 )
 
 # Use GZip middleware for compressing HTML responses over the network
 app.add_middleware(GZipMiddleware)
 
+
+@app.middleware("http")
+async def permission_metrics_middleware(request: Request, call_next):
+    """Records the authorization work done by each request to an API route.
+
+    In development, the counters are also returned in an X-Permission-Metrics header."""
+    with measure_request() as metrics:
+        response = await call_next(request)
+    route = request.scope.get("route")
+    if isinstance(route, APIRoute):
+        route_permission_metrics.record(f"{request.method} {route.path}", metrics)
+        if getenv("MODE") == "development":
+            response.headers["X-Permission-Metrics"] = str(metrics)
+    return response
+
+
 # Plugging in each of the router APIs
 feature_apis = [
     status,
@@ -91,6 +133,8 @@ feature_apis = [
     profile,
     admin_users,
     admin_roles,
+    admin_permissions,
+    admin_database,
     application,
     authentication,
     health,
@@ -126,6 +170,11 @@ def resource_not_found_exception_handler(
     return JSONResponse(status_code=404, content={"message": str(e)})
 
 
+@app.exception_handler(InvalidCursorException)
+def invalid_cursor_exception_handler(request: Request, e: InvalidCursorException):
+    return JSONResponse(status_code=400, content={"message": str(e)})
+
+
 @app.exception_handler(ReservationException)
 def reservation_exception_handler(request: Request, e: ReservationException):
     return JSONResponse(status_code=403, content={"message": str(e)})
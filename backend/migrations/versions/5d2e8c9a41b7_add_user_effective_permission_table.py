@@ -0,0 +1,135 @@
+"""Add the user_effective_permission table flattening user and role permissions.
+
+Revision ID: 5d2e8c9a41b7
+Revises: 684f2df8b00e
+Create Date: 2026-10-17 10:12:44.518230
+Author: Kris Jordan
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "5d2e8c9a41b7"
+down_revision = "684f2df8b00e"
+branch_labels = None
+depends_on = None
+
+LIKE_PATTERN = "replace(replace(replace(replace({}, '\\', '\\\\'), '%', '\\%'), '_', '\\_'), '*', '%')"
+
+SYNC_ON_PERMISSION = """
+CREATE OR REPLACE FUNCTION user_effective_permission__on_permission() RETURNS trigger AS $$
+BEGIN
+    IF TG_OP = 'UPDATE' THEN
+        DELETE FROM user_effective_permission WHERE permission_id = OLD.id;
+    END IF;
+    INSERT INTO user_effective_permission (user_id, permission_id, action, resource)
+    SELECT NEW.user_id, NEW.id, NEW.action, NEW.resource WHERE NEW.user_id IS NOT NULL
+    UNION
+    SELECT user_role.user_id, NEW.id, NEW.action, NEW.resource
+    FROM user_role WHERE user_role.role_id = NEW.role_id
+    ON CONFLICT DO NOTHING;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE OR REPLACE TRIGGER user_effective_permission__permission
+AFTER INSERT OR UPDATE ON permission
+FOR EACH ROW EXECUTE FUNCTION user_effective_permission__on_permission();
+"""
+
+SYNC_ON_USER_ROLE = """
+CREATE OR REPLACE FUNCTION user_effective_permission__on_user_role() RETURNS trigger AS $$
+BEGIN
+    IF TG_OP IN ('UPDATE', 'DELETE') THEN
+        DELETE FROM user_effective_permission
+        USING permission
+        WHERE user_effective_permission.user_id = OLD.user_id
+            AND user_effective_permission.permission_id = permission.id
+            AND permission.role_id = OLD.role_id;
+    END IF;
+    IF TG_OP IN ('INSERT', 'UPDATE') THEN
+        INSERT INTO user_effective_permission (user_id, permission_id, action, resource)
+        SELECT NEW.user_id, permission.id, permission.action, permission.resource
+        FROM permission WHERE permission.role_id = NEW.role_id
+        ON CONFLICT DO NOTHING;
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE OR REPLACE TRIGGER user_effective_permission__user_role
+AFTER INSERT OR UPDATE OR DELETE ON user_role
+FOR EACH ROW EXECUTE FUNCTION user_effective_permission__on_user_role();
+"""
+
+
+def upgrade() -> None:
+    op.create_table(
+        "user_effective_permission",
+        sa.Column("user_id", sa.Integer(), nullable=False),
+        sa.Column("permission_id", sa.Integer(), nullable=False),
+        sa.Column("action", sa.String(), nullable=False),
+        sa.Column("resource", sa.String(), nullable=False),
+        sa.Column(
+            "action_like",
+            sa.String(),
+            sa.Computed(LIKE_PATTERN.format("action")),
+            nullable=False,
+        ),
+        sa.Column(
+            "resource_like",
+            sa.String(),
+            sa.Computed(LIKE_PATTERN.format("resource")),
+            nullable=False,
+        ),
+        sa.Column(
+            "resource_prefix",
+            sa.String(),
+            sa.Computed("split_part(resource, '*', 1)"),
+            nullable=False,
+        ),
+        sa.ForeignKeyConstraint(["user_id"], ["user.id"], ondelete="CASCADE"),
+        sa.ForeignKeyConstraint(
+            ["permission_id"], ["permission.id"], ondelete="CASCADE"
+        ),
+        sa.PrimaryKeyConstraint("user_id", "permission_id"),
+    )
+    op.create_index(
+        "ix_user_effective_permission__by_resource_prefix",
+        "user_effective_permission",
+        ["resource_prefix", "action_like", "resource_like", "user_id"],
+        unique=False,
+    )
+    op.execute(SYNC_ON_PERMISSION)
+    op.execute(SYNC_ON_USER_ROLE)
+
+    # Backfill the permissions granted before the triggers existed.
+    op.execute(
+        """
+        INSERT INTO user_effective_permission (user_id, permission_id, action, resource)
+        SELECT permission.user_id, permission.id, permission.action, permission.resource
+        FROM permission WHERE permission.user_id IS NOT NULL
+        UNION
+        SELECT user_role.user_id, permission.id, permission.action, permission.resource
+        FROM permission JOIN user_role ON user_role.role_id = permission.role_id
+        ON CONFLICT DO NOTHING
+        """
+    )
+
+
+def downgrade() -> None:
+    op.execute(
+        "DROP TRIGGER IF EXISTS user_effective_permission__user_role ON user_role"
+    )
+    op.execute(
+        "DROP TRIGGER IF EXISTS user_effective_permission__permission ON permission"
+    )
+    op.execute("DROP FUNCTION IF EXISTS user_effective_permission__on_user_role()")
+    op.execute("DROP FUNCTION IF EXISTS user_effective_permission__on_permission()")
+    op.drop_index(
+        "ix_user_effective_permission__by_resource_prefix",
+        table_name="user_effective_permission",
+    )
+    op.drop_table("user_effective_permission")
@@ -0,0 +1,52 @@
+"""Add trigram indexes accelerating substring search of users, events and organizations.
+
+The indexes require the pg_trgm extension and are skipped on database servers without it.
+
+Revision ID: 9b7f3c1e2a64
+Revises: 5d2e8c9a41b7
+Create Date: 2026-10-17 14:03:27.904512
+Author: Kris Jordan
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "9b7f3c1e2a64"
+down_revision = "5d2e8c9a41b7"
+branch_labels = None
+depends_on = None
+
+INDEXED_COLUMNS = {
+    "user": {
+        "first_name": "first_name",
+        "last_name": "last_name",
+        "onyen": "onyen",
+        "email": "email",
+        "pid": "CAST(pid AS VARCHAR)",
+    },
+    "event": {"name": "name", "description": "description"},
+    "organization": {"name": "name", "slug": "slug"},
+}
+
+
+def upgrade() -> None:
+    available = op.get_bind().execute(
+        sa.text("SELECT 1 FROM pg_available_extensions WHERE name = 'pg_trgm'")
+    )
+    if available.first() is None:
+        return
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    for table, columns in INDEXED_COLUMNS.items():
+        for column, expression in columns.items():
+            op.execute(
+                f'CREATE INDEX IF NOT EXISTS {table}__{column}_trgm_idx ON "{table}" '
+                f"USING gin (({expression}) gin_trgm_ops)"
+            )
+
+
+def downgrade() -> None:
+    for table, columns in INDEXED_COLUMNS.items():
+        for column in columns:
+            op.execute(f"DROP INDEX IF EXISTS {table}__{column}_trgm_idx")
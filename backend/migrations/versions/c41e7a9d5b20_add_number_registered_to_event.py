@@ -0,0 +1,39 @@
+"""Add the number_registered counter of attendees to event.
+
+Revision ID: c41e7a9d5b20
+Revises: 9b7f3c1e2a64
+Create Date: 2026-10-17 16:21:09.337105
+Author: Kris Jordan
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "c41e7a9d5b20"
+down_revision = "9b7f3c1e2a64"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "event",
+        sa.Column(
+            "number_registered", sa.Integer(), nullable=False, server_default="0"
+        ),
+    )
+    op.execute(
+        """
+        UPDATE event SET number_registered = (
+            SELECT count(*) FROM event_registration
+            WHERE event_registration.event_id = event.id
+                AND event_registration.registration_type = 'ATTENDEE'
+        )
+        """
+    )
+
+
+def downgrade() -> None:
+    op.drop_column("event", "number_registered")
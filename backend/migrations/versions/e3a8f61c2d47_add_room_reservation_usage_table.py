@@ -0,0 +1,128 @@
+"""Add the coworking__room_reservation_usage ledger of time counted against the weekly room limit.
+
+Revision ID: e3a8f61c2d47
+Revises: c41e7a9d5b20
+Create Date: 2026-10-17 21:08:53.204117
+Author: Kris Jordan
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "e3a8f61c2d47"
+down_revision = "c41e7a9d5b20"
+branch_labels = None
+depends_on = None
+
+SYNC_ON_RESERVATION = """
+CREATE OR REPLACE FUNCTION coworking__room_reservation_usage__on_reservation() RETURNS trigger AS $$
+BEGIN
+    IF OLD.room_id IS NOT NULL AND OLD.state NOT IN ('CANCELLED', 'CHECKED_OUT') THEN
+        UPDATE coworking__room_reservation_usage AS usage
+        SET duration = usage.duration - (OLD."end" - OLD.start)
+        FROM coworking__reservation_user AS party
+        WHERE party.reservation_id = OLD.id
+            AND usage.user_id = party.user_id
+            AND usage.day = CAST(OLD.start AS date);
+    END IF;
+    IF TG_OP = 'DELETE' THEN
+        RETURN OLD;
+    END IF;
+    IF NEW.room_id IS NOT NULL AND NEW.state NOT IN ('CANCELLED', 'CHECKED_OUT') THEN
+        INSERT INTO coworking__room_reservation_usage (user_id, day, duration)
+        SELECT party.user_id, CAST(NEW.start AS date), NEW."end" - NEW.start
+        FROM coworking__reservation_user AS party WHERE party.reservation_id = NEW.id
+        ON CONFLICT (user_id, day) DO UPDATE
+        SET duration = coworking__room_reservation_usage.duration + EXCLUDED.duration;
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE OR REPLACE TRIGGER coworking__room_reservation_usage__reservation
+AFTER UPDATE OF state, start, "end", room_id ON coworking__reservation
+FOR EACH ROW EXECUTE FUNCTION coworking__room_reservation_usage__on_reservation();
+
+CREATE OR REPLACE TRIGGER coworking__room_reservation_usage__reservation_delete
+BEFORE DELETE ON coworking__reservation
+FOR EACH ROW EXECUTE FUNCTION coworking__room_reservation_usage__on_reservation();
+"""
+
+SYNC_ON_RESERVATION_USER = """
+CREATE OR REPLACE FUNCTION coworking__room_reservation_usage__on_reservation_user() RETURNS trigger AS $$
+BEGIN
+    IF TG_OP = 'DELETE' THEN
+        UPDATE coworking__room_reservation_usage AS usage
+        SET duration = usage.duration - (reservation."end" - reservation.start)
+        FROM coworking__reservation AS reservation
+        WHERE reservation.id = OLD.reservation_id
+            AND reservation.room_id IS NOT NULL AND reservation.state NOT IN ('CANCELLED', 'CHECKED_OUT')
+            AND usage.user_id = OLD.user_id
+            AND usage.day = CAST(reservation.start AS date);
+    ELSE
+        INSERT INTO coworking__room_reservation_usage (user_id, day, duration)
+        SELECT NEW.user_id, CAST(reservation.start AS date), reservation."end" - reservation.start
+        FROM coworking__reservation AS reservation
+        WHERE reservation.id = NEW.reservation_id AND reservation.room_id IS NOT NULL AND reservation.state NOT IN ('CANCELLED', 'CHECKED_OUT')
+        ON CONFLICT (user_id, day) DO UPDATE
+        SET duration = coworking__room_reservation_usage.duration + EXCLUDED.duration;
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE OR REPLACE TRIGGER coworking__room_reservation_usage__reservation_user
+AFTER INSERT OR DELETE ON coworking__reservation_user
+FOR EACH ROW EXECUTE FUNCTION coworking__room_reservation_usage__on_reservation_user();
+"""
+
+
+def upgrade() -> None:
+    op.create_table(
+        "coworking__room_reservation_usage",
+        sa.Column("user_id", sa.Integer(), nullable=False),
+        sa.Column("day", sa.Date(), nullable=False),
+        sa.Column("duration", sa.Interval(), nullable=False),
+        sa.ForeignKeyConstraint(["user_id"], ["user.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("user_id", "day"),
+    )
+    op.execute(SYNC_ON_RESERVATION)
+    op.execute(SYNC_ON_RESERVATION_USER)
+
+    # Backfill the reservations made before the triggers existed.
+    op.execute(
+        """
+        INSERT INTO coworking__room_reservation_usage (user_id, day, duration)
+        SELECT party.user_id, CAST(reservation.start AS date),
+            sum(reservation."end" - reservation.start)
+        FROM coworking__reservation AS reservation
+        JOIN coworking__reservation_user AS party ON party.reservation_id = reservation.id
+        WHERE reservation.room_id IS NOT NULL
+            AND reservation.state NOT IN ('CANCELLED', 'CHECKED_OUT')
+        GROUP BY party.user_id, CAST(reservation.start AS date)
+        """
+    )
+
+
+def downgrade() -> None:
+    op.execute(
+        "DROP TRIGGER IF EXISTS coworking__room_reservation_usage__reservation_user "
+        "ON coworking__reservation_user"
+    )
+    op.execute(
+        "DROP TRIGGER IF EXISTS coworking__room_reservation_usage__reservation_delete "
+        "ON coworking__reservation"
+    )
+    op.execute(
+        "DROP TRIGGER IF EXISTS coworking__room_reservation_usage__reservation "
+        "ON coworking__reservation"
+    )
+    op.execute(
+        "DROP FUNCTION IF EXISTS coworking__room_reservation_usage__on_reservation_user()"
+    )
+    op.execute(
+        "DROP FUNCTION IF EXISTS coworking__room_reservation_usage__on_reservation()"
+    )
+    op.drop_table("coworking__room_reservation_usage")
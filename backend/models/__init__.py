@@ -1,7 +1,14 @@
 """Package for all models in the application."""
 
 from .application import Application
-from .pagination import Paginated, PaginationParams, EventPaginationParams
+from .pagination import (
+    Paginated,
+    PaginationParams,
+    EventPaginationParams,
+    CursorPaginated,
+    CursorPaginationParams,
+    EventCursorPaginationParams,
+)
 from .permission import Permission
 from .user import User, ProfileForm
 from .user_details import UserDetails
@@ -16,8 +23,12 @@ from .room_details import RoomDetails
 from .event_registration import (
     EventRegistration,
     NewEventRegistration,
+    EventRegistrationExportRow,
 )
 from .registration_type import RegistrationType
+from .cache_stats import CacheStats
+from .permission_metrics import PermissionMetrics
+from .pool_stats import PoolStats
 
 __authors__ = ["Kris Jordan"]
 __copyright__ = "Copyright 2023"
@@ -0,0 +1,24 @@
+"""Counters describing the effectiveness of an in-process cache."""
+
+from pydantic import BaseModel
+
+__authors__ = ["Kris Jordan"]
+__copyright__ = "Copyright 2024"
+__license__ = "MIT"
+
+
+class CacheStats(BaseModel):
+    """
+    Pydantic model to represent the hit and miss counters of a cache.
+
+    Caches are per-process, so these counters describe only the worker serving the request.
+    """
+
+    name: str
+    hits: int = 0
+    misses: int = 0
+    invalidations: int = 0
+    size: int = 0
+    hit_ratio: float = 0.0
+    mean_lookup_ms: float = 0.0
+    """Mean time to answer a lookup, including computing the value of a miss."""
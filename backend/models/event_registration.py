@@ -33,3 +33,17 @@ class EventRegistration(NewEventRegistration):
 
     event: EventOverview
     user: User
+
+
+class EventRegistrationExportRow(BaseModel):
+    """
+    Pydantic model to represent a registration of an event in an export of its registrations.
+    """
+
+    first_name: str
+    last_name: str
+    onyen: str
+    pronouns: str
+    email: str
+    # Name of the RegistrationType, which is more legible in a spreadsheet than its value
+    registration_type: str
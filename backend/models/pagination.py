@@ -35,3 +35,35 @@ class Paginated(BaseModel, Generic[T]):
     items: list[T]
     length: int
     params: PaginationParams | EventPaginationParams
+
+
+class CursorPaginationParams(BaseModel):
+    """Parameters passed from the client to paginate results by cursor.
+
+    An empty cursor requests the first page, and each page gives the cursor of the next.
+    """
+
+    cursor: str = ""
+    page_size: int = 10
+    order_by: str = ""
+    filter: str = ""
+
+
+class EventCursorPaginationParams(CursorPaginationParams):
+    """Parameters passed from the client to paginate event results by cursor."""
+
+    ascending: str = "true"
+    range_start: str = ""
+    range_end: str = ""
+
+
+class CursorPaginated(BaseModel, Generic[T]):
+    """Generic class for returning results paginated by cursor to the client.
+
+    The total number of results is only counted for the first page; later pages leave it None
+    so that the client keeps the total it was first given."""
+
+    items: list[T]
+    next_cursor: str | None
+    length: int | None
+    params: CursorPaginationParams | EventCursorPaginationParams
@@ -0,0 +1,26 @@
+"""Counters describing the authorization work done by the requests to a route."""
+
+from pydantic import BaseModel
+
+__authors__ = ["Kris Jordan"]
+__copyright__ = "Copyright 2024"
+__license__ = "MIT"
+
+
+class PermissionMetrics(BaseModel):
+    """
+    Pydantic model to represent the permission checks made while serving requests to a route.
+
+    Metrics are per-process, so these counters describe only the worker serving the request.
+    """
+
+    route: str
+    requests: int = 0
+    checks: int = 0
+    """Number of actions checked against resources, including each resource of a batch."""
+    queries: int = 0
+    """Number of SQL queries issued to load permissions."""
+    matching_ms: float = 0.0
+    """Total time spent matching actions and resources against compiled permissions."""
+    checks_per_request: float = 0.0
+    queries_per_request: float = 0.0
@@ -0,0 +1,30 @@
+"""Counters describing the occupancy of the database connection pool and the waits to use it."""
+
+from pydantic import BaseModel
+
+__authors__ = ["Kris Jordan"]
+__copyright__ = "Copyright 2024"
+__license__ = "MIT"
+
+
+class PoolStats(BaseModel):
+    """
+    Pydantic model to represent the connections of a database connection pool.
+
+    Pools are per-process, so these counters describe only the worker serving the request.
+    """
+
+    size: int
+    """Number of connections the pool keeps open."""
+    checked_out: int
+    checked_in: int
+    overflow: int
+    """Number of connections open beyond the pool's size."""
+    checkouts: int = 0
+    timeouts: int = 0
+    """Number of checkouts that gave up waiting for a connection to be returned."""
+    connects: int = 0
+    """Number of connections opened to the database, including replacements of recycled ones."""
+    mean_wait_ms: float = 0.0
+    """Mean time a checkout took, including waiting for and opening a connection."""
+    max_wait_ms: float = 0.0
@@ -0,0 +1,114 @@
+"""Instrumentation of the database connection pool.
+
+Every request needing the database checks a connection out of the engine's pool. When more
+requests are in flight than the pool has connections, checkouts wait for a connection to be
+returned and, after `pool_timeout` seconds, fail. `InstrumentedQueuePool` times every checkout into
+its `PoolTelemetry`, revealing whether the pool is sized for the load a worker serves.
+
+Telemetry is per-process, so its counters describe only the worker that records them.
+"""
+
+from threading import Lock
+from time import perf_counter
+
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.pool import PoolProxiedConnection, QueuePool
+
+from .models import PoolStats
+
+__authors__ = ["Kris Jordan"]
+__copyright__ = "Copyright 2024"
+__license__ = "MIT"
+
+
+class PoolTelemetry:
+    """Thread-safe counters of the connections checked out of a pool."""
+
+    def __init__(self):
+        self._lock = Lock()
+        self.clear()
+
+    def record_checkout(self, wait_seconds: float) -> None:
+        """Records a checkout and the time it waited for a connection."""
+        with self._lock:
+            self._checkouts += 1
+            self._wait_seconds += wait_seconds
+            self._max_wait_seconds = max(self._max_wait_seconds, wait_seconds)
+
+    def record_timeout(self, wait_seconds: float) -> None:
+        """Records a checkout that gave up waiting for a connection."""
+        with self._lock:
+            self._timeouts += 1
+            self._max_wait_seconds = max(self._max_wait_seconds, wait_seconds)
+
+    def record_connect(self) -> None:
+        """Records a new connection opened to the database."""
+        with self._lock:
+            self._connects += 1
+
+    def snapshot(self, pool: QueuePool) -> PoolStats:
+        """Returns the counters, along with the current occupancy of the pool.
+
+        Args:
+            pool (QueuePool): The pool the counters were recorded for.
+
+        Returns:
+            PoolStats: The counters and occupancy of the pool.
+        """
+        with self._lock:
+            return PoolStats(
+                size=pool.size(),
+                checked_out=pool.checkedout(),
+                checked_in=pool.checkedin(),
+                overflow=max(pool.overflow(), 0),
+                checkouts=self._checkouts,
+                timeouts=self._timeouts,
+                connects=self._connects,
+                mean_wait_ms=(
+                    self._wait_seconds / self._checkouts * 1000
+                    if self._checkouts
+                    else 0.0
+                ),
+                max_wait_ms=self._max_wait_seconds * 1000,
+            )
+
+    def clear(self) -> None:
+        """Resets every counter to zero."""
+        with self._lock:
+            self._checkouts = 0
+            self._timeouts = 0
+            self._connects = 0
+            self._wait_seconds = 0.0
+            self._max_wait_seconds = 0.0
+
+
+class InstrumentedQueuePool(QueuePool):
+    """A QueuePool recording its checkouts, their waits, and new connections into its telemetry.
+
+    The engine creates the pool, so its telemetry is created with it. Telemetry is carried over to
+    the pool that replaces this one when the engine is disposed."""
+
+    telemetry: PoolTelemetry
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.telemetry = PoolTelemetry()
+
+    def connect(self) -> PoolProxiedConnection:
+        start = perf_counter()
+        try:
+            connection = super().connect()
+        except PoolTimeoutError:
+            self.telemetry.record_timeout(perf_counter() - start)
+            raise
+        self.telemetry.record_checkout(perf_counter() - start)
+        return connection
+
+    def recreate(self) -> QueuePool:
+        pool = super().recreate()
+        pool.telemetry = self.telemetry
+        return pool
+
+    def _create_connection(self):
+        self.telemetry.record_connect()
+        return super()._create_connection()
@@ -0,0 +1,69 @@
+"""
+Microbenchmark of the per-request overhead of each tier of authentication dependency.
+
+Each tier resolves the same bearer token the way a request would: verifying the token with
+`jwt.decode` on every request, as before decoded tokens were cached; reading the claims of a cached
+token (`authenticated_pid`); and resolving a registered user from the warm process-wide user cache
+(`registered_user`). The fresh tier adds one database query per request and is not measured here,
+so no database is required.
+
+Usage: python3 -m backend.script.benchmarks.authentication
+"""
+
+import timeit
+
+import jwt
+from fastapi.security.http import HTTPAuthorizationCredentials
+
+from ...api.authentication import (
+    _JST_ALGORITHM,
+    _JWT_SECRET,
+    _generate_token,
+    authenticated_pid,
+    decoded_tokens,
+    registered_user,
+)
+from ...models import User
+from ...services import UserService
+from ...services.user import authenticated_users
+
+__authors__ = ["Kris Jordan"]
+__copyright__ = "Copyright 2024"
+__license__ = "MIT"
+
+REQUESTS = 10_000
+REPEAT = 5
+
+USER = User(
+    id=1, pid=999999999, onyen="bench", first_name="Bench", last_name="Mark", email=""
+)
+
+
+def uncached_claims(token: HTTPAuthorizationCredentials):
+    auth_info = jwt.decode(token.credentials, _JWT_SECRET, algorithms=[_JST_ALGORITHM])
+    return int(auth_info["pid"]), auth_info["uid"]
+
+
+def main():
+    token = HTTPAuthorizationCredentials(
+        scheme="Bearer", credentials=_generate_token(USER.onyen, USER.pid)
+    )
+    # Only cache hits are measured, so the service never reaches its session.
+    user_service = UserService(session=None, permission=None)
+    authenticated_users.put(USER.pid, USER)
+    decoded_tokens.clear()
+
+    tiers = [
+        ("jwt.decode per request", lambda: uncached_claims(token)),
+        ("authenticated_pid", lambda: authenticated_pid(token)),
+        ("registered_user", lambda: registered_user(user_service, token)),
+    ]
+    assert registered_user(user_service, token) == USER
+    print(f"{'tier':<24} {'per request':>12}")
+    for name, resolve in tiers:
+        elapsed = min(timeit.repeat(resolve, number=REQUESTS, repeat=REPEAT))
+        print(f"{name:<24} {elapsed / REQUESTS * 1_000_000:>10.1f}us")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+"""
+Microbenchmark comparing regex-per-permission checks with the compiled PermissionMatcher.
+
+Synthetic subjects hold hundreds to thousands of grants shaped like the ones administrators
+issue: exact resources, trailing wildcards, and wildcards in the middle of a pattern. Both paths
+answer the same checks, so only the in-memory matching is measured; no database is required.
+
+Usage: python3 -m backend.script.benchmarks.permission_matching
+"""
+
+import re
+import timeit
+from random import Random
+
+from ...models import Permission
+from ...services.permission_matcher import PermissionMatcher
+
+__authors__ = ["Kris Jordan"]
+__copyright__ = "Copyright 2024"
+__license__ = "MIT"
+
+GRANT_COUNTS = [100, 500, 2_000]
+CHECKS = 1_000
+REPEAT = 5
+
+ACTIONS = ["organization.update", "organization.*", "event.*", "*.delete", "user.get"]
+
+
+def make_fixture(grant_count: int):
+    rng = Random(grant_count)
+    permissions = []
+    for i in range(grant_count):
+        action = rng.choice(ACTIONS)
+        shape = i % 3
+        if shape == 0:
+            resource = f"organization/{i}"
+        elif shape == 1:
+            resource = f"organization/{i}/*"
+        else:
+            resource = f"organization/*/event/{i}"
+        permissions.append(Permission(action=action, resource=resource))
+    checks = [
+        (
+            rng.choice(["organization.update", "event.create", "user.delete"]),
+            f"organization/{rng.randrange(grant_count * 2)}/event/{rng.randrange(grant_count)}",
+        )
+        for _ in range(CHECKS)
+    ]
+    return permissions, checks
+
+
+def regex_path(permissions, checks):
+    """The previous implementation: compile each pattern, then test permissions one at a time."""
+    expand = lambda pattern: re.compile(f"^{pattern.replace('*', '.*')}$")
+    compiled = [(expand(p.action), expand(p.resource)) for p in permissions]
+    return [
+        any(
+            action_re.fullmatch(action) and resource_re.fullmatch(resource)
+            for action_re, resource_re in compiled
+        )
+        for action, resource in checks
+    ]
+
+
+def matcher_path(permissions, checks):
+    matcher = PermissionMatcher(permissions)
+    return [matcher.check(action, resource) for action, resource in checks]
+
+
+def main():
+    print(f"{'grants':>8} {'regex':>10} {'matcher':>10} {'speedup':>8}")
+    for grant_count in GRANT_COUNTS:
+        fixture = make_fixture(grant_count)
+        assert regex_path(*fixture) == matcher_path(*fixture)
+        baseline = min(
+            timeit.repeat(lambda: regex_path(*fixture), number=1, repeat=REPEAT)
+        )
+        matcher = min(
+            timeit.repeat(lambda: matcher_path(*fixture), number=1, repeat=REPEAT)
+        )
+        print(
+            f"{grant_count:>8} {baseline * 1000:>8.1f}ms {matcher * 1000:>8.1f}ms {baseline / matcher:>7.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,149 @@
+"""
+Benchmark of finding the users permitted to carry out an action on a resource.
+
+A scratch database is created and loaded with 50,000 users, each holding grants on their own user
+resource and belonging to one of 500 organization roles, whose exact and wildcard grants expand
+into 250,000 user_effective_permission rows. Each lookup is timed twice: as
+`UserEffectivePermissionEntity.holders` selects it, looking up the prefixes of the resource in the
+index on `resource_prefix`, and as LIKE of the action and resource against every row's patterns,
+which no index can serve. The plan of each is printed.
+
+The scratch database is dropped when the benchmark completes.
+
+Usage: python3 -m backend.script.benchmarks.permitted_users
+"""
+
+import timeit
+
+import sqlalchemy
+from sqlalchemy import Select, literal, select, text
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.orm import Session
+
+from ...database import _engine_str
+from ...entities import EntityBase, UserEffectivePermissionEntity
+from ...env import getenv
+
+__authors__ = ["Kris Jordan"]
+__copyright__ = "Copyright 2024"
+__license__ = "MIT"
+
+DATABASE = f"{getenv('POSTGRES_DATABASE')}_permitted_users_benchmark"
+USERS = 50_000
+ROLES = 500
+REPEAT = 5
+
+LOAD_DATA = f"""
+-- Bulk loads skip the triggers, which expand one row at a time, and backfill as the migration does.
+SET session_replication_role = replica;
+
+INSERT INTO "user" (pid, onyen, email, first_name, last_name, pronouns, github,
+    accepted_community_agreement)
+SELECT 700000000 + i, 'u' || i, 'u' || i || '@unc.edu', 'First', 'Last' || i, '', '', true
+FROM generate_series(1, {USERS}) AS i;
+
+INSERT INTO role (name) SELECT 'organization_' || i FROM generate_series(1, {ROLES}) AS i;
+
+INSERT INTO permission (action, resource, role_id)
+SELECT action, 'organization/' || role.id || suffix, role.id
+FROM role, (VALUES
+    ('organization.get_all_users', ''),
+    ('organization.events.manage_registrations', ''),
+    ('organization.events.*', '/*')
+) AS grants (action, suffix);
+
+INSERT INTO permission (action, resource, user_id)
+SELECT action, 'user/' || "user".id, "user".id
+FROM "user", (VALUES ('user.get'), ('user.update')) AS grants (action);
+
+INSERT INTO user_role (user_id, role_id) SELECT id, id % {ROLES} + 1 FROM "user";
+
+INSERT INTO user_effective_permission (user_id, permission_id, action, resource)
+SELECT permission.user_id, permission.id, permission.action, permission.resource
+FROM permission WHERE permission.user_id IS NOT NULL
+UNION
+SELECT user_role.user_id, permission.id, permission.action, permission.resource
+FROM permission JOIN user_role ON user_role.role_id = permission.role_id;
+
+RESET session_replication_role;
+ANALYZE;
+"""
+
+LOOKUPS = [
+    ("user.get", "user/4242"),
+    ("organization.events.manage_registrations", "organization/42"),
+    ("organization.events.create", "organization/42/event"),
+]
+
+
+def holders_by_pattern(action: str, resource: str) -> Select:
+    """The lookup before candidate permissions were found by the prefixes of the resource."""
+    return select(UserEffectivePermissionEntity.user_id).where(
+        literal(action).like(UserEffectivePermissionEntity.action_like),
+        literal(resource).like(UserEffectivePermissionEntity.resource_like),
+    )
+
+
+def render(statement: Select) -> str:
+    return str(
+        statement.compile(
+            dialect=postgresql.dialect(), compile_kwargs={"literal_binds": True}
+        )
+    )
+
+
+def explain(session: Session, statement: Select) -> list[str]:
+    return list(session.scalars(text(f"EXPLAIN {render(statement)}")))
+
+
+def time_lookup(session: Session, statement: Select) -> float:
+    return min(
+        timeit.repeat(lambda: session.execute(statement).all(), number=1, repeat=REPEAT)
+    )
+
+
+def main():
+    server = sqlalchemy.create_engine(
+        _engine_str("postgres"), isolation_level="AUTOCOMMIT"
+    )
+    with server.connect() as connection:
+        connection.execute(text(f'DROP DATABASE IF EXISTS "{DATABASE}"'))
+        connection.execute(text(f'CREATE DATABASE "{DATABASE}"'))
+
+    engine = sqlalchemy.create_engine(_engine_str(DATABASE))
+    try:
+        EntityBase.metadata.create_all(engine)
+        with Session(engine) as session:
+            session.execute(text(LOAD_DATA))
+            session.commit()
+            rows = session.scalar(
+                text("SELECT count(*) FROM user_effective_permission")
+            )
+            print(f"user_effective_permission rows: {rows}\n")
+
+            for action, resource in LOOKUPS:
+                by_pattern = holders_by_pattern(action, resource)
+                holders = UserEffectivePermissionEntity.holders(action, resource)
+                assert set(session.scalars(by_pattern)) == set(session.scalars(holders))
+                scan = time_lookup(session, by_pattern)
+                indexed = time_lookup(session, holders)
+                print(f"{action} on {resource}")
+                print(
+                    f"  pattern scan {scan * 1000:>8.2f}ms   holders {indexed * 1000:>8.2f}ms"
+                    f"   speedup {scan / indexed:>6.1f}x"
+                )
+                print("  pattern scan plan:")
+                for line in explain(session, by_pattern):
+                    print(f"    {line}")
+                print("  holders plan:")
+                for line in explain(session, holders):
+                    print(f"    {line}")
+                print()
+    finally:
+        engine.dispose()
+        with server.connect() as connection:
+            connection.execute(text(f'DROP DATABASE IF EXISTS "{DATABASE}"'))
+
+
+if __name__ == "__main__":
+    main()
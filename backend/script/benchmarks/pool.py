@@ -0,0 +1,82 @@
+"""
+Benchmark of request throughput at various worker and connection pool sizes.
+
+Each simulated request checks a connection out of an instrumented pool, runs a query taking about
+2 ms on the server, as a typical API request does, and returns the connection. Requests are served
+by a number of worker threads, standing in for the threads of a worker process serving requests
+concurrently, through a pool of a fixed size without overflow.
+
+For each combination, the throughput and the mean and maximum time a checkout waited for a
+connection are reported. Throughput grows with the pool until the pool has as many connections as
+there are workers; beyond that, extra connections sit idle. With fewer connections than workers,
+requests queue for a connection, which is the wait `GET /api/admin/database/pool` reveals.
+
+Usage: python3 -m backend.script.benchmarks.pool
+"""
+
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import sqlalchemy
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from ...database import _engine_str
+from ...pool_telemetry import InstrumentedQueuePool
+
+__authors__ = ["Kris Jordan"]
+__copyright__ = "Copyright 2024"
+__license__ = "MIT"
+
+REQUESTS = 2_000
+WORKERS = [1, 4, 16, 32]
+POOL_SIZES = [1, 4, 8, 16, 32]
+QUERY = text("SELECT pg_sleep(0.002)")
+
+
+def serve(engine: sqlalchemy.Engine) -> None:
+    """A request running one query in a session of its own."""
+    with Session(engine) as session:
+        session.execute(QUERY)
+
+
+def measure(workers: int, pool_size: int) -> str:
+    engine = sqlalchemy.create_engine(
+        _engine_str(),
+        poolclass=InstrumentedQueuePool,
+        pool_size=pool_size,
+        max_overflow=0,
+    )
+    try:
+        # Open the pool's connections up front so that connecting is not measured.
+        connections = [engine.connect() for _ in range(pool_size)]
+        for connection in connections:
+            connection.close()
+        engine.pool.telemetry.clear()
+
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            list(executor.map(lambda _: serve(engine), range(REQUESTS)))
+        elapsed = time.perf_counter() - start
+
+        stats = engine.pool.telemetry.snapshot(engine.pool)
+        return (
+            f"{workers:>7} {pool_size:>5} {REQUESTS / elapsed:>9.0f}/s"
+            f" {stats.mean_wait_ms:>9.2f}ms {stats.max_wait_ms:>9.2f}ms"
+        )
+    finally:
+        engine.dispose()
+
+
+def main():
+    print(
+        f"{'workers':>7} {'pool':>5} {'throughput':>11} {'mean wait':>11} {'max wait':>11}"
+    )
+    for workers in WORKERS:
+        for pool_size in POOL_SIZES:
+            if pool_size <= workers * 2:
+                print(measure(workers, pool_size))
+
+
+if __name__ == "__main__":
+    main()
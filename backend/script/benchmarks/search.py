@@ -0,0 +1,152 @@
+"""
+Benchmark comparing filter box searches with and without the pg_trgm trigram indexes.
+
+A scratch database is created and loaded with 100,000 users and 10,000 events across 200
+organizations. Each search is built with the same `contains_text` criteria the services use and
+timed twice: once as planned, using the trigram indexes, and once with bitmap scans disabled,
+which forces the sequential scan every search performed before the indexes existed.
+
+The scratch database is dropped when the benchmark completes. Without pg_trgm on the database
+server, the indexes are not created and only the sequential scan timings are reported.
+
+Usage: python3 -m backend.script.benchmarks.search
+"""
+
+import timeit
+
+import sqlalchemy
+from sqlalchemy import Select, String, cast, func, select, text
+from sqlalchemy.orm import Session
+
+from ...database import _engine_str
+from ...entities import EntityBase, EventEntity, OrganizationEntity, UserEntity
+from ...env import getenv
+from ...services.search import contains_text
+
+__authors__ = ["Kris Jordan"]
+__copyright__ = "Copyright 2024"
+__license__ = "MIT"
+
+DATABASE = f"{getenv('POSTGRES_DATABASE')}_search_benchmark"
+USERS = 100_000
+EVENTS = 10_000
+ORGANIZATIONS = 200
+REPEAT = 5
+
+FIRST_NAMES = "'Ava','Ben','Chloe','Dev','Ella','Finn','Grace','Hiro','Isla','Jonah'"
+TOPICS = "'Workshop','Mixer','Hackathon','Info Session','Lecture','Career Fair'"
+
+LOAD_DATA = f"""
+INSERT INTO "user" (pid, onyen, email, first_name, last_name, pronouns, github,
+    accepted_community_agreement)
+SELECT 700000000 + i, 'u' || i, 'u' || i || '@unc.edu',
+    (ARRAY[{FIRST_NAMES}])[i % 10 + 1], initcap(substr(md5(i::text), 1, 10)), '', '', true
+FROM generate_series(1, {USERS}) AS i;
+
+INSERT INTO organization (name, shorthand, slug, logo, short_description, long_description,
+    website, email, instagram, linked_in, youtube, heel_life, public, application_required)
+SELECT 'Organization ' || initcap(substr(md5('o' || i), 1, 8)), 'O' || i, 'org-' || i,
+    '', '', '', '', '', '', '', '', '', 'open', false
+FROM generate_series(1, {ORGANIZATIONS}) AS i;
+
+INSERT INTO event (name, start, "end", location, description, public, registration_limit,
+    organization_id)
+SELECT (ARRAY[{TOPICS}])[i % 6 + 1] || ' ' || initcap(substr(md5('e' || i), 1, 8)),
+    now() + i * interval '1 hour', now() + i * interval '1 hour' + interval '1 hour',
+    'Sitterson Hall', repeat(md5('d' || i) || ' ', 8), true, 50, i % {ORGANIZATIONS} + 1
+FROM generate_series(1, {EVENTS}) AS i;
+
+ANALYZE;
+"""
+
+
+def user_search(query: str) -> Select:
+    """The statement of `UserService.search`."""
+    criteria = contains_text(
+        query,
+        UserEntity.first_name,
+        UserEntity.last_name,
+        UserEntity.onyen,
+        UserEntity.email,
+        cast(UserEntity.pid, String),
+    )
+    return select(UserEntity).where(criteria).limit(10)
+
+
+def user_list_length(query: str) -> Select:
+    """The length statement of `UserService.list`, which counts every match."""
+    criteria = contains_text(
+        query, UserEntity.first_name, UserEntity.last_name, UserEntity.onyen
+    )
+    return select(func.count()).select_from(UserEntity).where(criteria)
+
+
+def event_list_length(query: str) -> Select:
+    """The length statement of `EventService.get_paginated_events`, which counts every match."""
+    organizations = select(OrganizationEntity.id).where(
+        contains_text(query, OrganizationEntity.name, OrganizationEntity.slug)
+    )
+    criteria = contains_text(
+        query, EventEntity.name, EventEntity.description
+    ) | EventEntity.organization_id.in_(organizations)
+    return select(func.count()).select_from(EventEntity).where(criteria)
+
+
+SEARCHES = [
+    ("user search 'u4242'", user_search("u4242")),
+    ("user search '70001234'", user_search("70001234")),
+    ("user list 'grace'", user_list_length("grace")),
+    ("user list 'a3f9'", user_list_length("a3f9")),
+    ("event list 'hackathon'", event_list_length("hackathon")),
+    ("event list 'beef'", event_list_length("beef")),
+]
+
+
+def time_search(session: Session, statement: Select) -> float:
+    return min(
+        timeit.repeat(lambda: session.execute(statement).all(), number=1, repeat=REPEAT)
+    )
+
+
+def main():
+    server = sqlalchemy.create_engine(
+        _engine_str("postgres"), isolation_level="AUTOCOMMIT"
+    )
+    with server.connect() as connection:
+        connection.execute(text(f'DROP DATABASE IF EXISTS "{DATABASE}"'))
+        connection.execute(text(f'CREATE DATABASE "{DATABASE}"'))
+
+    engine = sqlalchemy.create_engine(_engine_str(DATABASE))
+    try:
+        EntityBase.metadata.create_all(engine)
+        with Session(engine) as session:
+            session.execute(text(LOAD_DATA))
+            session.commit()
+            indexed = session.scalar(
+                text(
+                    "SELECT count(*) FROM pg_indexes WHERE indexname LIKE '%_trgm_idx'"
+                )
+            )
+            if indexed == 0:
+                print("pg_trgm is not available: reporting sequential scans only\n")
+
+            print(f"{'search':<26} {'seq scan':>10} {'trigram':>10} {'speedup':>8}")
+            for label, statement in SEARCHES:
+                session.execute(text("SET enable_bitmapscan = off"))
+                scan = time_search(session, statement)
+                session.execute(text("RESET enable_bitmapscan"))
+                if indexed == 0:
+                    print(f"{label:<26} {scan * 1000:>8.1f}ms {'-':>10} {'-':>8}")
+                    continue
+                trigram = time_search(session, statement)
+                print(
+                    f"{label:<26} {scan * 1000:>8.1f}ms {trigram * 1000:>8.1f}ms {scan / trigram:>7.1f}x"
+                )
+    finally:
+        engine.dispose()
+        with server.connect() as connection:
+            connection.execute(text(f'DROP DATABASE IF EXISTS "{DATABASE}"'))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+"""
+Microbenchmark comparing the AvailabilityList and interval engine seat availability paths.
+
+Both paths are given the same synthetic seats, operating hours, and reservations so only
+the in-memory availability computation is measured; no database is required.
+
+Usage: python3 -m backend.script.benchmarks.seat_availability
+"""
+
+import timeit
+from datetime import datetime, timedelta
+from random import Random
+
+from ...models.coworking import (
+    AvailabilityList,
+    Seat,
+    SeatAvailability,
+    TimeRange,
+)
+from ...services.coworking import availability_engine
+
+__authors__ = ["Kris Jordan"]
+__copyright__ = "Copyright 2024"
+__license__ = "MIT"
+
+SEAT_COUNTS = [50, 500, 5_000]
+RESERVATIONS_PER_SEAT = 3
+MINIMUM = timedelta(minutes=9)
+REPEAT = 5
+
+
+def make_fixture(seat_count: int):
+    rng = Random(seat_count)
+    opens = datetime.now().replace(hour=10, minute=0, second=0, microsecond=0)
+    bounds = TimeRange(start=opens, end=opens + timedelta(hours=8))
+    seats = [
+        Seat(
+            id=i,
+            title=f"Seat {i}",
+            shorthand=f"S{i}",
+            reservable=i % 2 == 0,
+            has_monitor=True,
+            sit_stand=False,
+            x=i,
+            y=i,
+        )
+        for i in range(seat_count)
+    ]
+    reservations: list[tuple[int, TimeRange]] = []
+    for seat in seats:
+        # A seat is never double-booked, so each seat's reservations use distinct slots.
+        for slot in rng.sample(range(16), RESERVATIONS_PER_SEAT):
+            start = opens + timedelta(minutes=30 * slot)
+            reservations.append(
+                (seat.id, TimeRange(start=start, end=start + timedelta(minutes=30)))
+            )
+    return seats, bounds, reservations
+
+
+def availability_list_path(seats, bounds, reservations):
+    open_list = AvailabilityList(availability=[bounds])
+    seat_availability = {
+        seat.id: SeatAvailability(
+            availability=open_list.model_copy(deep=True).availability,
+            **seat.model_dump(),
+        )
+        for seat in seats
+    }
+    for seat_id, reservation in reservations:
+        seat_availability[seat_id].subtract(reservation)
+    available = []
+    for seat in seat_availability.values():
+        seat.filter_time_ranges_below(MINIMUM)
+        if len(seat.availability) > 0:
+            available.append(seat)
+    return available
+
+
+def engine_path(seats, bounds, reservations):
+    return availability_engine.seat_availability(
+        seats,
+        [availability_engine.to_interval(bounds)],
+        (
+            (seat_id, availability_engine.to_interval(reservation))
+            for seat_id, reservation in reservations
+        ),
+        MINIMUM,
+    )
+
+
+def main():
+    print(f"{'seats':>8} {'AvailabilityList':>18} {'engine':>10} {'speedup':>8}")
+    for seat_count in SEAT_COUNTS:
+        fixture = make_fixture(seat_count)
+        baseline = min(
+            timeit.repeat(
+                lambda: availability_list_path(*fixture), number=1, repeat=REPEAT
+            )
+        )
+        engine = min(
+            timeit.repeat(lambda: engine_path(*fixture), number=1, repeat=REPEAT)
+        )
+        print(
+            f"{seat_count:>8} {baseline * 1000:>16.1f}ms {engine * 1000:>8.1f}ms {baseline / engine:>7.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
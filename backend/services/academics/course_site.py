@@ -5,11 +5,16 @@ APIs for working with course sites.
 from datetime import datetime
 from itertools import groupby
 from fastapi import Depends
-from sqlalchemy import select, or_, func
+from sqlalchemy import Select, select, func
 from sqlalchemy.orm import Session, joinedload
 from ...database import db_session
 from ...models.user import User
-from ...models.pagination import PaginationParams, Paginated
+from ...models.pagination import (
+    PaginationParams,
+    Paginated,
+    CursorPaginated,
+    CursorPaginationParams,
+)
 from ...models.academics.section_member import RosterRole
 from ...models.academics.my_courses import (
     CourseSiteOverview,
@@ -32,6 +37,9 @@ from ...entities.office_hours import OfficeHoursEntity, CourseSiteEntity
 from ...entities.user_entity import UserEntity
 from ...entities.academics.section_member_entity import SectionMemberEntity
 from ..exceptions import CoursePermissionException, ResourceNotFoundException
+from ..pagination import SortKey, paginate_by_cursor, sort_key
+from ..user import USER_SORT_COLUMNS
+from ..search import contains_text
 
 __authors__ = ["Ajay Gandecha", "Kris Jordan"]
 __copyright__ = "Copyright 2024"
@@ -173,14 +181,8 @@ class CourseSiteService:
             Paginated[CourseMemberOverview]
         """
 
-        # Start building the query
-        member_query = (
-            select(SectionMemberEntity)
-            .join(SectionEntity)
-            .join(UserEntity)
-            .where(SectionEntity.course_site_id == site_id)
-            .options(joinedload(SectionMemberEntity.section))
-            .options(joinedload(SectionMemberEntity.user))
+        member_query, is_student = self._roster_query(
+            user, site_id, pagination_params.filter
         )
 
         # Add order by sort from pagination parameters
@@ -189,37 +191,6 @@ class CourseSiteService:
                 getattr(UserEntity, pagination_params.order_by)
             )
 
-        # Create query off of the member query for just the members matching
-        # with the current user (used to determine permissions)
-        user_member_query = member_query.where(SectionMemberEntity.user_id == user.id)
-        user_members = self._session.scalars(user_member_query).all()
-
-        # If the user is not a member of the looked up course, throw an error
-        if len(user_members) == 0:
-            raise CoursePermissionException(
-                "Not allowed to access the roster of a course you are not a member of."
-            )
-
-        # Determines if a user is a student
-        # NOTE: This can be used to limit roster data a user can see compared to
-        # an instructor in the future.
-        is_student = user_members[0].member_role == RosterRole.STUDENT
-
-        # In the cases where sections are taught by different instructors, ensure that
-        # the roster data only includes sections that the user has permissions for.
-        section_ids = [member.section_id for member in user_members]
-        member_query = member_query.where(SectionEntity.id.in_(section_ids))
-
-        # Add filtering by inputted pagination parameters
-        if pagination_params.filter != "":
-            query = pagination_params.filter
-            criteria = or_(
-                UserEntity.first_name.ilike(f"%{query}%"),
-                UserEntity.last_name.ilike(f"%{query}%"),
-                UserEntity.onyen.ilike(f"%{query}%"),
-            )
-            member_query = member_query.where(criteria)
-
         # Count the number of rows before applying pagination and filter.
         count_query = select(func.count()).select_from(member_query.subquery())
         length = self._session.scalar(count_query)
@@ -248,6 +219,99 @@ class CourseSiteService:
             params=pagination_params,
         )
 
+    def get_course_site_roster_by_cursor(
+        self,
+        user: User,
+        site_id: int,
+        pagination_params: CursorPaginationParams,
+    ) -> CursorPaginated[CourseMemberOverview]:
+        """
+        Get a page of members for a course by cursor.
+
+        Returns:
+            CursorPaginated[CourseMemberOverview]
+        """
+        member_query, is_student = self._roster_query(
+            user, site_id, pagination_params.filter
+        )
+        count_query = select(func.count()).select_from(member_query.subquery())
+
+        # Order as the offset paginated roster does, ending in a unique column
+        keys: list[SortKey] = []
+        if pagination_params.order_by != "":
+            keys.append(sort_key(USER_SORT_COLUMNS, pagination_params.order_by))
+        keys += [
+            (SectionEntity.id, True),
+            (UserEntity.first_name, True),
+            (SectionMemberEntity.member_role, True),
+            (SectionMemberEntity.id, True),
+        ]
+
+        return paginate_by_cursor(
+            self._session,
+            member_query,
+            keys,
+            pagination_params,
+            lambda members: [
+                self._to_course_member_overview(member, is_student)
+                for member in members
+            ],
+            count_query,
+        )
+
+    def _roster_query(
+        self, user: User, site_id: int, filter: str
+    ) -> tuple[Select, bool]:
+        """
+        Build the query for the members of a course visible to a user.
+
+        Returns:
+            tuple[Select, bool]: The query and whether the user is a student of the course.
+
+        Raises:
+            CoursePermissionException: If the user is not a member of the course.
+        """
+        # Start building the query
+        member_query = (
+            select(SectionMemberEntity)
+            .join(SectionEntity)
+            .join(UserEntity)
+            .where(SectionEntity.course_site_id == site_id)
+            .options(joinedload(SectionMemberEntity.section))
+            .options(joinedload(SectionMemberEntity.user))
+        )
+
+        # Create query off of the member query for just the members matching
+        # with the current user (used to determine permissions)
+        user_member_query = member_query.where(SectionMemberEntity.user_id == user.id)
+        user_members = self._session.scalars(user_member_query).all()
+
+        # If the user is not a member of the looked up course, throw an error
+        if len(user_members) == 0:
+            raise CoursePermissionException(
+                "Not allowed to access the roster of a course you are not a member of."
+            )
+
+        # Determines if a user is a student
+        # NOTE: This can be used to limit roster data a user can see compared to
+        # an instructor in the future.
+        is_student = user_members[0].member_role == RosterRole.STUDENT
+
+        # In the cases where sections are taught by different instructors, ensure that
+        # the roster data only includes sections that the user has permissions for.
+        section_ids = [member.section_id for member in user_members]
+        member_query = member_query.where(SectionEntity.id.in_(section_ids))
+
+        # Add filtering by inputted pagination parameters
+        if filter != "":
+            query = filter
+            criteria = contains_text(
+                query, UserEntity.first_name, UserEntity.last_name, UserEntity.onyen
+            )
+            member_query = member_query.where(criteria)
+
+        return member_query, is_student
+
     def _to_course_member_overview(
         self, section_member: SectionMemberEntity, is_student: bool
     ) -> CourseMemberOverview:
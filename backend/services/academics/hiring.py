@@ -5,10 +5,15 @@ Service for hiring.
 from itertools import groupby
 from operator import attrgetter
 from fastapi import Depends
-from sqlalchemy import String, func, or_, select, update
+from sqlalchemy import String, func, select, update
 from sqlalchemy.orm import Session, joinedload, with_polymorphic, selectinload
 
-from backend.models.pagination import Paginated, PaginationParams
+from backend.models.pagination import (
+    Paginated,
+    PaginationParams,
+    CursorPaginated,
+    CursorPaginationParams,
+)
 from ...database import db_session
 from ..permission import PermissionService
 from ...models.user import User
@@ -28,6 +33,8 @@ from ...entities.academics.hiring.hiring_level_entity import HiringLevelEntity
 from ...entities.academics.hiring.hiring_assignment_entity import HiringAssignmentEntity
 
 from ..exceptions import CoursePermissionException, ResourceNotFoundException
+from ..pagination import SortKey, paginate_by_cursor
+from ..search import contains_text
 from ...services import PermissionService
 from ...models.academics.hiring.application_review import (
     HiringStatus,
@@ -835,10 +842,7 @@ class HiringService:
         # Filter based on search entry
         if pagination_params.filter != "":
             query = pagination_params.filter
-            criteria = or_(
-                UserEntity.first_name.ilike(f"%{query}%"),
-                UserEntity.last_name.ilike(f"%{query}%"),
-            )
+            criteria = contains_text(query, UserEntity.first_name, UserEntity.last_name)
             assignment_query = assignment_query.join(HiringAssignmentEntity.user).where(
                 criteria
             )
@@ -871,6 +875,57 @@ class HiringService:
             params=pagination_params,
         )
 
+    def get_hiring_summary_overview_by_cursor(
+        self, subject: User, term_id: str, pagination_params: CursorPaginationParams
+    ) -> CursorPaginated[HiringAssignmentSummaryOverview]:
+        """Returns a page of the hires to show on a summary page for a given term by cursor."""
+        # 1. Check for hiring permissions.
+        self._permission.enforce(subject, "hiring.summary", "*")
+        # 2. Build query, ordered by the hire's last name as in the offset paginated summary
+        criteria = [
+            HiringAssignmentEntity.term_id == term_id,
+            HiringAssignmentEntity.status.in_(
+                [HiringAssignmentStatus.COMMIT, HiringAssignmentStatus.FINAL]
+            ),
+        ]
+        if pagination_params.filter != "":
+            query = pagination_params.filter
+            criteria.append(
+                contains_text(query, UserEntity.first_name, UserEntity.last_name)
+            )
+        assignment_query = (
+            select(HiringAssignmentEntity)
+            .join(HiringAssignmentEntity.user)
+            .where(*criteria)
+            .options(
+                joinedload(HiringAssignmentEntity.course_site)
+                .joinedload(CourseSiteEntity.sections)
+                .joinedload(SectionEntity.staff),
+            )
+        )
+        count_query = (
+            select(func.count())
+            .select_from(HiringAssignmentEntity)
+            .join(HiringAssignmentEntity.user)
+            .where(*criteria)
+        )
+        keys: list[SortKey] = [
+            (UserEntity.last_name, True),
+            (HiringAssignmentEntity.id, True),
+        ]
+
+        # 3. Fetch page and build summary models
+        return paginate_by_cursor(
+            self._session,
+            assignment_query,
+            keys,
+            pagination_params,
+            lambda assignments: [
+                assignment.to_summary_overview_model() for assignment in assignments
+            ],
+            count_query,
+        )
+
     def get_hiring_summary_for_csv(
         self, subject: User, term_id: str
     ) -> list[HiringAssignmentCsvRow]:
@@ -938,12 +993,13 @@ class HiringService:
         # Filter based on search entry
         if pagination_params.filter != "":
             query = pagination_params.filter
-            criteria = or_(
-                UserEntity.first_name.ilike(f"%{query}%"),
-                UserEntity.last_name.ilike(f"%{query}%"),
-                UserEntity.onyen.ilike(f"%{query}%"),
-                UserEntity.email.ilike(f"%{query}%"),
-                HiringLevelEntity.title.ilike(f"%{query}%"),
+            criteria = contains_text(
+                query,
+                UserEntity.first_name,
+                UserEntity.last_name,
+                UserEntity.onyen,
+                UserEntity.email,
+                HiringLevelEntity.title,
             )
             assignments_query = assignments_query.where(criteria)
             count_query = count_query.where(criteria)
@@ -0,0 +1,156 @@
+"""In-process caching primitives shared by services.
+
+Services are constructed per request by FastAPI, so anything cached on a service instance is
+discarded at the end of the request. Caches that should outlive a request are instead created
+at module scope and shared by every request handled by the process. Each worker process holds
+its own copy, so cached values must be invalidated by the services that change them and must
+tolerate being briefly stale across workers, which is bounded by the cache's time-to-live.
+"""
+
+from collections import OrderedDict
+from datetime import timedelta
+from threading import Lock
+from time import monotonic, perf_counter
+from typing import Callable, Generic, Hashable, TypeVar
+
+from ..models.cache_stats import CacheStats
+
+__authors__ = ["Kris Jordan"]
+__copyright__ = "Copyright 2024"
+__license__ = "MIT"
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+_MISSING = object()
+
+
+class TTLCache(Generic[K, V]):
+    """A thread-safe, bounded LRU cache whose entries expire after a time-to-live.
+
+    FastAPI runs synchronous route handlers in a thread pool, so all bookkeeping happens
+    under a lock. Values are computed outside of the lock; an invalidation that occurs while a
+    value is being computed prevents that (possibly stale) value from being stored."""
+
+    def __init__(
+        self,
+        name: str,
+        ttl: timedelta,
+        maxsize: int = 1024,
+        clock: Callable[[], float] = monotonic,
+    ):
+        """Initializes a new TTLCache.
+
+        Args:
+            name (str): A name identifying the cache in its stats.
+            ttl (timedelta): How long an entry remains valid after it is stored.
+            maxsize (int): The maximum number of entries before the least recently used is evicted.
+            clock (Callable[[], float]): Source of the current time in seconds, overridable for tests.
+        """
+        self._name = name
+        self._ttl = ttl.total_seconds()
+        self._maxsize = maxsize
+        self._clock = clock
+        self._lock = Lock()
+        self._entries: OrderedDict[K, tuple[float, V]] = OrderedDict()
+        self._generation = 0
+        self._hits = 0
+        self._misses = 0
+        self._invalidations = 0
+        self._lookup_seconds = 0.0
+
+    def get(self, key: K, default: V | None = None) -> V | None:
+        """Returns the cached value for a key, or default if it is missing or expired."""
+        started = perf_counter()
+        with self._lock:
+            value = self._lookup(key)
+            self._lookup_seconds += perf_counter() - started
+        return default if value is _MISSING else value
+
+    def get_or_compute(self, key: K, compute: Callable[[], V]) -> V:
+        """Returns the cached value for a key, computing and storing it on a miss.
+
+        Args:
+            key (K): The cache key.
+            compute (Callable[[], V]): Produces the value when it is not cached.
+
+        Returns:
+            V: The cached or freshly computed value.
+        """
+        started = perf_counter()
+        with self._lock:
+            value = self._lookup(key)
+            generation = self._generation
+            if value is not _MISSING:
+                self._lookup_seconds += perf_counter() - started
+                return value
+
+        try:
+            value = compute()
+        finally:
+            with self._lock:
+                self._lookup_seconds += perf_counter() - started
+                if value is not _MISSING and generation == self._generation:
+                    self._store(key, value)
+        return value
+
+    def put(self, key: K, value: V) -> None:
+        """Stores a value for a key, replacing any existing entry."""
+        with self._lock:
+            self._store(key, value)
+
+    def invalidate(self, key: K | None = None) -> None:
+        """Removes one key, or every key when none is given.
+
+        Any values being computed at the time of an invalidation are not stored, since they may
+        have been computed from the data the invalidation reports changed. Values being computed
+        for other keys are discarded too, which costs only their recomputation on the next miss.
+        """
+        with self._lock:
+            self._invalidations += 1
+            self._generation += 1
+            if key is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        """Removes every entry and resets the counters."""
+        with self._lock:
+            self._entries.clear()
+            self._generation += 1
+            self._hits = self._misses = self._invalidations = 0
+            self._lookup_seconds = 0.0
+
+    def stats(self) -> CacheStats:
+        """Returns the hit, miss, and invalidation counters and the mean lookup latency of the cache."""
+        with self._lock:
+            lookups = self._hits + self._misses
+            return CacheStats(
+                name=self._name,
+                hits=self._hits,
+                misses=self._misses,
+                invalidations=self._invalidations,
+                size=len(self._entries),
+                hit_ratio=self._hits / lookups if lookups > 0 else 0.0,
+                mean_lookup_ms=(
+                    self._lookup_seconds * 1000 / lookups if lookups > 0 else 0.0
+                ),
+            )
+
+    def _lookup(self, key: K) -> V | object:
+        entry = self._entries.get(key)
+        if entry is None or entry[0] <= self._clock():
+            if entry is not None:
+                del self._entries[key]
+            self._misses += 1
+            return _MISSING
+        self._entries.move_to_end(key)
+        self._hits += 1
+        return entry[1]
+
+    def _store(self, key: K, value: V) -> None:
+        self._entries[key] = (self._clock() + self._ttl, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self._maxsize:
+            self._entries.popitem(last=False)
@@ -0,0 +1,181 @@
+"""Compact interval arithmetic for computing seat availability.
+
+Availability is represented as sorted lists of non-overlapping, half-open `(start, end)`
+intervals over plain integers (microseconds since the epoch) rather than lists of pydantic
+`TimeRange` models. Subtracting all of a seat's reservations is a single merge-sweep over
+sorted arrays, and models are only constructed once the final availability is known.
+"""
+
+from datetime import datetime, timedelta
+from typing import Iterable, Mapping, Sequence
+
+from ...models.coworking import Seat, SeatAvailability, TimeRange
+
+__authors__ = ["Kris Jordan"]
+__copyright__ = "Copyright 2024"
+__license__ = "MIT"
+
+Interval = tuple[int, int]
+"""A half-open interval of epoch microseconds, `start` inclusive and `end` exclusive."""
+
+_EPOCH = datetime(1970, 1, 1)
+_MICROSECOND = timedelta(microseconds=1)
+
+
+def to_epoch(moment: datetime) -> int:
+    """Convert a naive datetime to integer microseconds since the epoch, without loss."""
+    return (moment - _EPOCH) // _MICROSECOND
+
+
+def from_epoch(value: int) -> datetime:
+    """Convert integer microseconds since the epoch back to a naive datetime."""
+    return _EPOCH + timedelta(microseconds=value)
+
+
+def to_interval(time_range: TimeRange) -> Interval:
+    """Convert a TimeRange to an Interval."""
+    return (to_epoch(time_range.start), to_epoch(time_range.end))
+
+
+def constrain(availability: Sequence[Interval], bounds: Interval) -> list[Interval]:
+    """Clip sorted, non-overlapping availability to the given bounds.
+
+    Args:
+        availability (Sequence[Interval]): Sorted, non-overlapping intervals.
+        bounds (Interval): The bounds to constrain availability within.
+
+    Returns:
+        list[Interval]: The portions of availability that fall within bounds."""
+    lower, upper = bounds
+    return [
+        (max(start, lower), min(end, upper))
+        for start, end in availability
+        if start < upper and end > lower
+    ]
+
+
+def subtract(
+    availability: Sequence[Interval], blocks: Iterable[Interval]
+) -> list[Interval]:
+    """Remove every block from sorted, non-overlapping availability in one sweep.
+
+    Blocks may be unsorted and may overlap one another.
+
+    Args:
+        availability (Sequence[Interval]): Sorted, non-overlapping intervals.
+        blocks (Iterable[Interval]): Intervals to remove from availability.
+
+    Returns:
+        list[Interval]: The remaining availability, sorted and non-overlapping."""
+    blocks = sorted(blocks)
+    if len(blocks) == 0:
+        return list(availability)
+
+    result: list[Interval] = []
+    first = 0
+    for start, end in availability:
+        # Blocks ending before this interval cannot affect it, nor any later interval.
+        while first < len(blocks) and blocks[first][1] <= start:
+            first += 1
+
+        cursor = start
+        i = first
+        while i < len(blocks) and blocks[i][0] < end:
+            block_start, block_end = blocks[i]
+            if block_start > cursor:
+                result.append((cursor, block_start))
+            cursor = max(cursor, block_end)
+            i += 1
+
+        if cursor < end:
+            result.append((cursor, end))
+
+    return result
+
+
+def drop_shorter_than(
+    availability: Sequence[Interval], minimum: timedelta
+) -> list[Interval]:
+    """Remove intervals whose duration is less than the minimum."""
+    threshold = minimum // _MICROSECOND
+    return [(start, end) for start, end in availability if end - start >= threshold]
+
+
+def group_by_seat(
+    reservations: Iterable[tuple[int, Interval]]
+) -> dict[int, list[Interval]]:
+    """Group `(seat_id, interval)` pairs into each seat's sorted reserved intervals."""
+    blocks_by_seat: dict[int, list[Interval]] = {}
+    for seat_id, interval in reservations:
+        blocks_by_seat.setdefault(seat_id, []).append(interval)
+    for blocks in blocks_by_seat.values():
+        blocks.sort()
+    return blocks_by_seat
+
+
+def remaining_availability(
+    seats: Sequence[Seat],
+    open_hours: Sequence[Interval],
+    blocks_by_seat: Mapping[int, Sequence[Interval]],
+    minimum: timedelta,
+) -> list[tuple[Seat, list[Interval]]]:
+    """Compute the remaining availability of many seats without constructing models.
+
+    Args:
+        seats (Sequence[Seat]): The seats to compute availability for.
+        open_hours (Sequence[Interval]): Sorted, non-overlapping open hours, already bounded.
+        blocks_by_seat (Mapping[int, Sequence[Interval]]): Each seat's reserved intervals, by seat ID.
+        minimum (timedelta): Availability shorter than this is discarded.
+
+    Returns:
+        list[tuple[Seat, list[Interval]]]: Seats with remaining availability, in the order of `seats`.
+    """
+    unique_seats = {seat.id: seat for seat in seats if seat.id is not None}
+
+    remaining_seats: list[tuple[Seat, list[Interval]]] = []
+    for seat in unique_seats.values():
+        remaining = drop_shorter_than(
+            subtract(open_hours, blocks_by_seat.get(seat.id, [])), minimum
+        )
+        if len(remaining) > 0:
+            remaining_seats.append((seat, remaining))
+
+    return remaining_seats
+
+
+def to_seat_availability(
+    seat: Seat, availability: Sequence[Interval]
+) -> SeatAvailability:
+    """Construct the SeatAvailability model of a seat from its remaining availability."""
+    return SeatAvailability(
+        availability=[
+            TimeRange(start=from_epoch(start), end=from_epoch(end))
+            for start, end in availability
+        ],
+        **seat.model_dump(),
+    )
+
+
+def seat_availability(
+    seats: Sequence[Seat],
+    open_hours: Sequence[Interval],
+    reservations: Iterable[tuple[int, Interval]],
+    minimum: timedelta,
+) -> list[SeatAvailability]:
+    """Compute the availability of many seats against a single set of reservations.
+
+    Args:
+        seats (Sequence[Seat]): The seats to compute availability for.
+        open_hours (Sequence[Interval]): Sorted, non-overlapping open hours, already bounded.
+        reservations (Iterable[tuple[int, Interval]]): `(seat_id, interval)` pairs of active reservations.
+        minimum (timedelta): Availability shorter than this is discarded.
+
+    Returns:
+        list[SeatAvailability]: Seats with remaining availability, in the order of `seats`.
+    """
+    return [
+        to_seat_availability(seat, remaining)
+        for seat, remaining in remaining_availability(
+            seats, open_hours, group_by_seat(reservations), minimum
+        )
+    ]
@@ -0,0 +1,35 @@
+"""Process-wide caches shared by the coworking services."""
+
+from datetime import timedelta
+from ..cache import TTLCache
+from ...models.coworking import Status
+from .operating_hours_calendar import OperatingHoursCalendar
+
+__authors__ = ["Kris Jordan"]
+__copyright__ = "Copyright 2024"
+__license__ = "MIT"
+
+OPERATING_HOURS_CALENDAR_KEY = "calendar"
+
+xl_status_snapshot: TTLCache[tuple[timedelta, timedelta, timedelta], Status] = TTLCache(
+    "coworking.xl_status", ttl=timedelta(seconds=10), maxsize=16
+)
+"""Snapshots of the XL's seat availability and upcoming operating hours, shared by all users.
+
+The seat availability and operating hours shown to a user depend on their walk-in window, initial
+walk-in duration, and reservation window policies, which key the snapshots, so users given
+different policies never see one another's snapshot.
+
+Every XL status poll would otherwise recompute the same seat availability. The snapshot is
+invalidated whenever a reservation or operating hours change state, and otherwise expires
+shortly so that time-based changes, such as availability starting from the current moment,
+are reflected."""
+
+operating_hours_calendar: TTLCache[str, OperatingHoursCalendar] = TTLCache(
+    "coworking.operating_hours_calendar", ttl=timedelta(minutes=5), maxsize=1
+)
+"""Every operating hours entry of the XL, indexed for range lookups.
+
+Operating hours are read by the status, seat availability, and room map paths, but change only
+when an administrator creates or deletes them, which invalidates the calendar. The time-to-live
+bounds how long other workers serve a calendar that predates such a change."""
@@ -1,5 +1,6 @@
 """Service that manages operating hours of the XL."""
 
+from datetime import datetime
 from fastapi import Depends
 from sqlalchemy.orm import Session
 from .exceptions import OperatingHoursCannotOverlapException
@@ -9,6 +10,12 @@ from ...models import User
 from ...database import db_session
 from ...models.coworking import OperatingHours, TimeRange
 from ...entities.coworking import OperatingHoursEntity
+from .cache import (
+    OPERATING_HOURS_CALENDAR_KEY,
+    operating_hours_calendar,
+    xl_status_snapshot,
+)
+from .operating_hours_calendar import OperatingHoursCalendar
 
 __authors__ = ["Kris Jordan"]
 __copyright__ = "Copyright 2023"
@@ -31,6 +38,7 @@ class OperatingHoursService:
         """
         self._session = session
         self._permission_svc = permission_svc
+        self._schedule_memo: dict[tuple[datetime, datetime], list[OperatingHours]] = {}
 
     def get_by_id(self, id: int) -> OperatingHours:
         """Lookup an Operating Hours object by its id.
@@ -51,12 +59,29 @@ class OperatingHoursService:
     def schedule(self, time_range: TimeRange) -> list[OperatingHours]:
         """Returns all operating hours of the XL for a given date range.
 
+        Lookups are served from the process-wide operating hours calendar, and repeated lookups of the
+        same range by this service, which FastAPI shares across a request, are memoized.
+
         Args:
             time_range (TimeRange): The date range to check for matching OperatingHours.
 
         Returns:
             list[OperatingHours]: All operating hours the XL within the given time_range, including overlaps.
         """
+        key = (time_range.start, time_range.end)
+        if key not in self._schedule_memo:
+            calendar = operating_hours_calendar.get_or_compute(
+                OPERATING_HOURS_CALENDAR_KEY, self._load_calendar
+            )
+            self._schedule_memo[key] = calendar.overlapping(time_range)
+        return list(self._schedule_memo[key])
+
+    def _load_calendar(self) -> OperatingHoursCalendar:
+        entities = self._session.query(OperatingHoursEntity).all()
+        return OperatingHoursCalendar([entity.to_model() for entity in entities])
+
+    def _query_schedule(self, time_range: TimeRange) -> list[OperatingHours]:
+        """Queries the database for the operating hours overlapping a time range, bypassing the calendar."""
         entities = (
             self._session.query(OperatingHoursEntity)
             .filter(
@@ -82,7 +107,9 @@ class OperatingHoursService:
             subject, "coworking.operating_hours.create", "coworking/operating_hours"
         )
 
-        conflicts = self.schedule(time_range)
+        # Conflicts are checked against the database, since another worker's change may not yet be
+        # reflected in this process's calendar.
+        conflicts = self._query_schedule(time_range)
         if len(conflicts) > 0:
             raise OperatingHoursCannotOverlapException(
                 f"Conflicts in the range of {str(time_range)}"
@@ -91,6 +118,7 @@ class OperatingHoursService:
         entity = OperatingHoursEntity(start=time_range.start, end=time_range.end)
         self._session.add(entity)
         self._session.commit()
+        self._invalidate()
         return entity.to_model()
 
     def delete(self, subject: User, operating_hours: OperatingHours) -> None:
@@ -114,3 +142,10 @@ class OperatingHoursService:
         )
         self._session.delete(operating_hours_entity)
         self._session.commit()
+        self._invalidate()
+
+    def _invalidate(self) -> None:
+        """Discards cached operating hours after they change."""
+        self._schedule_memo.clear()
+        operating_hours_calendar.invalidate()
+        xl_status_snapshot.invalidate()
@@ -0,0 +1,45 @@
+"""In-memory calendar of the XL's operating hours supporting fast range lookups."""
+
+from bisect import bisect_left, bisect_right
+from itertools import accumulate
+from typing import Sequence
+
+from ...models.coworking import OperatingHours, TimeRange
+
+__authors__ = ["Kris Jordan"]
+__copyright__ = "Copyright 2024"
+__license__ = "MIT"
+
+
+class OperatingHoursCalendar:
+    """An immutable, start-ordered list of operating hours indexed for range lookups.
+
+    Operating hours are not expected to overlap, but lookups remain correct if they do: entries are
+    ordered by start, and a running maximum of their ends bounds where entries that may still be
+    open at the start of a range begin."""
+
+    def __init__(self, operating_hours: Sequence[OperatingHours]):
+        """Initializes a calendar of the given operating hours.
+
+        Args:
+            operating_hours (Sequence[OperatingHours]): The operating hours, in any order.
+        """
+        self._hours = sorted(operating_hours, key=lambda hours: hours.start)
+        self._starts = [hours.start for hours in self._hours]
+        self._max_ends = list(accumulate((hours.end for hours in self._hours), max))
+
+    def __len__(self) -> int:
+        return len(self._hours)
+
+    def overlapping(self, time_range: TimeRange) -> list[OperatingHours]:
+        """Returns the operating hours that overlap a time range, including those that only touch it.
+
+        Args:
+            time_range (TimeRange): The time range to look up.
+
+        Returns:
+            list[OperatingHours]: The matching operating hours, ordered by start.
+        """
+        lo = bisect_left(self._max_ends, time_range.start)
+        hi = bisect_right(self._starts, time_range.end)
+        return [hours for hours in self._hours[lo:hi] if hours.end >= time_range.start]
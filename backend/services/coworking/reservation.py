@@ -1,11 +1,22 @@
 """Service that manages reservations in the coworking space."""
 
+import zlib
 from fastapi import Depends
 from datetime import datetime, timedelta
 from random import random
 from typing import Sequence
-from sqlalchemy import or_, and_
-from sqlalchemy.orm import Session, joinedload
+from sqlalchemy import (
+    ColumnElement,
+    or_,
+    and_,
+    not_,
+    case,
+    func,
+    select,
+    text,
+    update,
+)
+from sqlalchemy.orm import Session, joinedload, selectinload
 from backend.entities.room_entity import RoomEntity
 
 from backend.models.room_details import RoomDetails
@@ -22,20 +33,43 @@ from ...models.coworking import (
     SeatAvailability,
     ReservationState,
     RoomState,
-    AvailabilityList,
     OperatingHours,
 )
 from ...entities import UserEntity
-from ...entities.coworking import ReservationEntity, SeatEntity
+from ...entities.coworking import (
+    ReservationEntity,
+    RoomReservationUsageEntity,
+    SeatEntity,
+)
+from ...entities.coworking.room_reservation_usage_entity import (
+    RECONCILE as RECONCILE_ROOM_RESERVATION_USAGE,
+)
+from ...entities.coworking.reservation_user_table import reservation_user_table
 from .seat import SeatService
 from .policy import PolicyService
 from .operating_hours import OperatingHoursService
+from . import availability_engine
+from .cache import xl_status_snapshot
+from .room_slot_grid import RoomSlotGrid
 from ..permission import PermissionService
 
 __authors__ = ["Kris Jordan", "Matt Vu", "Yuvraj Jain"]
 __copyright__ = "Copyright 2023-24"
 __license__ = "MIT"
 
+MAX_MAP_DAYS = 31
+"""The most consecutive days of room reservation maps that can be requested at once."""
+
+# Namespaces of the advisory lock keys that serialize drafts claiming the same resource.
+_USER_LOCK = 1
+_SEAT_LOCK = 2
+_ROOM_LOCK = 3
+
+
+def _lock_key(namespace: int, id: int) -> int:
+    """Packs a lock namespace and a 32-bit resource ID into a single advisory lock key."""
+    return (namespace << 32) | id
+
 
 class ReservationException(Exception):
     def __init__(self, message: str):
@@ -84,13 +118,15 @@ class ReservationService:
 
         # The subject sould _be_ one of the users or have read access on reservations
         # for at least one of the users.
-        has_permission = False
-        for user in reservation.users:
-            if user.id == subject.id or self._permission_svc.check(
-                subject, "coworking.reservation.read", f"user/{user.id}"
-            ):
-                has_permission = True
-                break
+        has_permission = any(
+            user.id == subject.id for user in reservation.users
+        ) or any(
+            self._permission_svc.check_many(
+                subject,
+                "coworking.reservation.read",
+                [f"user/{user.id}" for user in reservation.users],
+            )
+        )
 
         if not has_permission:
             raise UserPermissionException("coworking.reservation.read", "user/")
@@ -147,6 +183,7 @@ class ReservationService:
                     [ReservationState.CANCELLED, ReservationState.CHECKED_OUT]
                 ),
                 UserEntity.id == focus.id,
+                self._unexpired_at(datetime.now()),
             )
             .options(
                 joinedload(ReservationEntity.users), joinedload(ReservationEntity.seats)
@@ -155,10 +192,6 @@ class ReservationService:
             .all()
         )
 
-        reservations = self._state_transition_reservation_entities_by_time(
-            datetime.now(), reservations
-        )
-
         return [reservation.to_model() for reservation in reservations]
 
     def _get_active_reservations_for_user_by_state(
@@ -175,6 +208,7 @@ class ReservationService:
                 ReservationEntity.end > time_range.start,
                 ReservationEntity.state == state,
                 UserEntity.id == focus.id,
+                self._unexpired_at(datetime.now()),
             )
             .options(
                 joinedload(ReservationEntity.users), joinedload(ReservationEntity.seats)
@@ -183,10 +217,6 @@ class ReservationService:
             .all()
         )
 
-        reservations = self._state_transition_reservation_entities_by_time(
-            datetime.now(), reservations
-        )
-
         return [reservation.to_model() for reservation in reservations]
 
     def _check_user_reservation_duration(
@@ -194,6 +224,9 @@ class ReservationService:
     ) -> bool:
         """Helper method to check if the total reservation duration for a user exceeds 6 hours.
 
+        Drafts hold the user's advisory lock, so the usage read cannot change between this check and
+        the insert of the draft.
+
         Args:
             user (User): The user for whom to check reservation duration.
             bounds (TimeRange): The time range to check for reservation duration.
@@ -202,36 +235,102 @@ class ReservationService:
             True if a user has >= 6 total hours reserved
             False if a user has exceeded the limit
         """
-        reservations = self.get_current_reservations_for_user(user, user)
-        total_duration = timedelta()
-        total_duration += bounds.end - bounds.start
-
-        for reservation in reservations:
-            if reservation.room:
-                total_duration += reservation.end - reservation.start
+        total_duration = (
+            bounds.end
+            - bounds.start
+            + self._room_reservation_usage(user, datetime.now())
+        )
         if total_duration > self._policy_svc.room_reservation_weekly_limit():
             return False
         return True
 
+    def _room_reservation_usage(self, user: UserIdentity, now: datetime) -> timedelta:
+        """Totals a user's current and upcoming room reservations, which count against the weekly room limit.
+
+        The reservations counted are the user's room reservations that are not cancelled, checked
+        out, or due a time-based transition, and that overlap the time from a day ago to the end of
+        the user's reservation window.
+
+        The room_reservation_usage ledger totals room reservations by the day they start on, so the
+        days the window spans are read from it. The ledger is then corrected by the few reservations
+        it counts differently: those starting on the window's first or last day but outside of the
+        window, those starting before its first day but overlapping it, and those due a time-based
+        transition that the sweeper has not persisted yet.
+
+        Args:
+            user (UserIdentity): The user whose room reservations are counted.
+            now (datetime): The current time.
+
+        Returns:
+            timedelta: The total duration of the user's room reservations.
+        """
+        window_start = now - timedelta(days=1)
+        window_end = now + self._policy_svc.reservation_window(user)
+        first_day = window_start.replace(hour=0, minute=0, second=0, microsecond=0)
+        last_day = window_end.replace(hour=0, minute=0, second=0, microsecond=0)
+        recorded = self._session.scalar(
+            RoomReservationUsageEntity.usage(user.id, first_day.date(), last_day.date())
+        )
+
+        duration = ReservationEntity.end - ReservationEntity.start
+        in_ledger = and_(
+            ReservationEntity.start >= first_day,
+            ReservationEntity.start < last_day + timedelta(days=1),
+        )
+        in_window = and_(
+            ReservationEntity.start < window_end,
+            ReservationEntity.end > window_start,
+            self._unexpired_at(now),
+        )
+        correction = self._session.scalar(
+            select(
+                func.sum(
+                    case(
+                        (and_(in_window, not_(in_ledger)), duration),
+                        (and_(in_ledger, not_(in_window)), -duration),
+                        else_=timedelta(),
+                    )
+                )
+            )
+            .join(
+                reservation_user_table,
+                reservation_user_table.c.reservation_id == ReservationEntity.id,
+            )
+            .where(
+                reservation_user_table.c.user_id == user.id,
+                ReservationEntity.room_id != None,
+                ReservationEntity.state.not_in(
+                    [ReservationState.CANCELLED, ReservationState.CHECKED_OUT]
+                ),
+                ReservationEntity.start < last_day + timedelta(days=1),
+                or_(
+                    ReservationEntity.start < first_day + timedelta(days=1),
+                    ReservationEntity.start >= last_day,
+                    not_(self._unexpired_at(now)),
+                ),
+            )
+        )
+        return (recorded or timedelta()) + (correction or timedelta())
+
     def get_total_time_user_reservations(self, user: UserIdentity) -> str:
         """Calculate the total duration (in hours) of study room reservations for the given user.
+
         Args:
             user (UserIdentity): The user for whom to calculate the total reservation time.
         Returns:
             str: The total reservation time in hours.
         """
-        reservations = self.get_current_reservations_for_user(user, user)
-        duration = timedelta()
-        for reservation in reservations:
-            if reservation.room:
-                duration += reservation.end - reservation.start
+        duration = self._room_reservation_usage(user, datetime.now())
         str_duration = str(6 - (round((duration.total_seconds() / 3600) * 2) / 2))
         if str_duration[2] == "0":
             return str_duration.rstrip("0").rstrip(".")
         return str_duration
 
     def get_map_reserved_times_by_date(
-        self, date: datetime, subject: User
+        self,
+        date: datetime,
+        subject: User,
+        slot_duration: timedelta = timedelta(minutes=30),
     ) -> ReservationMapDetails:
         """
         Retrieves a detailed mapping of room reservation statuses for a specific date, tailored for a given user.
@@ -247,17 +346,23 @@ class ReservationService:
         - The start (`operating_hours_start`) and end (`operating_hours_end`) times of operating hours for
         the date queried.
         - The total number of time slots (`number_of_time_slots`) available within the operating hours,
-        based on 30-minute intervals.
+        based on `slot_duration` intervals.
 
         It handles various scenarios including days without operating hours by providing a default schedule
         (10 am to 6 pm) and adjusting time slots based on current time to mark past slots as unavailable.
-        It supports rounding start and end times to the nearest half-hour and excludes reservations that
+        It supports rounding start and end times to the nearest time slot and excludes reservations that
         are outside the operating hours.
 
+        The statuses are computed on a dense room by time slot grid, where reservations and office hours fill
+        spans of a room's row and the subject's reservations gray out whole columns, so the cost grows with the
+        number of slots touched rather than the product of rooms and slots.
+
         Args:
             date (datetime): The date for which the reservation statuses are to be fetched.
             subject (User): The user for whom the reservation statuses are being determined, to highlight
                             their own reservations.
+            slot_duration (timedelta): The length of each time slot, 30 minutes by default. Should evenly
+                            divide an hour.
 
         Returns:
             ReservationMapDetails: An object containing the mapping of room reservation statuses,
@@ -266,119 +371,202 @@ class ReservationService:
         Note:
             This method assumes individual user reservations. Group reservations require adjustments to
             the implementation. Future reservations are shown up to the current time.
+
+        Raises:
+            ValueError: If slot_duration is not a whole number of minutes that evenly divides an hour.
         """
-        reserved_date_map: dict[str, list[int]] = {}
-        capacity_map: dict[str, int] = {}
-        room_type_map: dict[str, str] = {}
+        return self.get_map_reserved_times_by_date_range(
+            date, 1, subject, slot_duration
+        )[0]
+
+    def get_map_reserved_times_by_date_range(
+        self,
+        start_date: datetime,
+        days: int,
+        subject: User,
+        slot_duration: timedelta = timedelta(minutes=30),
+    ) -> list[ReservationMapDetails]:
+        """
+        Retrieves the room reservation status maps for consecutive days, tailored for a given user.
+
+        Each day's map is identical to the result of `get_map_reserved_times_by_date` for that day, but rooms,
+        operating hours, and reservations are each queried once for the whole range rather than once per day.
+
+        Args:
+            start_date (datetime): The first date for which reservation statuses are to be fetched.
+            days (int): The number of consecutive days, at most MAX_MAP_DAYS.
+            subject (User): The user for whom the reservation statuses are being determined.
+            slot_duration (timedelta): The length of each time slot, 30 minutes by default. Should evenly
+                            divide an hour.
+
+        Returns:
+            list[ReservationMapDetails]: One reservation map per day, in date order.
+
+        Raises:
+            ValueError: If days is out of range or slot_duration does not evenly divide an hour.
+        """
+        if days < 1 or days > MAX_MAP_DAYS:
+            raise ValueError(f"Days must be between 1 and {MAX_MAP_DAYS}.")
+        if (
+            slot_duration <= timedelta(0)
+            or slot_duration % timedelta(minutes=1) != timedelta(0)
+            or timedelta(hours=1) % slot_duration != timedelta(0)
+        ):
+            raise ValueError("Time slots must evenly divide an hour.")
 
         # Query DB to get reservable rooms.
         rooms = self._get_reservable_rooms()
 
-        # Generate a 1 day time range to get operating hours on date.
-        date_midnight = date.replace(hour=0, minute=0, second=0)
-        tomorrow_midnight = date_midnight + timedelta(days=1)
-        day_range = TimeRange(start=date_midnight, end=tomorrow_midnight)
+        # Operating hours for every day in the range are fetched at once.
+        range_start = start_date.replace(hour=0, minute=0, second=0, microsecond=0)
+        range_end = range_start + timedelta(days=days)
+        schedule = self._operating_hours_svc.schedule(
+            TimeRange(start=range_start, end=range_end)
+        )
+
+        # All room reservations for the range are fetched in a single query, along with the
+        # subject's own XL reservations.
+        reserved_slots = self._query_confirmed_reservations_by_date_for_rooms(
+            range_start,
+            [room.id for room in rooms if room.id != "SN156"],
+            subject,
+            days,
+            xl_room_id="SN156" if any(room.id == "SN156" for room in rooms) else None,
+        )
+
+        reservation_maps: list[ReservationMapDetails] = []
+        for day in range(days):
+            date_midnight = range_start + timedelta(days=day)
+            tomorrow_midnight = date_midnight + timedelta(days=1)
+            operating_hours_on_date = next(
+                (
+                    operating_hours
+                    for operating_hours in schedule
+                    if operating_hours.start <= tomorrow_midnight
+                    and operating_hours.end >= date_midnight
+                ),
+                None,
+            )
+            reserved_slots_on_date = [
+                reserved_slot
+                for reserved_slot in reserved_slots
+                if reserved_slot[1] < tomorrow_midnight
+                and reserved_slot[2] > date_midnight
+            ]
+            reservation_maps.append(
+                self._build_reservation_map(
+                    date_midnight,
+                    rooms,
+                    operating_hours_on_date,
+                    reserved_slots_on_date,
+                    slot_duration,
+                )
+            )
+        return reservation_maps
+
+    def _build_reservation_map(
+        self,
+        date: datetime,
+        rooms: Sequence[RoomDetails],
+        operating_hours_on_date: OperatingHours | None,
+        reserved_slots: Sequence[tuple[str, datetime, datetime, bool]],
+        slot_duration: timedelta,
+    ) -> ReservationMapDetails:
+        """
+        Builds the reservation map of a single date from already queried rooms, hours, and reservations.
+
+        Args:
+            date (datetime): The date of the map.
+            rooms (Sequence[RoomDetails]): The reservable rooms, including the XL.
+            operating_hours_on_date (OperatingHours | None): The operating hours on the date, if any.
+            reserved_slots (Sequence[tuple[str, datetime, datetime, bool]]): `(room_id, start, end, is_subject)`
+                rows of the reservations overlapping the date.
+            slot_duration (timedelta): The length of each time slot.
 
-        # Check if operating hours exist on date
-        try:
-            operating_hours_on_date = self._operating_hours_svc.schedule(day_range)[0]
-        except:
+        Returns:
+            ReservationMapDetails: The reservation map of the date.
+        """
+        capacity_map: dict[str, int] = {}
+        room_type_map: dict[str, str] = {}
+        for room in rooms:
+            capacity_map[room.id] = room.capacity
+            room_type_map[room.id] = (
+                "Pairing Room"
+                if room.capacity == 2
+                else "Small Group" if room.capacity < 6 else "Large Group"
+            )
+
+        if operating_hours_on_date is None:
             # TODO: Possibly consider thowing exception and handling on the frontend?
             # If operating hours don't exist, then return an all grayed out table
             # from 10 am to 6 pm which is the standard office hours.
+            operating_hours_start = datetime.now().replace(hour=10, minute=0)
+            number_of_time_slots = int(timedelta(hours=8) / slot_duration)
+            grid = RoomSlotGrid(
+                [room.id for room in rooms],
+                operating_hours_start,
+                number_of_time_slots,
+                slot_duration,
+            )
             for room in rooms:
-                if room.id:
-                    reserved_date_map[room.id] = [RoomState.UNAVAILABLE.value] * 16
-                    capacity_map[room.id] = room.capacity
-                    room_type_map[room.id] = (
-                        "Pairing Room"
-                        if room.capacity == 2
-                        else "Small Group" if room.capacity < 6 else "Large Group"
-                    )
+                grid.fill_room(room.id, RoomState.UNAVAILABLE)
             return ReservationMapDetails(
-                reserved_date_map=reserved_date_map,
+                reserved_date_map=grid.to_map(),
                 capacity_map=capacity_map,
                 room_type_map=room_type_map,
-                operating_hours_start=datetime.now().replace(hour=10, minute=0),
+                operating_hours_start=operating_hours_start,
                 operating_hours_end=datetime.now().replace(hour=18, minute=0),
-                number_of_time_slots=16,
+                number_of_time_slots=number_of_time_slots,
             )
 
-        # Extract the start time and end time for operating hours rounded to the closest half hour
+        # Extract the start time and end time for operating hours rounded to the closest time slot.
+        # Slots in the past on that day are left off of the start of the grid.
         operating_hours_start = max(
-            self._round_to_closest_half_hour(
-                operating_hours_on_date.start, round_up=True
+            self._round_to_slot(
+                operating_hours_on_date.start, slot_duration, round_up=True
             ),
-            self._round_to_closest_half_hour(datetime.now(), round_up=False),
+            self._round_to_slot(datetime.now(), slot_duration, round_up=False),
         )
-        operating_hours_end = self._round_to_closest_half_hour(
-            operating_hours_on_date.end, round_up=False
+        operating_hours_end = self._round_to_slot(
+            operating_hours_on_date.end, slot_duration, round_up=False
         )
-        operating_hours_time_delta = operating_hours_end - operating_hours_start
-
-        # Multiply by 2 because 30 min interval indexes
         operating_hours_duration = int(
-            2 * operating_hours_time_delta.total_seconds() / 3600
+            (operating_hours_end - operating_hours_start) / slot_duration
         )
 
-        # Need current time to gray out slots in the past on that day.
-        current_time = datetime.now()
-        current_time_idx = self._idx_calculation(current_time, operating_hours_start)
+        grid = RoomSlotGrid(
+            [room.id for room in rooms],
+            operating_hours_start,
+            operating_hours_duration,
+            slot_duration,
+        )
 
-        for room in rooms:
-            time_slots_for_room = [0] * operating_hours_duration
-
-            # # Making slots up till current time gray
-            # This code no longer required, but may be required in the future.
-            # Please keep this here for now.
-            # if date.date() == current_time.date():
-            #     for i in range(0, current_time_idx):
-            #         time_slots_for_room[i] = RoomState.UNAVAILABLE.value
-
-            if room.id == "SN156":
-                reservations = self._query_xl_reservations_by_date_for_user(
-                    date, subject
-                )
-            else:
-                reservations = self._query_confirmed_reservations_by_date_and_room(
-                    date, room.id
-                )
-            for reservation in reservations:
-                start_idx = self._idx_calculation(
-                    reservation.start, operating_hours_start
-                )
-                end_idx = self._idx_calculation(reservation.end, operating_hours_start)
-
-                if date.date() == current_time.date():
-                    if end_idx < current_time_idx:
-                        continue
-                    start_idx = max(current_time_idx, start_idx)
-
-                for idx in range(start_idx, end_idx):
-                    # Currently only assuming single user.
-                    # TODO: If making group reservations, need to change this.
-                    if reservation.users[0].id == subject.id:
-                        time_slots_for_room[idx] = RoomState.SUBJECT_RESERVED.value
-                    else:
-                        if time_slots_for_room[idx] != RoomState.SUBJECT_RESERVED.value:
-                            time_slots_for_room[idx] = RoomState.RESERVED.value
-            reserved_date_map[room.id] = time_slots_for_room
-            capacity_map[room.id] = room.capacity
-            room_type_map[room.id] = (
-                "Pairing Room"
-                if room.capacity == 2
-                else "Small Group" if room.capacity < 6 else "Large Group"
+        # Other users' reservations are filled first so that the subject's own reservations
+        # take precedence where they overlap.
+        for room_id, start, end, is_subject in sorted(
+            reserved_slots, key=lambda reserved_slot: reserved_slot[3]
+        ):
+            grid.fill(
+                room_id,
+                start,
+                end,
+                RoomState.SUBJECT_RESERVED if is_subject else RoomState.RESERVED,
             )
 
-        self._transform_date_map_for_unavailable(reserved_date_map)
-        if "SN156" in reserved_date_map:
-            del reserved_date_map["SN156"]
-        self._transform_date_map_for_officehours(
-            date, reserved_date_map, operating_hours_start, operating_hours_duration
+        # While the subject holds any reservation, including in the XL, all other rooms are unavailable.
+        grid.replace_in_columns(
+            grid.columns_with(RoomState.SUBJECT_RESERVED),
+            RoomState.AVAILABLE,
+            RoomState.UNAVAILABLE,
         )
 
+        # Rooms used for office hours are unavailable during them.
+        for room_id, hours in self._policy_svc.office_hours(date=date).items():
+            for start, end in hours:
+                grid.fill(room_id, start, end, RoomState.UNAVAILABLE)
+
         return ReservationMapDetails(
-            reserved_date_map=reserved_date_map,
+            reserved_date_map=grid.to_map(exclude=["SN156"]),
             capacity_map=capacity_map,
             room_type_map=room_type_map,
             operating_hours_start=operating_hours_start,
@@ -399,157 +587,94 @@ class ReservationService:
         Returns:
             datetime: Rounded datetime object.
         """
-        minutes = dt.minute
-
-        if round_up:
-            if minutes == 0:
-                to_add = timedelta(minutes=0)
-            elif minutes < 30:
-                to_add = timedelta(minutes=(30 - minutes))
-            else:
-                to_add = timedelta(minutes=(60 - minutes))
-            rounded_dt = dt + to_add
-        else:
-            if minutes >= 30:
-                to_subtract = timedelta(minutes=(minutes - 30))
-            else:
-                to_subtract = timedelta(minutes=minutes)
-            rounded_dt = dt - to_subtract
-
-        rounded_dt = rounded_dt.replace(second=0, microsecond=0)
-
-        return rounded_dt
+        return self._round_to_slot(dt, timedelta(minutes=30), round_up)
 
-    def _idx_calculation(self, time: datetime, operating_hours_start: datetime) -> int:
+    def _round_to_slot(
+        self, dt: datetime, slot_duration: timedelta, round_up: bool = True
+    ) -> datetime:
         """
-        Calculates the index of a time slot based on a given time.
-
-        This function converts a datetime object into an index representing a specific
-        time slot in the reservation system. Each hour is divided into two slots.
+        This helper rounds a datetime object to the closest time slot boundary either up or down based on the
+        round_up flag. Slot boundaries are multiples of slot_duration past the hour, and seconds are ignored.
 
         Args:
-            time (datetime): The time to convert into an index.
-            operating_hours_start (int): The hour when the XL opens as an int.
+            dt (datetime): The datetime object you want to round.
+            slot_duration (timedelta): The length of a time slot, which should evenly divide an hour.
+            round_up (bool): If True, rounds up to the closest slot boundary. If False, rounds down.
 
         Returns:
-            int: The index of the time slot corresponding to the given time.
-        """
-        return int(2 * (time.hour - operating_hours_start.hour)) + (
-            (time.minute - operating_hours_start.minute) // 30
-        )
-
-    def _transform_date_map_for_unavailable(
-        self, reserved_date_map: dict[str, list[int]]
-    ) -> None:
+            datetime: Rounded datetime object.
         """
-        Modifies the reserved date map to mark certain slots as unavailable.
-
-        This function updates the reserved date map so that if a slot is reserved by the subject
-        (indicated by a 4), then any available slots (indicated by 0) in the same column across
-        all rooms are marked as unavailable (changed to 3).
-
-        Args:
-            reserved_date_map (dict[str, list[int]]): The map of room reservations to be transformed.
+        slot_minutes = int(slot_duration.total_seconds() // 60)
+        remainder = dt.minute % slot_minutes
+        rounded_dt = dt.replace(second=0, microsecond=0) - timedelta(minutes=remainder)
+        if round_up and remainder > 0:
+            rounded_dt += slot_duration
+        return rounded_dt
 
-        Returns:
-            None: This function modifies the reserved_date_map in place.
-        """
-        # Identify the columns where 4 appears
-        columns_with_4 = set()
-        for key, values in reserved_date_map.items():
-            for i, value in enumerate(values):
-                if value == RoomState.SUBJECT_RESERVED.value:
-                    columns_with_4.add(i)
-
-        # Transform the dictionary as per the rules
-        for key, values in reserved_date_map.items():
-            for i in columns_with_4:
-                if values[i] == RoomState.AVAILABLE.value:
-                    values[i] = RoomState.UNAVAILABLE.value
-
-    def _transform_date_map_for_officehours(
+    def _query_confirmed_reservations_by_date_for_rooms(
         self,
         date: datetime,
-        reserved_date_map: dict[str, list[int]],
-        operating_hours_start: datetime,
-        operating_hours_duration: int,
-    ) -> None:
+        room_ids: Sequence[str],
+        subject: User,
+        days: int = 1,
+        xl_room_id: str | None = None,
+    ) -> list[tuple[str, datetime, datetime, bool]]:
         """
-        Transforms date map in place.
-        """
-        office_hours = self._policy_svc.office_hours(date=date)
-        for room_id, hours in office_hours.items():
-            if room_id not in reserved_date_map:
-                continue
-            for start, end in hours:
-                start_idx = max(self._idx_calculation(start, operating_hours_start), 0)
-                end_idx = min(
-                    self._idx_calculation(end, operating_hours_start),
-                    operating_hours_duration,
-                )
-                if start_idx < end_idx:
-                    for idx in range(start_idx, end_idx):
-                        reserved_date_map[room_id][idx] = RoomState.UNAVAILABLE.value
+        Queries active room reservations for a given date across many rooms at once.
 
-    def _query_confirmed_reservations_by_date_and_room(
-        self, date: datetime, room_id: str
-    ) -> Sequence[Reservation]:
-        """
-        Queries and returns confirmed and checked-in reservations for a given date and room.
-
-        This function fetches all confirmed and checked-in reservations from the database for a specified date and room.
-        It includes reservations that have any overlap with the 24-hour period starting from the
-        beginning of the given date, and are associated with a specific room ID.
+        A single grouped query fetches every reservation that overlaps the period of `days` days starting
+        at the beginning of the given date and belongs to one of the given rooms. Only the columns
+        needed to fill the reservation map are selected, so no entities or models are materialized.
 
         Args:
-            date (datetime): The date for which to query confirmed reservations.
-            room_id (str): The ID of the room for which to query confirmed reservations.
+            date (datetime): The date for which to query reservations.
+            room_ids (Sequence[str]): The IDs of the rooms for which to query reservations.
+            subject (User): The user whose own reservations should be flagged.
+            days (int): The number of consecutive days to query, starting at date.
+            xl_room_id (str | None): When given, the subject's own XL reservations, which have no room,
+                are also included and reported under this room ID.
 
         Returns:
-            Sequence[Reservation]: A sequence of Reservation model objects representing the confirmed reservations for the specified date and room.
+            list[tuple[str, datetime, datetime, bool]]: One `(room_id, start, end, is_subject)` row per
+                reservation, ordered by start time, where `is_subject` is True when the subject is party
+                to the reservation.
         """
-        start = date.replace(hour=0, minute=0, second=0, microsecond=0)
-        reservations = (
-            self._session.query(ReservationEntity)
-            .join(ReservationEntity.room)
-            .filter(
-                ReservationEntity.start < start + timedelta(hours=24),
-                ReservationEntity.end > start,
-                ReservationEntity.state.not_in(
-                    [ReservationState.CANCELLED, ReservationState.CHECKED_OUT]
-                ),
-                RoomEntity.id == room_id,
-            )
-            .options(
-                joinedload(ReservationEntity.users), joinedload(ReservationEntity.seats)
-            )
-            .order_by(ReservationEntity.start)
-            .all()
-        )
+        if len(room_ids) == 0 and xl_room_id is None:
+            return []
 
-        return [reservation.to_model() for reservation in reservations]
+        in_rooms = ReservationEntity.room_id.in_(room_ids)
+        is_subject = func.bool_or(reservation_user_table.c.user_id == subject.id)
 
-    def _query_xl_reservations_by_date_for_user(
-        self, date: datetime, subject: User
-    ) -> Sequence[Reservation]:
         start = date.replace(hour=0, minute=0, second=0, microsecond=0)
-        reservations = (
-            self._session.query(ReservationEntity)
-            .join(ReservationEntity.users)
-            .filter(
-                ReservationEntity.start < start + timedelta(hours=24),
+        query = (
+            select(
+                func.coalesce(ReservationEntity.room_id, xl_room_id),
+                ReservationEntity.start,
+                ReservationEntity.end,
+                is_subject,
+            )
+            .join(
+                reservation_user_table,
+                reservation_user_table.c.reservation_id == ReservationEntity.id,
+            )
+            .where(
+                ReservationEntity.start < start + timedelta(days=days),
                 ReservationEntity.end > start,
                 ReservationEntity.state.not_in(
                     [ReservationState.CANCELLED, ReservationState.CHECKED_OUT]
                 ),
-                ReservationEntity.room == None,
-                UserEntity.id == subject.id,
+                (
+                    or_(in_rooms, ReservationEntity.room_id == None)
+                    if xl_room_id is not None
+                    else in_rooms
+                ),
             )
+            .group_by(ReservationEntity.id)
+            .having(or_(ReservationEntity.room_id != None, is_subject))
             .order_by(ReservationEntity.start)
-            .all()
         )
 
-        return [reservation.to_model() for reservation in reservations]
+        return [tuple(row) for row in self._session.execute(query).all()]
 
     def _get_reservable_rooms(self) -> Sequence[RoomDetails]:
         """
@@ -566,6 +691,7 @@ class ReservationService:
         rooms = (
             self._session.query(RoomEntity)
             .where(or_(RoomEntity.reservable == True, RoomEntity.id == "SN156"))
+            .options(selectinload(RoomEntity.seats))
             .order_by(RoomEntity.id)
             .all()
         )
@@ -584,7 +710,14 @@ class ReservationService:
         Returns:
             Sequence[Reservation]: All reservations for the seats within the given time_range, including overlaps.
         """
-        reservations = (
+        reservations = self._query_seat_reservation_entities(seats, time_range)
+        return [reservation.to_model() for reservation in reservations]
+
+    def _query_seat_reservation_entities(
+        self, seats: Sequence[Seat], time_range: TimeRange
+    ) -> Sequence[ReservationEntity]:
+        """Queries the active reservation entities for a set of seats in a given time range."""
+        return (
             self._session.query(ReservationEntity)
             .join(ReservationEntity.seats)
             .filter(
@@ -594,6 +727,7 @@ class ReservationService:
                     [ReservationState.CANCELLED, ReservationState.CHECKED_OUT]
                 ),
                 SeatEntity.id.in_([seat.id for seat in seats]),
+                self._unexpired_at(datetime.now()),
             )
             .options(
                 joinedload(ReservationEntity.seats), joinedload(ReservationEntity.users)
@@ -601,16 +735,10 @@ class ReservationService:
             .all()
         )
 
-        reservations = self._state_transition_reservation_entities_by_time(
-            datetime.now(), reservations
-        )
-
-        return [reservation.to_model() for reservation in reservations]
-
-    def _state_transition_reservation_entities_by_time(
-        self, cutoff: datetime, reservations: Sequence[ReservationEntity]
-    ) -> Sequence[ReservationEntity]:
-        """Private, internal helper method for transitioning reservation entities
+    def _time_based_transitions(
+        self, cutoff: datetime
+    ) -> list[tuple[ColumnElement[bool], ReservationState]]:
+        """Private, internal helper method describing the state transitions of reservations
         based on time. Three transitions are time-based:
 
         1. Draft -> Cancelled following PolicyService#reservation_draft_timeout() after
@@ -620,44 +748,111 @@ class ReservationService:
         3. Checked In -> Checked Out following the reservation's end.
 
         Args:
-            moment (datetime): The time in which checks of expiration are made against. In
+            cutoff (datetime): The time in which checks of expiration are made against. In
                 production, this is the current time.
-            reservations (Sequence[ReservationEntity]): The list of entities to state transition.
 
         Returns:
-            Sequence[ReservationEntity] - All ReservationEntities that were not state transitioned.
+            list[tuple[ColumnElement[bool], ReservationState]]: Pairs of a SQL condition matching
+                expired reservations and the state those reservations transition to.
         """
-        valid: list[ReservationEntity] = []
-        dirty = False
-        for reservation in reservations:
-            if (
-                reservation.state == ReservationState.DRAFT
-                and reservation.created_at
-                + self._policy_svc.reservation_draft_timeout()
-                < cutoff
-            ):
-                reservation.state = ReservationState.CANCELLED
-                dirty = True
-            elif (
-                reservation.state == ReservationState.CONFIRMED
-                and reservation.start + self._policy_svc.reservation_checkin_timeout()
-                < cutoff
-            ):
-                reservation.state = ReservationState.CANCELLED
-                dirty = True
-            elif (
-                reservation.state == ReservationState.CHECKED_IN
-                and reservation.end <= cutoff
-            ):
-                reservation.state = ReservationState.CHECKED_OUT
-                dirty = True
-            else:
-                valid.append(reservation)
+        return [
+            (
+                and_(
+                    ReservationEntity.state == ReservationState.DRAFT,
+                    ReservationEntity.created_at
+                    < cutoff - self._policy_svc.reservation_draft_timeout(),
+                ),
+                ReservationState.CANCELLED,
+            ),
+            (
+                and_(
+                    ReservationEntity.state == ReservationState.CONFIRMED,
+                    ReservationEntity.start
+                    < cutoff - self._policy_svc.reservation_checkin_timeout(),
+                ),
+                ReservationState.CANCELLED,
+            ),
+            (
+                and_(
+                    ReservationEntity.state == ReservationState.CHECKED_IN,
+                    ReservationEntity.end <= cutoff,
+                ),
+                ReservationState.CHECKED_OUT,
+            ),
+        ]
 
-        if dirty:
-            self._session.commit()
+    def _unexpired_at(self, cutoff: datetime) -> ColumnElement[bool]:
+        """SQL condition excluding reservations that are due a time-based state transition.
+
+        Read paths use this condition rather than transitioning reservations themselves, so that
+        reads never write. The transitions are persisted by `sweep_state_transitions`.
+        """
+        return not_(
+            or_(*(condition for condition, _ in self._time_based_transitions(cutoff)))
+        )
+
+    def _apply_time_based_transitions(
+        self, cutoff: datetime, *criteria: ColumnElement[bool]
+    ) -> int:
+        """Applies the time-based state transitions of reservations without committing them.
+
+        Each transition is applied with a single set-based UPDATE statement.
+
+        Args:
+            cutoff (datetime): The time in which checks of expiration are made against.
+            *criteria (ColumnElement[bool]): Conditions further limiting the reservations transitioned.
+
+        Returns:
+            int: The number of reservations that were state transitioned.
+        """
+        transitioned = 0
+        for condition, state in self._time_based_transitions(cutoff):
+            result = self._session.execute(
+                update(ReservationEntity)
+                .where(condition, *criteria)
+                .values(state=state)
+                .execution_options(synchronize_session="fetch")
+            )
+            transitioned += result.rowcount
+        return transitioned
+
+    def sweep_state_transitions(self, cutoff: datetime | None = None) -> int:
+        """Persists all time-based state transitions of reservations.
+
+        This is run periodically in the background by `ReservationSweeper`.
+
+        Args:
+            cutoff (datetime | None): The time in which checks of expiration are made against.
+                Defaults to the current time.
+
+        Returns:
+            int: The number of reservations that were state transitioned.
+        """
+        cutoff = cutoff if cutoff is not None else datetime.now()
+        transitioned = self._apply_time_based_transitions(cutoff)
+
+        self._session.commit()
+        if transitioned > 0:
+            xl_status_snapshot.invalidate()
+
+        return transitioned
+
+    def reconcile_room_reservation_usage(self) -> int:
+        """Rebuilds the room_reservation_usage ledger from the reservation rows.
+
+        The ledger is kept up to date by database triggers as reservations change. Rebuilding it
+        corrects any drift, such as from reservation rows written while the triggers were disabled,
+        and drops the days whose reservations have all been cancelled or checked out. This is run
+        periodically in the background by `ReservationSweeper`.
 
-        return valid
+        Returns:
+            int: The number of ledger entries after the rebuild.
+        """
+        self._session.execute(text(RECONCILE_ROOM_RESERVATION_USAGE))
+        self._session.commit()
+        return self._session.scalar(
+            select(func.count()).select_from(RoomReservationUsageEntity)
+        )
 
     def seat_availability(
         self, seats: Sequence[Seat], bounds: TimeRange
@@ -694,40 +889,38 @@ class ReservationService:
         if len(open_hours) == 0:
             return []
 
-        # Convert the operating hours during the bounds into an availability list
-        # and constrain the availability list within the bounds.
-        open_availability_list = self._operating_hours_to_bounded_availability_list(
-            open_hours, bounds
+        # Convert the operating hours during the bounds into epoch intervals constrained
+        # within the bounds. All seats begin with this availability, from which their
+        # reservations are subtracted.
+        open_intervals = availability_engine.constrain(
+            [
+                availability_engine.to_interval(operating_hour)
+                for operating_hour in open_hours
+            ],
+            availability_engine.to_interval(bounds),
         )
-        if len(open_availability_list.availability) == 0:
+        if len(open_intervals) == 0:
             return []
 
-        # Start from a position where all seats begin with same availability as
-        # open_availability_list. From there, reservations will subtract availability
-        # from the given seat.
-        seat_availability_dict = self._initialize_seat_availability_dict(
-            seats, open_availability_list
-        )
-
         # Get all active reservations during the availability bounds for the seats.
         reservation_range = TimeRange(
-            start=open_availability_list.availability[0].start,
-            end=open_availability_list.availability[-1].end,
-        )
-        reservations = self.get_seat_reservations(seats, reservation_range)
-
-        # Subtract all seat reservations from their availability
-        self._remove_reservations_from_availability(
-            seat_availability_dict, reservations
+            start=availability_engine.from_epoch(open_intervals[0][0]),
+            end=availability_engine.from_epoch(open_intervals[-1][1]),
         )
-
-        # Remove seats with availability below threshold
-        available_seats: list[SeatAvailability] = list(
-            self._prune_seats_below_availability_threshold(
-                list(seat_availability_dict.values()),
-                self._policy_svc.minimum_reservation_duration()
-                - MINUMUM_RESERVATION_EPSILON,
-            )
+        reservations = self._query_seat_reservation_entities(seats, reservation_range)
+
+        # Subtract all seat reservations from their availability and remove seats with
+        # availability below threshold.
+        available_seats = availability_engine.seat_availability(
+            seats,
+            open_intervals,
+            (
+                (seat.id, availability_engine.to_interval(reservation))
+                for reservation in reservations
+                for seat in reservation.seats
+            ),
+            self._policy_svc.minimum_reservation_duration()
+            - MINUMUM_RESERVATION_EPSILON,
         )
 
         # Sort by nearest available ASC, duration DESC, reservable (False before True), with entropy
@@ -745,6 +938,90 @@ class ReservationService:
 
         return available_seats
 
+    def best_seat_availability(
+        self, seats: Sequence[Seat], windows: Sequence[TimeRange]
+    ) -> list[SeatAvailability | None]:
+        """Finds the best available seat within each of many candidate time windows.
+
+        Operating hours and seat reservations are fetched once for the span of all windows, so
+        evaluating many windows costs two queries rather than two per window. Each window is bounded
+        the same way as in `seat_availability`, and the best seat is the one `seat_availability` would
+        order first: nearest available, then longest available, then non-reservable seats first.
+
+        Args:
+            seats (Sequence[Seat]): The seats to check the availability of.
+            windows (Sequence[TimeRange]): The candidate time windows.
+
+        Returns:
+            list[SeatAvailability | None]: The best seat for each window, in the order of `windows`, or
+                None for windows in which no seat is available.
+        """
+        MINUMUM_RESERVATION_EPSILON = timedelta(minutes=1)
+        minimum = (
+            self._policy_svc.minimum_reservation_duration()
+            - MINUMUM_RESERVATION_EPSILON
+        )
+
+        # Bound each window to start no earlier than now, dropping those too short to reserve.
+        now = datetime.now()
+        bounded_windows: list[TimeRange | None] = []
+        for window in windows:
+            start = max(window.start, now)
+            if window.end <= start or window.end - start < minimum:
+                bounded_windows.append(None)
+            else:
+                bounded_windows.append(TimeRange(start=start, end=window.end))
+
+        candidates = [window for window in bounded_windows if window is not None]
+        if len(candidates) == 0:
+            return [None] * len(windows)
+
+        # Fetch operating hours and reservations once for the span of every window.
+        span = TimeRange(
+            start=min(window.start for window in candidates),
+            end=max(window.end for window in candidates),
+        )
+        open_hours = [
+            availability_engine.to_interval(operating_hours)
+            for operating_hours in self._operating_hours_svc.schedule(span)
+        ]
+        blocks_by_seat = availability_engine.group_by_seat(
+            (seat.id, availability_engine.to_interval(reservation))
+            for reservation in self._query_seat_reservation_entities(seats, span)
+            for seat in reservation.seats
+        )
+
+        best_seats: list[SeatAvailability | None] = []
+        for window in bounded_windows:
+            if window is None:
+                best_seats.append(None)
+                continue
+
+            open_intervals = availability_engine.constrain(
+                open_hours, availability_engine.to_interval(window)
+            )
+            remaining_seats = availability_engine.remaining_availability(
+                seats, open_intervals, blocks_by_seat, minimum
+            )
+            if len(remaining_seats) == 0:
+                best_seats.append(None)
+                continue
+
+            seat, availability = min(
+                remaining_seats,
+                key=lambda remaining: (
+                    remaining[1][0][0],
+                    remaining[1][0][0] - remaining[1][0][1],
+                    remaining[0].reservable,
+                    random(),
+                ),
+            )
+            best_seats.append(
+                availability_engine.to_seat_availability(seat, availability)
+            )
+
+        return best_seats
+
     def draft_reservation(
         self, subject: User, request: ReservationRequest
     ) -> Reservation:
@@ -789,8 +1066,27 @@ class ReservationService:
                 "You must accept the community agreement to make a reservation."
             )
 
-        # Bound start
+        # Serialize with concurrent drafts for the same users, seats, or room so that the checks
+        # below and the insert of the draft are atomic with respect to one another.
+        self._lock_draft_resources(request)
+
         now = datetime.now()
+
+        # Persist the time-based transitions of the users' reservations before the draft is
+        # validated against them. They are committed along with the draft, so a rejected draft
+        # leaves them to the sweeper.
+        self._apply_time_based_transitions(
+            now,
+            ReservationEntity.id.in_(
+                select(reservation_user_table.c.reservation_id).where(
+                    reservation_user_table.c.user_id.in_(
+                        [user.id for user in request.users]
+                    )
+                )
+            ),
+        )
+
+        # Bound start
         start = request.start if request.start >= now else now
 
         is_walkin = abs(start - now) < self._policy_svc.walkin_window(subject)
@@ -894,8 +1190,35 @@ class ReservationService:
 
         self._session.add(draft)
         self._session.commit()
+        xl_status_snapshot.invalidate()
         return draft.to_model()
 
+    def _lock_draft_resources(self, request: ReservationRequest) -> None:
+        """Acquires transaction-scoped advisory locks on every resource a draft may claim.
+
+        One lock is taken per requested user, seat, and room, always in ascending key order so that
+        concurrent drafts over overlapping resources cannot deadlock. The locks are released when the
+        draft is committed or the session's transaction otherwise ends.
+
+        Args:
+            request (ReservationRequest): The requested reservation.
+        """
+        keys = [_lock_key(_USER_LOCK, user.id) for user in request.users]
+        if request.room:
+            keys.append(
+                _lock_key(_ROOM_LOCK, zlib.crc32(request.room.id.encode()) & 0x7FFFFFFF)
+            )
+        else:
+            keys.extend(_lock_key(_SEAT_LOCK, seat.id) for seat in request.seats)
+
+        self._session.execute(
+            text(
+                "SELECT count(pg_advisory_xact_lock(key)) "
+                "FROM (SELECT unnest(CAST(:keys AS bigint[])) AS key ORDER BY key) AS keys"
+            ),
+            {"keys": sorted(set(keys))},
+        )
+
     def change_reservation(
         self, subject: User, delta: ReservationPartial
     ) -> Reservation:
@@ -956,6 +1279,7 @@ class ReservationService:
 
         if dirty:  # and valid():
             self._session.commit()
+            xl_status_snapshot.invalidate()
 
         return entity.to_model()
 
@@ -1106,6 +1430,7 @@ class ReservationService:
         if entity.state == ReservationState.CONFIRMED:
             entity.state = ReservationState.CHECKED_IN
             self._session.commit()
+            xl_status_snapshot.invalidate()
         elif entity.state in (
             ReservationState.CANCELLED,
             ReservationState.CHECKED_OUT,
@@ -1121,51 +1446,6 @@ class ReservationService:
 
     # Private helper methods
 
-    def _operating_hours_to_bounded_availability_list(
-        self, operating_hours: Sequence[OperatingHours], bounds: TimeRange
-    ) -> AvailabilityList:
-        availability = AvailabilityList(
-            availability=[
-                TimeRange(start=operating_hour.start, end=operating_hour.end)
-                for operating_hour in operating_hours
-            ]
-        )
-        availability.constrain(bounds)
-        return availability
-
-    def _initialize_seat_availability_dict(
-        self, seats: Sequence[Seat], availability: AvailabilityList
-    ) -> dict[int, SeatAvailability]:
-        return {
-            seat.id: SeatAvailability(
-                availability=availability.model_copy(deep=True).availability,
-                **seat.model_dump(),
-            )
-            for seat in seats
-            if seat.id is not None
-        }
-
-    def _remove_reservations_from_availability(
-        self,
-        seat_availability_dict: dict[int, SeatAvailability],
-        reservations: Sequence[Reservation],
-    ):
-        for reservation in reservations:
-            if len(reservation.seats) > 0:
-                for seat in reservation.seats:
-                    if seat.id in seat_availability_dict:
-                        seat_availability_dict[seat.id].subtract(reservation)
-
-    def _prune_seats_below_availability_threshold(
-        self, seats: Sequence[SeatAvailability], threshold: timedelta
-    ) -> Sequence[SeatAvailability]:
-        available_seats: list[SeatAvailability] = []
-        for seat in seats:
-            seat.filter_time_ranges_below(threshold)
-            if len(seat.availability) > 0:
-                available_seats.append(seat)
-        return available_seats
-
     def _fetch_conflicting_room_reservations(
         self, request: ReservationRequest
     ) -> list[ReservationEntity]:
@@ -1185,6 +1465,7 @@ class ReservationService:
                     )
                 ),
                 ReservationEntity.room_id == request.room.id,
+                self._unexpired_at(datetime.now()),
             )
             .all()
         )
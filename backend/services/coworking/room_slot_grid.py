@@ -0,0 +1,114 @@
+"""Dense room by time slot matrix backing the room reservation map.
+
+Each cell holds a `RoomState` for one room during one time slot. Cells are stored row-major in a
+single `bytearray`, so filling a span of a room's row is one slice assignment and remapping the
+states of a column is one strided slice translation, rather than Python loops over every cell.
+"""
+
+from datetime import datetime, time, timedelta
+from typing import Sequence
+
+from ...models.coworking import RoomState
+
+__authors__ = ["Kris Jordan", "Yuvraj Jain"]
+__copyright__ = "Copyright 2024"
+__license__ = "MIT"
+
+
+class RoomSlotGrid:
+    """A matrix of room states, one row per room and one column per time slot."""
+
+    def __init__(
+        self,
+        room_ids: Sequence[str],
+        start: datetime,
+        slot_count: int,
+        slot_duration: timedelta = timedelta(minutes=30),
+    ):
+        """Initializes a grid where every cell is available.
+
+        Args:
+            room_ids (Sequence[str]): The rooms of the grid, in row order.
+            start (datetime): The start of the first time slot.
+            slot_count (int): The number of time slots in each row.
+            slot_duration (timedelta): The length of each time slot.
+        """
+        self.room_ids = list(room_ids)
+        self.start = start
+        self.slot_count = max(slot_count, 0)
+        self.slot_duration = slot_duration
+        self._rows = {room_id: row for row, room_id in enumerate(self.room_ids)}
+        self._cells = bytearray(len(self.room_ids) * self.slot_count)
+
+    def index(self, moment: datetime | time) -> int:
+        """Index of the time slot containing a moment, ignoring seconds.
+
+        Times without a date are treated as falling on the date of the grid's start."""
+        if isinstance(moment, time):
+            moment = datetime.combine(self.start.date(), moment)
+        return (moment.replace(second=0, microsecond=0) - self.start) // (
+            self.slot_duration
+        )
+
+    def fill(
+        self,
+        room_id: str,
+        start: datetime | time,
+        end: datetime | time,
+        state: RoomState,
+    ) -> None:
+        """Sets the state of every slot of a room from the slot containing start up to the slot containing end.
+
+        Spans are clamped to the bounds of the grid and rooms not in the grid are ignored.
+        """
+        row = self._rows.get(room_id)
+        if row is None:
+            return
+        start_idx = max(self.index(start), 0)
+        end_idx = min(self.index(end), self.slot_count)
+        if start_idx >= end_idx:
+            return
+        offset = row * self.slot_count
+        self._cells[offset + start_idx : offset + end_idx] = bytes((state,)) * (
+            end_idx - start_idx
+        )
+
+    def fill_room(self, room_id: str, state: RoomState) -> None:
+        """Sets the state of every slot of a room."""
+        row = self._rows.get(room_id)
+        if row is None:
+            return
+        offset = row * self.slot_count
+        self._cells[offset : offset + self.slot_count] = (
+            bytes((state,)) * self.slot_count
+        )
+
+    def columns_with(self, state: RoomState) -> list[int]:
+        """Indices of the time slots in which any room is in the given state."""
+        target = bytes((state,))
+        return [
+            column
+            for column in range(self.slot_count)
+            if target in self._cells[column :: self.slot_count]
+        ]
+
+    def replace_in_columns(
+        self, columns: Sequence[int], old: RoomState, new: RoomState
+    ) -> None:
+        """Changes every cell in the given time slots from one state to another."""
+        table = bytearray(range(256))
+        table[old] = new
+        for column in columns:
+            self._cells[column :: self.slot_count] = self._cells[
+                column :: self.slot_count
+            ].translate(table)
+
+    def to_map(self, exclude: Sequence[str] = ()) -> dict[str, list[int]]:
+        """Serializes the grid to the `reserved_date_map` shape of ReservationMapDetails."""
+        return {
+            room_id: list(
+                self._cells[row * self.slot_count : (row + 1) * self.slot_count]
+            )
+            for row, room_id in enumerate(self.room_ids)
+            if room_id not in exclude
+        }
@@ -1,15 +1,17 @@
 """Reservation Service manages room and desk reservations for the XL."""
 
 from fastapi import Depends
-from datetime import datetime
+from datetime import datetime, timedelta
 from sqlalchemy.orm import Session
 from ...database import db_session
 from .reservation import ReservationService
 from .operating_hours import OperatingHoursService
 from .seat import SeatService
 from ...models.coworking import Status, TimeRange
-from ...models import User
+from ...models import User, CacheStats
 from .policy import PolicyService
+from .cache import xl_status_snapshot
+from ..permission import PermissionService
 
 __authors__ = ["Kris Jordan"]
 __copyright__ = "Copyright 2023"
@@ -25,41 +27,76 @@ class StatusService:
         operating_hours_svc: OperatingHoursService = Depends(),
         seat_svc: SeatService = Depends(),
         reservation_svc: ReservationService = Depends(),
+        permission_svc: PermissionService = Depends(),
     ):
+        self._permission_svc = permission_svc
         self._policies_svc = policies_svc
         self._reservation_svc = reservation_svc
         self._operating_hours_svc = operating_hours_svc
         self._seat_svc = seat_svc
 
     def get_coworking_status(self, subject: User) -> Status:
-        """All-in-one endpoint for a user to simultaneously get their own upcoming reservations and current status of the XL."""
+        """All-in-one endpoint for a user to simultaneously get their own upcoming reservations and current status of the XL.
+
+        The seat availability and operating hours portion of the status depends on the subject only
+        through the policies applied to them, so it is served from a process-wide snapshot shared by
+        every user with the same policies and only the subject's reservations are looked up.
+        """
         my_reservations = self._reservation_svc.get_current_reservations_for_user(
             subject, subject
         )
 
+        policies = (
+            self._policies_svc.walkin_window(subject),
+            self._policies_svc.walkin_initial_duration(subject),
+            self._policies_svc.reservation_window(subject),
+        )
+        snapshot = xl_status_snapshot.get_or_compute(
+            policies, lambda: self._compute_xl_status(*policies)
+        )
+        return snapshot.model_copy(update={"my_reservations": my_reservations})
+
+    def get_cache_stats(self, subject: User) -> CacheStats:
+        """Hit and miss counters of the XL status snapshot in this process.
+
+        Args:
+            subject (User): The user requesting the stats.
+
+        Returns:
+            CacheStats: The counters of the snapshot cache.
+
+        Raises:
+            UserPermissionException: If the subject may not read coworking status diagnostics.
+        """
+        self._permission_svc.enforce(
+            subject, "coworking.status.cache", "coworking/status"
+        )
+        return xl_status_snapshot.stats()
+
+    def _compute_xl_status(
+        self,
+        walkin_window: timedelta,
+        walkin_initial_duration: timedelta,
+        reservation_window: timedelta,
+    ) -> Status:
+        """Computes the portion of the XL status shared by users with the given policies."""
         now = datetime.now()
-        walkin_window = TimeRange(
+        walkin_range = TimeRange(
             start=now,
-            end=now
-            + self._policies_svc.walkin_window(subject)
-            + 3 * self._policies_svc.walkin_initial_duration(subject),
+            end=now + walkin_window + 3 * walkin_initial_duration,
             # We triple walkin duration for end bounds to find seats not pre-reserved later. If XL stays
             # relatively open, the walkin could then more likely be extended while it is not busy.
             # This also prioritizes _not_ placing walkins in reservable seats.
         )
         seats = self._seat_svc.list()  # All Seats are fair game for walkin purposes
-        seat_availability = self._reservation_svc.seat_availability(
-            seats, walkin_window
-        )
+        seat_availability = self._reservation_svc.seat_availability(seats, walkin_range)
 
         operating_hours = self._operating_hours_svc.schedule(
-            TimeRange(
-                start=now, end=now + self._policies_svc.reservation_window(subject)
-            )
+            TimeRange(start=now, end=now + reservation_window)
         )
 
         return Status(
-            my_reservations=my_reservations,
+            my_reservations=[],
             seat_availability=seat_availability,
             operating_hours=operating_hours,
         )
@@ -0,0 +1,107 @@
+"""Background sweeper that persists time-based reservation state transitions.
+
+Drafts and confirmed reservations expire, and checked-in reservations end, purely with the
+passage of time. Rather than writing these transitions from read requests, a daemon thread in
+each application process periodically applies them with set-based UPDATE statements. The
+updates are idempotent, so multiple workers sweeping concurrently is harmless.
+
+Less often, the sweeper also rebuilds the room reservation usage ledger from the reservation rows.
+"""
+
+import logging
+from datetime import datetime, timedelta
+from threading import Event, Thread
+from sqlalchemy import Engine
+from sqlalchemy.orm import Session
+
+from ..permission import PermissionService
+from .operating_hours import OperatingHoursService
+from .policy import PolicyService
+from .reservation import ReservationService
+from .seat import SeatService
+
+__authors__ = ["Kris Jordan"]
+__copyright__ = "Copyright 2024"
+__license__ = "MIT"
+
+logger = logging.getLogger(__name__)
+
+
+class ReservationSweeper:
+    """Periodically runs ReservationService#sweep_state_transitions and
+    ReservationService#reconcile_room_reservation_usage on a daemon thread."""
+
+    def __init__(
+        self,
+        engine: Engine,
+        interval: timedelta = timedelta(minutes=1),
+        reconcile_interval: timedelta = timedelta(hours=1),
+    ):
+        """Initializes a new ReservationSweeper.
+
+        Args:
+            engine (Engine): The database engine sessions are opened against.
+            interval (timedelta): How long to wait between sweeps.
+            reconcile_interval (timedelta): How long to wait between rebuilds of the room
+                reservation usage ledger.
+        """
+        self._engine = engine
+        self._interval = interval
+        self._reconcile_interval = reconcile_interval
+        self._stopped = Event()
+        self._thread: Thread | None = None
+
+    def sweep(self) -> int:
+        """Runs a single sweep in its own session.
+
+        Returns:
+            int: The number of reservations that were state transitioned."""
+        with Session(self._engine) as session:
+            return self._reservation_svc(session).sweep_state_transitions()
+
+    def reconcile(self) -> int:
+        """Rebuilds the room reservation usage ledger in its own session.
+
+        Returns:
+            int: The number of ledger entries after the rebuild."""
+        with Session(self._engine) as session:
+            return self._reservation_svc(session).reconcile_room_reservation_usage()
+
+    def _reservation_svc(self, session: Session) -> ReservationService:
+        permission_svc = PermissionService(session)
+        return ReservationService(
+            session,
+            permission_svc,
+            PolicyService(),
+            OperatingHoursService(session, permission_svc),
+            SeatService(session),
+        )
+
+    def start(self) -> None:
+        """Starts sweeping in the background."""
+        self._stopped.clear()
+        self._thread = Thread(target=self._run, name="reservation-sweeper", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stops sweeping and waits for an in-progress sweep to finish."""
+        self._stopped.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def _run(self) -> None:
+        reconciled_at: datetime | None = None
+        while not self._stopped.is_set():
+            try:
+                self.sweep()
+            except Exception:
+                logger.exception("Reservation state transition sweep failed")
+            now = datetime.now()
+            if reconciled_at is None or now - reconciled_at >= self._reconcile_interval:
+                reconciled_at = now
+                try:
+                    self.reconcile()
+                except Exception:
+                    logger.exception("Room reservation usage reconciliation failed")
+            self._stopped.wait(self._interval.total_seconds())
@@ -2,19 +2,29 @@
 The Event Service allows the API to manipulate event data in the database.
 """
 
-from typing import Sequence
+from typing import Iterator, Sequence
 
 from fastapi import Depends
-from sqlalchemy import func, select, and_, func, or_, exists, or_
-from sqlalchemy.orm import Session, aliased
+from sqlalchemy import func, select, and_, func, or_, exists, or_, update, delete
+from sqlalchemy.orm import InstrumentedAttribute, Session, aliased, joinedload
 from backend.entities.user_entity import UserEntity
-from backend.models.event_registration import EventRegistration, NewEventRegistration
+from backend.models.event_registration import (
+    EventRegistration,
+    EventRegistrationExportRow,
+    NewEventRegistration,
+)
 from ..models.public_user import PublicUser
 from backend.models.organization_details import OrganizationDetails
 from backend.models.pagination import Paginated, PaginationParams
 from backend.models.registration_type import RegistrationType
 
-from ..models import User, Paginated, EventPaginationParams
+from ..models import (
+    User,
+    Paginated,
+    EventPaginationParams,
+    CursorPaginated,
+    EventCursorPaginationParams,
+)
 from ..database import db_session
 from backend.models.event import (
     EventDraft,
@@ -29,12 +39,15 @@ from ..entities import (
 )
 from ..entities import EventEntity, OrganizationEntity
 from .permission import PermissionService
+from .pagination import SortKey, paginate_by_cursor, sort_key
+from .search import contains_text
 from .exceptions import (
     ResourceNotFoundException,
     EventRegistrationException,
 )
+from .cache import TTLCache
 from . import UserService
-from datetime import datetime
+from datetime import datetime, timedelta
 
 __authors__ = [
     "Ajay Gandecha",
@@ -46,6 +59,31 @@ __authors__ = [
 __copyright__ = "Copyright 2024"
 __license__ = "MIT"
 
+FEATURED_EVENT_KEY = "featured"
+EXPORT_BATCH_SIZE = 1000
+
+EVENT_SORT_COLUMNS: dict[str, InstrumentedAttribute] = {
+    "id": EventEntity.id,
+    "name": EventEntity.name,
+    "start": EventEntity.start,
+    "end": EventEntity.end,
+    "location": EventEntity.location,
+    "public": EventEntity.public,
+    "registration_limit": EventEntity.registration_limit,
+    "number_registered": EventEntity.number_registered,
+}
+"""The columns events can be ordered by when paginated by cursor, by the name clients request."""
+
+featured_events: TTLCache[str, EventOverview | None] = TTLCache(
+    "event.featured", ttl=timedelta(seconds=30), maxsize=1
+)
+"""The event featured on the home page, as seen by an unauthenticated user.
+
+Every home page load would otherwise select the featured event from the upcoming events. The
+featured event is invalidated when an event is created, updated, or deleted in this process. The
+short time-to-live bounds how long its registration count lags behind registrations, and how long
+other workers serve a featured event that predates such a change."""
+
 
 class EventService:
     """Service that performs all of the actions on the `Event` table"""
@@ -75,35 +113,15 @@ class EventService:
             Paginated[Event]: The paginated list of events.
         """
 
-        statement = select(EventEntity)
-        length_statement = select(func.count()).select_from(EventEntity)
-        if pagination_params.range_start != "":
-            range_start = pagination_params.range_start
-            range_end = pagination_params.range_end
-            criteria = and_(
-                EventEntity.start >= datetime.fromisoformat(range_start),
-                EventEntity.start <= datetime.fromisoformat(range_end),
-            )
-            statement = statement.where(criteria)
-            length_statement = length_statement.where(criteria)
-
-        if pagination_params.filter != "":
-            query = pagination_params.filter
-
-            criteria = or_(
-                EventEntity.name.ilike(f"%{query}%"),
-                EventEntity.description.ilike(f"%{query}%"),
-                exists().where(
-                    OrganizationEntity.id == EventEntity.organization_id,
-                    OrganizationEntity.name.ilike(f"%{query}%"),
-                ),
-                exists().where(
-                    OrganizationEntity.id == EventEntity.organization_id,
-                    OrganizationEntity.slug.ilike(f"%{query}%"),
-                ),
-            )
-            statement = statement.where(criteria)
-            length_statement = length_statement.where(criteria)
+        criteria = self._event_criteria(pagination_params)
+        statement = (
+            select(EventEntity)
+            .options(joinedload(EventEntity.organization))
+            .where(*criteria)
+        )
+        length_statement = (
+            select(func.count()).select_from(EventEntity).where(*criteria)
+        )
 
         offset = pagination_params.page * pagination_params.page_size
         limit = pagination_params.page_size
@@ -123,11 +141,139 @@ class EventService:
         entities = self._session.execute(statement).scalars()
 
         return Paginated(
-            items=[entity.to_overview_model(subject) for entity in entities],
+            items=self._to_overview_models(entities.all(), subject),
             length=length,
             params=pagination_params,
         )
 
+    def get_events_by_cursor(
+        self,
+        pagination_params: EventCursorPaginationParams,
+        subject: User | None = None,
+    ) -> CursorPaginated[EventOverview]:
+        """List Events a page at a time by cursor.
+
+        Parameters:
+            pagination_params: The cursor pagination parameters.
+            subject: The user viewing the events, if any.
+
+        Returns:
+            CursorPaginated[EventOverview]: The page of events and the cursor of the next page.
+
+        Raises:
+            InvalidCursorException: If the cursor is invalid.
+        """
+        criteria = self._event_criteria(pagination_params)
+        statement = (
+            select(EventEntity)
+            .options(joinedload(EventEntity.organization))
+            .where(*criteria)
+        )
+        length_statement = (
+            select(func.count()).select_from(EventEntity).where(*criteria)
+        )
+
+        ascending = pagination_params.ascending == "true"
+        keys: list[SortKey] = []
+        if pagination_params.order_by != "":
+            keys.append(
+                sort_key(EVENT_SORT_COLUMNS, pagination_params.order_by, ascending)
+            )
+        keys.append((EventEntity.id, ascending))
+
+        return paginate_by_cursor(
+            self._session,
+            statement,
+            keys,
+            pagination_params,
+            lambda entities: self._to_overview_models(entities, subject),
+            length_statement,
+        )
+
+    def _event_criteria(
+        self, pagination_params: EventPaginationParams | EventCursorPaginationParams
+    ) -> list:
+        """Criteria selecting the events in the time range and matching the filter of pagination parameters."""
+        criteria = []
+        if pagination_params.range_start != "":
+            range_start = pagination_params.range_start
+            range_end = pagination_params.range_end
+            criteria.append(
+                and_(
+                    EventEntity.start >= datetime.fromisoformat(range_start),
+                    EventEntity.start <= datetime.fromisoformat(range_end),
+                )
+            )
+
+        if pagination_params.filter != "":
+            query = pagination_params.filter
+
+            # Matching organizations are found once, rather than once per event
+            organizations = select(OrganizationEntity.id).where(
+                contains_text(query, OrganizationEntity.name, OrganizationEntity.slug)
+            )
+            criteria.append(
+                or_(
+                    contains_text(query, EventEntity.name, EventEntity.description),
+                    EventEntity.organization_id.in_(organizations),
+                )
+            )
+        return criteria
+
+    def _to_overview_models(
+        self, entities: Sequence[EventEntity], subject: User | None = None
+    ) -> list[EventOverview]:
+        """Creates overview models of many events with a fixed number of queries.
+
+        Rather than loading every registration of every event, attendees are read from each
+        event's `number_registered` counter, organizers are loaded with a single query, and the
+        subject's own registrations are looked up with a single query. The events' organizations
+        are expected to be eagerly loaded with the events.
+
+        Args:
+            entities: The events to create overview models of.
+            subject: The user viewing the events, if any.
+
+        Returns:
+            list[EventOverview]: The overview models, in the order of the entities.
+        """
+        event_ids = [entity.id for entity in entities]
+        if len(event_ids) == 0:
+            return []
+
+        organizer_query = (
+            select(EventRegistrationEntity.event_id, UserEntity)
+            .join(EventRegistrationEntity.user)
+            .where(
+                EventRegistrationEntity.event_id.in_(event_ids),
+                EventRegistrationEntity.registration_type == RegistrationType.ORGANIZER,
+            )
+        )
+        organizers: dict[int, list[PublicUser]] = {id: [] for id in event_ids}
+        for event_id, user_entity in self._session.execute(organizer_query):
+            organizers[event_id].append(user_entity.to_public_model())
+
+        user_registration_types: dict[int, RegistrationType] = {}
+        if subject is not None:
+            user_registration_query = select(
+                EventRegistrationEntity.event_id,
+                EventRegistrationEntity.registration_type,
+            ).where(
+                EventRegistrationEntity.event_id.in_(event_ids),
+                EventRegistrationEntity.user_id == subject.id,
+            )
+            user_registration_types = dict(
+                self._session.execute(user_registration_query).all()
+            )
+
+        return [
+            entity.to_overview_model_with(
+                organizers=organizers[entity.id],
+                user_registration_type=user_registration_types.get(entity.id),
+            )
+            for entity in entities
+        ]
+
     def create(self, subject: User, event: EventDraft) -> EventOverview:
         """
         Creates a event based on the input object and adds it to the table.
@@ -177,6 +323,7 @@ class EventService:
             self._session.add(new_registration_entity)
 
         self._session.commit()
+        featured_events.invalidate()
 
         # Return added object
         # NOTE: Must re-convert the entity to a model again so that the registration
@@ -299,6 +446,11 @@ class EventService:
                 EventRegistrationEntity, (event_entity.id, organizer_id)
             )
             if event_registration_entity:
+                if (
+                    event_registration_entity.registration_type
+                    == RegistrationType.ATTENDEE
+                ):
+                    self._release_seat(event_entity.id)
                 event_registration_entity.registration_type = RegistrationType.ORGANIZER
             else:
                 new_registration = NewEventRegistration(
@@ -313,6 +465,7 @@ class EventService:
 
         # Save all changes
         self._session.commit()
+        featured_events.invalidate()
         # Return updated object
         return event_entity.to_overview_model(subject)
 
@@ -344,6 +497,7 @@ class EventService:
 
         # Save changes
         self._session.commit()
+        featured_events.invalidate()
 
     """Event Registration Service Methods"""
 
@@ -424,6 +578,86 @@ class EventService:
 
         return [entity.to_flat_model() for entity in event_registration_entities]
 
+    def export_registrations(
+        self, subject: User, event_id: int
+    ) -> Iterator[EventRegistrationExportRow]:
+        """
+        Export the registrations of an event, for events with any number of registrations.
+
+        Like `get_registrations_of_event`, this requires the subject to be an organizer of the
+        event or have administrative permission. Permission is checked when this method is
+        called. Registrations are read as the returned iterator is consumed, a batch at a time
+        from a server-side cursor, so memory use does not grow with the number of registrations.
+
+        Args:
+            subject: The authenticated user making the request.
+            event_id: The ID of the event whose registrations are exported.
+
+        Returns:
+            Iterator[EventRegistrationExportRow]: The registrations, organizers first, then by name.
+
+        Raises:
+            ResourceNotFoundException if the event does not exist.
+            UserPermissionException if user is not an event organizer or admin.
+        """
+        event_entity = self._session.get(EventEntity, event_id)
+        if event_entity is None:
+            raise ResourceNotFoundException(
+                "Cannot export registrations for an event that does not exist."
+            )
+
+        organizer_query = select(EventRegistrationEntity.user_id).where(
+            EventRegistrationEntity.event_id == event_id,
+            EventRegistrationEntity.user_id == subject.id,
+            EventRegistrationEntity.registration_type == RegistrationType.ORGANIZER,
+        )
+        if self._session.scalar(organizer_query) is None:
+            self._permission.enforce(
+                subject,
+                "organization.events.manage_registrations",
+                f"organization/{event_entity.organization_id}",
+            )
+
+        return self._read_registrations(event_id)
+
+    def _read_registrations(
+        self, event_id: int
+    ) -> Iterator[EventRegistrationExportRow]:
+        """Reads the registrations of an event a batch at a time.
+
+        A streaming response is sent after the request's session is closed, so registrations are
+        read in a session of their own, which is closed once the iterator is exhausted or closed.
+        """
+        registration_query = (
+            select(
+                UserEntity.first_name,
+                UserEntity.last_name,
+                UserEntity.onyen,
+                UserEntity.pronouns,
+                UserEntity.email,
+                EventRegistrationEntity.registration_type,
+            )
+            .join(EventRegistrationEntity.user)
+            .where(EventRegistrationEntity.event_id == event_id)
+            .order_by(
+                EventRegistrationEntity.registration_type.desc(),
+                UserEntity.last_name,
+                UserEntity.first_name,
+                UserEntity.id,
+            )
+            .execution_options(yield_per=EXPORT_BATCH_SIZE)
+        )
+        with Session(self._session.get_bind()) as session:
+            for row in session.execute(registration_query):
+                yield EventRegistrationExportRow(
+                    first_name=row.first_name,
+                    last_name=row.last_name,
+                    onyen=row.onyen,
+                    pronouns=row.pronouns,
+                    email=row.email,
+                    registration_type=row.registration_type.name,
+                )
+
     def register(
         self, subject: User, attendee: User, event: EventOverview
     ) -> PublicUser:
@@ -456,15 +690,6 @@ class EventService:
                 f"organization/{event_entity.organization_id}",
             )
 
-        # Get the registration status.
-        # NOTE: It is preferred to use the service function rather than the list of
-        # registrations passed in from `event` in the case that registrations are added
-        # between when `event` was fetched and this function runs.
-
-        # Raise exception if event is full.
-        if event.number_registered >= event.registration_limit:
-            raise EventRegistrationException(event.id)
-
         # Enable idemopotency in returning existing registration, if one exists.
         # Permission to manage / read registration is enforced in EventService#get_registration
         existing_registration = self.get_registration(subject, attendee, event)
@@ -474,6 +699,22 @@ class EventService:
             )
             return user_entity.to_public_model()
 
+        # Claim a seat, raising an exception if the event is full.
+        # NOTE: The count in `event` may be stale, so the claim is made by a single conditional
+        # update. Concurrent registrations for the event wait on its row lock and re-check the
+        # condition against the committed count, so the event cannot be oversold.
+        seat_query = (
+            update(EventEntity)
+            .where(
+                EventEntity.id == event.id,
+                EventEntity.number_registered < EventEntity.registration_limit,
+            )
+            .values(number_registered=EventEntity.number_registered + 1)
+            .returning(EventEntity.number_registered)
+        )
+        if self._session.execute(seat_query).first() is None:
+            raise EventRegistrationException(event.id)
+
         # Add new object to table and commit changes
         new_event_registration = NewEventRegistration(
             user_id=attendee.id,
@@ -516,15 +757,31 @@ class EventService:
         ):
             return
 
-        # Delete object and commit
-        self._session.delete(
-            self._session.get(
-                EventRegistrationEntity,
-                (event.id, attendee.id),
+        # Delete object and release its seat, unless a concurrent unregister already deleted it
+        deleted = self._session.execute(
+            delete(EventRegistrationEntity)
+            .where(
+                EventRegistrationEntity.event_id == event.id,
+                EventRegistrationEntity.user_id == attendee.id,
+                EventRegistrationEntity.registration_type == RegistrationType.ATTENDEE,
             )
-        )
+            .returning(EventRegistrationEntity.user_id)
+        ).first()
+        if deleted is not None:
+            self._release_seat(event.id)
         self._session.commit()
 
+    def _release_seat(self, event_id: int) -> None:
+        """Uncounts an attendee of an event in the same statement that reads the count.
+
+        Assigning a decremented count to a loaded entity would overwrite the seats concurrent
+        registrations claimed since the entity was loaded."""
+        self._session.execute(
+            update(EventEntity)
+            .where(EventEntity.id == event_id)
+            .values(number_registered=EventEntity.number_registered - 1)
+        )
+
     def get_registrations_of_user(
         self, subject: User, user: User, time_range: TimeRange
     ) -> Sequence[PublicUser]:
@@ -630,10 +887,8 @@ class EventService:
         # Filter results by query
         if pagination_params.filter != "":
             query = pagination_params.filter
-            criteria = or_(
-                UserEntity.first_name.ilike(f"%{query}%"),
-                UserEntity.last_name.ilike(f"%{query}%"),
-                UserEntity.onyen.ilike(f"%{query}%"),
+            criteria = contains_text(
+                query, UserEntity.first_name, UserEntity.last_name, UserEntity.onyen
             )
 
             statement = statement.where(criteria)
@@ -665,51 +920,34 @@ class EventService:
 
     def get_event_status(self, subject: User) -> EventStatusOverview:
         """Returns the event status."""
-        # 1. Get the featured event.
-        # The featured event is picked based on the following criteria:
-        # Based on the first 50 events coming up...
-        # If a CSXL or UNC CS event is scheduled, choose this as the featured event.
-        # Otherwise, choose the latest event.
-        # If there is no upcoming event, choose no event.
-        PREFERRED_ORGANIZATIONS = [37]
-        featured_event: EventOverview | None = None
-        event_query = (
-            select(EventEntity)
-            .where(EventEntity.start >= datetime.now())
-            .order_by(EventEntity.start)
-            .limit(50)
-        )
-        event_entities = self._session.scalars(event_query).all()
-        for event in event_entities:
-            if (
-                event.organization_id in PREFERRED_ORGANIZATIONS
-                and featured_event == None
-            ):
-                featured_event = event.to_overview_model(subject)
-        if featured_event == None:
-            featured_event = (
-                event_entities[0].to_overview_model(subject)
-                if len(event_entities) > 0
-                else None
-            )
+        # 1. Get the featured event, which is shared by all users.
+        featured_event = self._get_featured_event()
 
         # 2. Find all of the events the current user is registered for.
         registered_events_query = (
-            select(EventRegistrationEntity)
-            .where(EventRegistrationEntity.user_id == subject.id)
-            .join(EventEntity)
-            .where(EventEntity.start >= datetime.now())
+            select(EventEntity)
+            .join(EventEntity.registrations)
+            .where(
+                EventRegistrationEntity.user_id == subject.id,
+                EventEntity.start >= datetime.now(),
+            )
             .order_by(EventEntity.start)
+            .options(joinedload(EventEntity.organization))
+        )
+        registered_events = self._to_overview_models(
+            self._session.scalars(registered_events_query).all(), subject
         )
 
-        registered_events_entities = self._session.scalars(
-            registered_events_query
-        ).all()
-
-        registered_events = [
-            registration.event.to_overview_model(subject)
-            for registration in registered_events_entities
-        ]
+        # The current user's registration for the featured event is among their registrations.
+        if featured_event is not None:
+            registration_types = {
+                event.id: event.user_registration_type for event in registered_events
+            }
+            featured_event = featured_event.model_copy(
+                update={
+                    "user_registration_type": registration_types.get(featured_event.id)
+                }
+            )
 
         # 3. Return the event status.
         return EventStatusOverview(
@@ -718,33 +956,44 @@ class EventService:
 
     def get_event_status_unauthenticated(self) -> EventStatusOverview:
         """Returns the event status for an unauthenticated user."""
-        # 1. Get the featured event.
+        return EventStatusOverview(featured=self._get_featured_event(), registered=[])
+
+    def _get_featured_event(self) -> EventOverview | None:
+        """Returns the featured event as seen by an unauthenticated user, if there is one."""
+        return featured_events.get_or_compute(
+            FEATURED_EVENT_KEY, self._select_featured_event
+        )
+
+    def _select_featured_event(self) -> EventOverview | None:
+        """Selects the featured event from the upcoming events."""
         # The featured event is picked based on the following criteria:
         # Based on the first 50 events coming up...
         # If a CSXL or UNC CS event is scheduled, choose this as the featured event.
         # Otherwise, choose the latest event.
         # If there is no upcoming event, choose no event.
         PREFERRED_ORGANIZATIONS = [37]
-        featured_event: EventOverview | None = None
-        event_query = (
-            select(EventEntity)
+        upcoming_query = (
+            select(EventEntity.id, EventEntity.organization_id)
             .where(EventEntity.start >= datetime.now())
             .order_by(EventEntity.start)
             .limit(50)
         )
-        event_entities = self._session.scalars(event_query).all()
-        for event in event_entities:
-            if (
-                event.organization_id in PREFERRED_ORGANIZATIONS
-                and featured_event == None
-            ):
-                featured_event = event.to_overview_model()
-        if featured_event == None:
-            featured_event = (
-                event_entities[0].to_overview_model()
-                if len(event_entities) > 0
-                else None
-            )
+        upcoming_events = self._session.execute(upcoming_query).all()
+        if len(upcoming_events) == 0:
+            return None
+        featured_id = next(
+            (
+                id
+                for id, organization_id in upcoming_events
+                if organization_id in PREFERRED_ORGANIZATIONS
+            ),
+            upcoming_events[0].id,
+        )
 
-        # 3. Return the event status.
-        return EventStatusOverview(featured=featured_event, registered=[])
+        featured_query = (
+            select(EventEntity)
+            .where(EventEntity.id == featured_id)
+            .options(joinedload(EventEntity.organization))
+        )
+        featured_event = self._session.scalars(featured_query).one()
+        return self._to_overview_models([featured_event])[0]
@@ -26,6 +26,13 @@ class CoursePermissionException(Exception):
         super().__init__(f"{reason}")
 
 
+class InvalidCursorException(Exception):
+    """InvalidCursorException is raised when a pagination cursor is malformed or was issued for a different ordering."""
+
+    def __init__(self):
+        super().__init__("Invalid pagination cursor")
+
+
 class EventRegistrationException(Exception):
     """EventRegistrationException is raised when a user attempts to register and cannot (i.e., when the event is full)."""
 
@@ -0,0 +1,187 @@
+"""Keyset (cursor) pagination of SQLAlchemy queries.
+
+Paginating with OFFSET makes Postgres read and discard every row of the pages before the one
+requested, so deep pages grow slower linearly. Instead, a cursor records the sort keys of the last
+row of a page, and the next page selects only the rows ordered after it. Every page then costs
+about as much as the first when the sort keys are indexed.
+
+Cursors are opaque to clients: base64-encoded JSON of the ordering they were issued for and the
+sort key values of the last row of the page.
+"""
+
+import json
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+from binascii import Error as Base64Error
+from enum import Enum
+from typing import Any, Callable, Mapping, Sequence, TypeVar
+
+from sqlalchemy import ColumnElement, Select, and_, false, literal, or_, tuple_
+from sqlalchemy.orm import InstrumentedAttribute, Session
+
+from ..models import CursorPaginated, CursorPaginationParams
+from .exceptions import InvalidCursorException
+
+__authors__ = ["Kris Jordan"]
+__copyright__ = "Copyright 2024"
+__license__ = "MIT"
+
+T = TypeVar("T")
+
+SortKey = tuple[InstrumentedAttribute, bool]
+"""A column results are ordered by and whether the order is ascending.
+
+The last sort key of a query must be unique, such as a primary key, so that rows are totally
+ordered. Null values are ordered last in either direction."""
+
+
+def sort_key(
+    columns: Mapping[str, InstrumentedAttribute], order_by: str, ascending: bool = True
+) -> SortKey:
+    """Looks up the sort key of the column a client requested results be ordered by.
+
+    The name is encoded into cursors and the column's values are decoded from them, so only the
+    columns a query may be ordered by can be requested, never a relationship or other attribute.
+
+    Args:
+        columns (Mapping[str, InstrumentedAttribute]): The columns that can be ordered by, by name.
+        order_by (str): The name of the requested column.
+        ascending (bool): Whether the order is ascending.
+
+    Returns:
+        SortKey: The sort key of the requested column.
+
+    Raises:
+        InvalidCursorException: If the requested column cannot be ordered by.
+    """
+    if order_by not in columns:
+        raise InvalidCursorException()
+    return (columns[order_by], ascending)
+
+
+def paginate_by_cursor(
+    session: Session,
+    statement: Select,
+    keys: Sequence[SortKey],
+    params: CursorPaginationParams,
+    to_models: Callable[[list[Any]], list[T]],
+    length_statement: Select | None = None,
+) -> CursorPaginated[T]:
+    """Fetches the page of a query's results after the cursor of the pagination parameters.
+
+    Args:
+        session (Session): The session to query with.
+        statement (Select): A query selecting a single entity, without ordering or limit.
+        keys (Sequence[SortKey]): The sort keys of the query, ending in a unique column.
+        params (CursorPaginationParams): The pagination parameters.
+        to_models (Callable[[list[Any]], list[T]]): Converts the entities of the page to models.
+        length_statement (Select | None): Counts the results, evaluated only for the first page.
+
+    Returns:
+        CursorPaginated[T]: The page of results and the cursor of the next page, if any.
+
+    Raises:
+        InvalidCursorException: If the cursor is malformed or was issued for another ordering.
+    """
+    if params.cursor != "":
+        values = decode_cursor(params.cursor, params.order_by, keys)
+        statement = statement.where(_after(keys, values))
+
+    statement = (
+        statement.add_columns(*(column for column, _ in keys))
+        .order_by(*(_ordering(column, ascending) for column, ascending in keys))
+        .limit(params.page_size + 1)
+    )
+    rows = session.execute(statement).unique().all()
+
+    next_cursor = None
+    if len(rows) > params.page_size:
+        rows = rows[: params.page_size]
+        next_cursor = encode_cursor(params.order_by, rows[-1][1:])
+
+    length = None
+    if params.cursor == "" and length_statement is not None:
+        length = session.scalar(length_statement) or 0
+
+    return CursorPaginated(
+        items=to_models([row[0] for row in rows]),
+        next_cursor=next_cursor,
+        length=length,
+        params=params,
+    )
+
+
+def encode_cursor(order_by: str, values: Sequence[Any]) -> str:
+    """Encodes the sort key values of a row into a cursor for the given ordering."""
+    encoded = [
+        (
+            value.value
+            if isinstance(value, Enum)
+            else value.isoformat() if hasattr(value, "isoformat") else value
+        )
+        for value in values
+    ]
+    payload = json.dumps({"order_by": order_by, "keys": encoded})
+    return urlsafe_b64encode(payload.encode()).decode()
+
+
+def decode_cursor(cursor: str, order_by: str, keys: Sequence[SortKey]) -> list[Any]:
+    """Decodes the sort key values of a cursor issued for the given ordering and sort keys.
+
+    Raises:
+        InvalidCursorException: If the cursor is malformed or was issued for another ordering.
+    """
+    try:
+        payload = json.loads(urlsafe_b64decode(cursor.encode()))
+        if payload["order_by"] != order_by or len(payload["keys"]) != len(keys):
+            raise InvalidCursorException()
+        return [
+            _decode_value(column, value)
+            for (column, _), value in zip(keys, payload["keys"])
+        ]
+    except (Base64Error, UnicodeDecodeError, ValueError, KeyError, TypeError):
+        raise InvalidCursorException()
+
+
+def _decode_value(column: InstrumentedAttribute, value: Any) -> Any:
+    if value is None:
+        return None
+    python_type = column.type.python_type
+    if isinstance(value, python_type):
+        return value
+    if hasattr(python_type, "fromisoformat"):
+        return python_type.fromisoformat(value)
+    return python_type(value)
+
+
+def _ordering(column: InstrumentedAttribute, ascending: bool) -> ColumnElement:
+    return (column.asc() if ascending else column.desc()).nulls_last()
+
+
+def _after(keys: Sequence[SortKey], values: Sequence[Any]) -> ColumnElement[bool]:
+    """A predicate selecting the rows ordered after the row with the given sort key values."""
+    directions = {ascending for _, ascending in keys}
+    nullable = any(column.expression.nullable for column, _ in keys)
+    if len(directions) == 1 and not nullable:
+        # A row value comparison can be answered by a range scan of an index on the keys.
+        row = tuple_(*(column for column, _ in keys))
+        bound = tuple_(
+            *(literal(value, column.type) for (column, _), value in zip(keys, values))
+        )
+        return row > bound if directions == {True} else row < bound
+
+    clauses = []
+    for i, (column, ascending) in enumerate(keys):
+        ties = [
+            column.is_(None) if value is None else column == value
+            for (column, _), value in zip(keys[:i], values[:i])
+        ]
+        clauses.append(and_(*ties, _beyond(column, ascending, values[i])))
+    return or_(*clauses)
+
+
+def _beyond(column: InstrumentedAttribute, ascending: bool, value: Any):
+    """A predicate selecting the values of a column ordered strictly after a value, nulls last."""
+    if value is None:
+        return false()
+    beyond = column > value if ascending else column < value
+    return or_(beyond, column.is_(None)) if column.expression.nullable else beyond
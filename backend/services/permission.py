@@ -5,25 +5,58 @@ This Service is more of an internal service that other services take dependency
 exposed via the API.
 """
 
-import re
+from datetime import timedelta
+from time import perf_counter
+from typing import Callable, Iterable, TypeVar
 from fastapi import Depends
-from functools import lru_cache
-from sqlalchemy import select
+from sqlalchemy import func, select
 from sqlalchemy.orm import Session
 from ..database import db_session
-from ..models import User, Permission, Role, RoleDetails
-from ..entities import UserEntity, PermissionEntity, RoleEntity
+from ..models import (
+    User,
+    Permission,
+    Role,
+    RoleDetails,
+    CacheStats,
+    PermissionMetrics,
+)
+from ..entities import (
+    UserEntity,
+    PermissionEntity,
+    RoleEntity,
+    UserEffectivePermissionEntity,
+)
 from ..services.exceptions import UserPermissionException
+from .cache import TTLCache
+from .permission_metrics import record_checks, record_query, route_permission_metrics
+from .permission_matcher import PermissionLike, PermissionMatcher
 
 __authors__ = ["Kris Jordan"]
 __copyright__ = "Copyright 2023"
 __license__ = "MIT"
 
+T = TypeVar("T")
+
+PERMISSIONS_CHANGED_CHANNEL = "permissions_changed"
+"""Postgres notification channel on which changes to users' permissions are published.
+
+The payload is the ID of the user whose permissions changed, or empty when any user's may have."""
+
+permission_matchers: TTLCache[int, PermissionMatcher] = TTLCache(
+    "permission.matchers", ttl=timedelta(minutes=5), maxsize=4096
+)
+"""Compiled user and role permissions of each user, keyed by user ID.
+
+Entries are invalidated in the process that changes a user's permissions or role memberships and,
+via PERMISSIONS_CHANGED_CHANNEL, in every other process running a PermissionCacheListener. The
+time-to-live bounds how stale an entry can become should a notification be missed."""
+
 
 class PermissionService:
     """PermissionService grants, revokes, tests, and enforces permissions for users and roles in the system."""
 
     _session: Session
+    _matchers: dict[int | None, PermissionMatcher]
 
     def __init__(self, session: Session = Depends(db_session)):
         """Initialize a new PermissionService instance.
@@ -31,6 +64,7 @@ class PermissionService:
         Args:
             session (Session): The SQLAlchemy session to use for database operations."""
         self._session = session
+        self._matchers = {}
 
     def get_permissions(self, subject: User) -> list[Permission]:
         """Get the permissions for a user.
@@ -83,6 +117,7 @@ class PermissionService:
 
         self._session.add(permission_entity)
         self._session.commit()
+        self.invalidate()
         return True
 
     def revoke(self, revoker: User, permission: Permission) -> bool:
@@ -110,8 +145,58 @@ class PermissionService:
 
         self._session.delete(permission_entity)
         self._session.commit()
+        self.invalidate()
         return True
 
+    def invalidate(self, user_id: int | None = None) -> None:
+        """Discard the compiled permissions of a user, or of every user when none is given.
+
+        Must be called after a change to a user's permissions or role memberships has been
+        committed. The change is also published to the other processes serving the application.
+
+        Args:
+            user_id (int | None): The id of the user whose permissions changed."""
+        if user_id is None:
+            self._matchers.clear()
+        else:
+            self._matchers.pop(user_id, None)
+        permission_matchers.invalidate(user_id)
+        payload = "" if user_id is None else str(user_id)
+        self._session.execute(
+            select(func.pg_notify(PERMISSIONS_CHANGED_CHANNEL, payload))
+        )
+        self._session.commit()
+
+    def get_cache_stats(self, subject: User) -> CacheStats:
+        """Hit and miss counters of the compiled permissions cache in this process.
+
+        Args:
+            subject (User): The user requesting the stats.
+
+        Returns:
+            CacheStats: The counters of the compiled permissions cache.
+
+        Raises:
+            UserPermissionException: If the subject may not read permission cache diagnostics.
+        """
+        self.enforce(subject, "permission.cache", "permission/")
+        return permission_matchers.stats()
+
+    def get_metrics(self, subject: User) -> list[PermissionMetrics]:
+        """Authorization work done by the requests to each route in this process.
+
+        Args:
+            subject (User): The user requesting the metrics.
+
+        Returns:
+            list[PermissionMetrics]: The totals of each route, most checks per request first.
+
+        Raises:
+            UserPermissionException: If the subject may not read permission metrics.
+        """
+        self.enforce(subject, "permission.metrics", "permission/")
+        return route_permission_metrics.snapshot()
+
     def enforce(self, subject: User, action: str, resource: str) -> None:
         """Enforce a permission for a user.
 
@@ -132,20 +217,129 @@ class PermissionService:
     def check(self, subject: User, action: str, resource: str) -> bool:
         """Check if a user has permission to carry out an action on a resource.
 
+        The subject's user and role permissions are loaded and compiled on the first check for
+        the subject in this process and shared by later requests until they change or expire.
+
         Args:
             subject (User): The user to check permissions for.
 
         Returns:
             bool: True if the user has permission to carry out the action on the resource, False otherwise.
         """
-        # Check user permissions
-        user_perms = self._get_user_permissions(subject)
-        if self._has_permission(user_perms, action, resource):
-            return True
+        matcher = self._matcher(subject)
+        started = perf_counter()
+        permitted = matcher.check(action, resource)
+        record_checks(1, perf_counter() - started)
+        return permitted
+
+    def get_permitted_users(
+        self, subject: User, action: str, resource: str
+    ) -> list[User]:
+        """List the users permitted to carry out an action on a resource.
+
+        Permissions are resolved in SQL against the user_effective_permission table, so no
+        user's permissions are loaded.
+
+        Args:
+            subject (User): The user making the request.
+            action (str): The action in question.
+            resource (str): The resource in question.
+
+        Returns:
+            list[User]: The users with permission, ordered by name.
+
+        Raises:
+            UserPermissionException: If the subject may not list users.
+        """
+        self.enforce(subject, "user.list", "user/")
+        holders = UserEffectivePermissionEntity.holders(action, resource)
+        query = (
+            select(UserEntity)
+            .where(UserEntity.id.in_(holders))
+            .order_by(UserEntity.last_name, UserEntity.first_name, UserEntity.id)
+        )
+        record_query()
+        return [entity.to_model() for entity in self._session.scalars(query)]
+
+    def check_many(
+        self, subject: User, action: str, resources: Iterable[str]
+    ) -> list[bool]:
+        """Check if a user has permission to carry out an action on each of many resources.
+
+        The whole batch is evaluated against a single load of the subject's permissions.
 
-        # Check role permissions
-        role_permissions = self._get_user_roles_permissions(subject)
-        return self._has_permission(role_permissions, action, resource)
+        Args:
+            subject (User): The user to check permissions for.
+            action (str): The action in question.
+            resources (Iterable[str]): The resources in question.
+
+        Returns:
+            list[bool]: Whether the user has permission on each resource, in order.
+        """
+        matcher = self._matcher(subject)
+        started = perf_counter()
+        permitted = matcher.check_many(action, resources)
+        record_checks(len(permitted), perf_counter() - started)
+        return permitted
+
+    def filter_permitted(
+        self,
+        subject: User,
+        action: str,
+        items: Iterable[T],
+        resource: Callable[[T], str],
+    ) -> list[T]:
+        """Filter items to those a user has permission to carry out an action on.
+
+        Args:
+            subject (User): The user to check permissions for.
+            action (str): The action in question.
+            items (Iterable[T]): The items to filter.
+            resource (Callable[[T], str]): Produces the resource of an item.
+
+        Returns:
+            list[T]: The items the user has permission on, in order.
+        """
+        items = list(items)
+        permitted = self.check_many(subject, action, map(resource, items))
+        return [item for item, allowed in zip(items, permitted) if allowed]
+
+    def _matcher(self, subject: User) -> PermissionMatcher:
+        """Get the compiled permissions of a user, loading them on first use.
+
+        Matchers are held for the lifetime of this service, so a subject's permissions are fixed
+        for the remainder of a request once the process-wide cache has been consulted.
+
+        Args:
+            subject (User): The user to get compiled permissions for.
+
+        Returns:
+            PermissionMatcher: The user's compiled user and role permissions."""
+        matcher = self._matchers.get(subject.id)
+        if matcher is None:
+            load = lambda: PermissionMatcher(self._get_effective_permissions(subject))
+            if subject.id is None:
+                matcher = load()
+            else:
+                matcher = permission_matchers.get_or_compute(subject.id, load)
+            self._matchers[subject.id] = matcher
+        return matcher
+
+    def _get_effective_permissions(self, subject: User) -> list[PermissionLike]:
+        """Get the permissions granted to a user directly or through their roles in a single query.
+
+        Args:
+            subject (User): The user to get permissions for.
+
+        Returns:
+            list[PermissionLike]: The action and resource patterns of the user's permissions.
+        """
+        query = select(
+            UserEffectivePermissionEntity.action,
+            UserEffectivePermissionEntity.resource,
+        ).where(UserEffectivePermissionEntity.user_id == subject.id)
+        record_query()
+        return list(self._session.execute(query))
 
     def _get_user_permissions(self, subject: User) -> list[PermissionEntity]:
         """Get the permissions for a user.
@@ -158,6 +352,7 @@ class PermissionService:
         user_query = select(PermissionEntity).where(
             PermissionEntity.user_id == subject.id
         )
+        record_query()
         user_perms = [p for p in self._session.execute(user_query).scalars()]
         return user_perms
 
@@ -178,56 +373,5 @@ class PermissionService:
         role_query = select(PermissionEntity).where(
             PermissionEntity.role_id.in_(role_ids)
         )
+        record_query()
         return [p for p in self._session.execute(role_query).scalars()]
-
-    def _has_permission(
-        self, permissions: list[PermissionEntity], action: str, resource: str
-    ) -> bool:
-        """Check if a user has permission to carry out an action on a resource in a list of permissions.
-
-        Args:
-            permissions (list[PermissionEntity]): The permissions to check.
-            action (str): The action in question.
-            resource (str): The resource in question.
-
-        Returns:
-            bool: True if the user has permission to carry out the action on the resource, False otherwise.
-        """
-        for permission in permissions:
-            if self._check_permission(permission, action, resource):
-                return True
-        return False
-
-    def _check_permission(
-        self, permission: PermissionEntity, action: str, resource: str
-    ) -> bool:
-        """Check if a user has permission to carry out an action on a resource.
-
-        Args:
-            permission (PermissionEntity): The permission to check.
-            action (str): The action in question.
-            resource (str): The resource in question.
-
-        Returns:
-            bool: True if the user has permission to carry out the action on the resource, False otherwise.
-        """
-        action_re = self._expand_pattern(permission.action)
-        if action_re.fullmatch(action) is not None:
-            resource_re = self._expand_pattern(permission.resource)
-            return resource_re.fullmatch(resource) is not None
-        else:
-            return False
-
-    @lru_cache()
-    def _expand_pattern(self, pattern: str) -> re.Pattern:
-        """Expand a permission pattern into a regular expression.
-
-        This function is memoized to avoid recompiling the same regular expression multiple times.
-
-        Args:
-            pattern (str): The pattern to expand.
-
-        Returns:
-            re.Pattern: The compiled regular expression."""
-        search = pattern.replace("*", ".*")
-        return re.compile(f"^{search}$")
@@ -0,0 +1,100 @@
+"""Background listener that propagates permission changes between application processes.
+
+Each worker process caches the compiled permissions of the users it serves. The process that
+changes a user's permissions invalidates its own cache and publishes the change with a Postgres
+NOTIFY on PERMISSIONS_CHANGED_CHANNEL. A daemon thread in every process LISTENs on the channel and
+invalidates the corresponding entries of its own cache.
+"""
+
+import logging
+from datetime import timedelta
+from select import select
+from threading import Event, Thread
+from sqlalchemy import Engine
+
+from .permission import PERMISSIONS_CHANGED_CHANNEL, permission_matchers
+
+__authors__ = ["Kris Jordan"]
+__copyright__ = "Copyright 2024"
+__license__ = "MIT"
+
+logger = logging.getLogger(__name__)
+
+
+class PermissionCacheListener:
+    """Invalidates the process-wide permission cache as notifications arrive, on a daemon thread."""
+
+    def __init__(
+        self,
+        engine: Engine,
+        poll_interval: timedelta = timedelta(seconds=1),
+        retry_interval: timedelta = timedelta(seconds=10),
+    ):
+        """Initializes a new PermissionCacheListener.
+
+        Args:
+            engine (Engine): The database engine the listening connection is opened against.
+            poll_interval (timedelta): How long to wait for a notification before checking whether to stop.
+            retry_interval (timedelta): How long to wait before reconnecting after a failure.
+        """
+        self._engine = engine
+        self._poll_interval = poll_interval
+        self._retry_interval = retry_interval
+        self._stopped = Event()
+        self._listening = Event()
+        self._thread: Thread | None = None
+
+    def start(self) -> None:
+        """Starts listening in the background."""
+        self._stopped.clear()
+        self._thread = Thread(
+            target=self._run, name="permission-cache-listener", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stops listening and waits for the listening connection to be released."""
+        self._stopped.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def wait_until_listening(self, timeout: timedelta) -> bool:
+        """Blocks until notifications are being received.
+
+        Returns:
+            bool: False if the listener was not listening before the timeout elapsed."""
+        return self._listening.wait(timeout.total_seconds())
+
+    def _run(self) -> None:
+        while not self._stopped.is_set():
+            try:
+                self._listen()
+            except Exception:
+                logger.exception("Permission cache listener failed")
+            self._listening.clear()
+            # Notifications may have been missed while disconnected.
+            permission_matchers.invalidate()
+            self._stopped.wait(self._retry_interval.total_seconds())
+
+    def _listen(self) -> None:
+        with self._engine.connect() as connection:
+            connection = connection.execution_options(isolation_level="AUTOCOMMIT")
+            connection.exec_driver_sql(f"LISTEN {PERMISSIONS_CHANGED_CHANNEL}")
+            driver_connection = connection.connection.driver_connection
+            self._listening.set()
+            try:
+                while not self._stopped.is_set():
+                    readable, _, _ = select(
+                        [driver_connection], [], [], self._poll_interval.total_seconds()
+                    )
+                    if not readable:
+                        continue
+                    driver_connection.poll()
+                    while driver_connection.notifies:
+                        notify = driver_connection.notifies.pop(0)
+                        permission_matchers.invalidate(
+                            int(notify.payload) if notify.payload else None
+                        )
+            finally:
+                connection.exec_driver_sql(f"UNLISTEN {PERMISSIONS_CHANGED_CHANNEL}")
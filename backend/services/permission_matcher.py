@@ -0,0 +1,136 @@
+"""Compiled matching of actions and resources against a subject's permissions.
+
+Permission actions and resources are glob patterns in which `*` matches any sequence of
+characters. Rather than testing every permission in turn, a `PermissionMatcher` compiles all of a
+subject's action patterns into a single glob trie whose accepting nodes hold a trie of the resource
+patterns permitted for that action pattern. Patterns sharing a prefix share trie nodes, and a
+string is matched by simulating the trie as a nondeterministic automaton, so a check takes time
+proportional to the length of the action and resource rather than the number of permissions.
+"""
+
+from typing import Generic, Iterable, Iterator, Protocol, TypeVar
+
+__authors__ = ["Kris Jordan"]
+__copyright__ = "Copyright 2024"
+__license__ = "MIT"
+
+T = TypeVar("T")
+
+
+class PermissionLike(Protocol):
+    """Anything with the action and resource patterns of a permission, such as a Permission or PermissionEntity."""
+
+    action: str
+    resource: str
+
+
+class _Node(Generic[T]):
+    """A state of a glob trie.
+
+    A node reached through a `*` loops on every character. Consecutive `*`s are collapsed, so a
+    looping node is never followed directly by another looping node."""
+
+    __slots__ = ("children", "star", "loops", "value")
+
+    def __init__(self, loops: bool = False):
+        self.children: dict[str, _Node[T]] = {}
+        self.star: _Node[T] | None = None
+        self.loops = loops
+        self.value: T | None = None
+
+
+class GlobTrie(Generic[T]):
+    """A trie of glob patterns, each mapped to a value, that finds the values of every pattern matching a string."""
+
+    def __init__(self):
+        self._root: _Node[T] = _Node()
+
+    def setdefault(self, pattern: str, default: T) -> T:
+        """Returns the value stored for a pattern, first storing default if there is none."""
+        node = self._root
+        for char in pattern:
+            if char == "*":
+                if node.loops:
+                    continue
+                if node.star is None:
+                    node.star = _Node(loops=True)
+                node = node.star
+            else:
+                child = node.children.get(char)
+                if child is None:
+                    child = node.children[char] = _Node()
+                node = child
+        if node.value is None:
+            node.value = default
+        return node.value
+
+    def matches(self, string: str) -> Iterator[T]:
+        """Yields the values of every pattern matching the whole of a string."""
+        states = {self._root}
+        if self._root.star is not None:
+            states.add(self._root.star)
+        for char in string:
+            step: set[_Node[T]] = set()
+            for node in states:
+                if node.loops:
+                    step.add(node)
+                child = node.children.get(char)
+                if child is not None:
+                    step.add(child)
+                    # A `*` following the character may also match nothing.
+                    if child.star is not None:
+                        step.add(child.star)
+            if not step:
+                return
+            states = step
+        for node in states:
+            if node.value is not None:
+                yield node.value
+
+
+class PermissionMatcher:
+    """An index of a subject's permissions that answers whether an action on a resource is permitted."""
+
+    def __init__(self, permissions: Iterable[PermissionLike]):
+        """Compiles the given permissions.
+
+        Args:
+            permissions (Iterable[PermissionLike]): The permissions to index.
+        """
+        self._actions: GlobTrie[GlobTrie[bool]] = GlobTrie()
+        for permission in permissions:
+            resources = self._actions.setdefault(permission.action, GlobTrie())
+            resources.setdefault(permission.resource, True)
+
+    def check(self, action: str, resource: str) -> bool:
+        """Check whether any permission allows the action on the resource.
+
+        Args:
+            action (str): The action in question.
+            resource (str): The resource in question.
+
+        Returns:
+            bool: True if some permission's action and resource patterns both match.
+        """
+        for resources in self._actions.matches(action):
+            for _ in resources.matches(resource):
+                return True
+        return False
+
+    def check_many(self, action: str, resources: Iterable[str]) -> list[bool]:
+        """Check whether any permission allows the action on each of many resources.
+
+        The action is matched once for the whole batch.
+
+        Args:
+            action (str): The action in question.
+            resources (Iterable[str]): The resources in question.
+
+        Returns:
+            list[bool]: Whether the action is allowed on each resource, in order.
+        """
+        permitted = list(self._actions.matches(action))
+        return [
+            any(next(trie.matches(resource), False) for trie in permitted)
+            for resource in resources
+        ]
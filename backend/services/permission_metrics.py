@@ -0,0 +1,113 @@
+"""Instrumentation of the authorization work done while serving each request.
+
+The application measures each request within `measure_request`, and the PermissionService records
+every check, every query loading permissions, and the time spent matching into the counters of the
+request being served. When a request completes, its counters are added to the totals of its route
+in `route_permission_metrics`, revealing the routes that do redundant authorization work.
+
+Counters are held in a context variable, so they follow a request into the threads its
+dependencies and route run on, and checks made outside of a measured request are not recorded.
+"""
+
+from contextlib import contextmanager
+from contextvars import ContextVar
+from threading import Lock
+from typing import Iterator
+
+from ..models import PermissionMetrics
+
+__authors__ = ["Kris Jordan"]
+__copyright__ = "Copyright 2024"
+__license__ = "MIT"
+
+
+class RequestPermissionMetrics:
+    """Counters of the authorization work done while serving a single request."""
+
+    __slots__ = ("checks", "queries", "matching_seconds")
+
+    def __init__(self):
+        self.checks = 0
+        self.queries = 0
+        self.matching_seconds = 0.0
+
+    def __str__(self) -> str:
+        return f"checks={self.checks}; queries={self.queries}; matching_ms={self.matching_seconds * 1000:.3f}"
+
+
+_current_request: ContextVar[RequestPermissionMetrics | None] = ContextVar(
+    "permission_metrics", default=None
+)
+
+
+@contextmanager
+def measure_request() -> Iterator[RequestPermissionMetrics]:
+    """Records the authorization work done within the block into a fresh set of counters."""
+    metrics = RequestPermissionMetrics()
+    token = _current_request.set(metrics)
+    try:
+        yield metrics
+    finally:
+        _current_request.reset(token)
+
+
+def record_checks(checks: int, matching_seconds: float) -> None:
+    """Records checks of resources, and the time spent matching them, in the current request."""
+    metrics = _current_request.get()
+    if metrics is not None:
+        metrics.checks += checks
+        metrics.matching_seconds += matching_seconds
+
+
+def record_query() -> None:
+    """Records a query loading permissions in the current request."""
+    metrics = _current_request.get()
+    if metrics is not None:
+        metrics.queries += 1
+
+
+class RoutePermissionMetrics:
+    """Thread-safe totals of the authorization work done by the requests to each route."""
+
+    def __init__(self):
+        self._lock = Lock()
+        self._totals: dict[str, PermissionMetrics] = {}
+
+    def record(self, route: str, metrics: RequestPermissionMetrics) -> None:
+        """Adds the counters of a completed request to the totals of its route.
+
+        Args:
+            route (str): The method and path template of the route, such as `GET /api/events/{id}`.
+            metrics (RequestPermissionMetrics): The counters of the request.
+        """
+        with self._lock:
+            totals = self._totals.get(route)
+            if totals is None:
+                totals = self._totals[route] = PermissionMetrics(route=route)
+            totals.requests += 1
+            totals.checks += metrics.checks
+            totals.queries += metrics.queries
+            totals.matching_ms += metrics.matching_seconds * 1000
+
+    def snapshot(self) -> list[PermissionMetrics]:
+        """Returns the totals of each route, ordered by most checks per request first."""
+        with self._lock:
+            routes = [
+                totals.model_copy(
+                    update={
+                        "checks_per_request": totals.checks / totals.requests,
+                        "queries_per_request": totals.queries / totals.requests,
+                    }
+                )
+                for totals in self._totals.values()
+            ]
+        return sorted(routes, key=lambda totals: -totals.checks_per_request)
+
+    def clear(self) -> None:
+        """Removes the totals of every route."""
+        with self._lock:
+            self._totals.clear()
+
+
+route_permission_metrics = RoutePermissionMetrics()
+"""Authorization work done by the requests to each route in this process."""
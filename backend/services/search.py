@@ -0,0 +1,30 @@
+"""Criteria shared by the services' search and filter boxes.
+
+Filter boxes match rows whose text columns contain the query anywhere, case-insensitively. The
+columns searched are covered by pg_trgm GIN indexes (see `entities.trigram_indexes`), which
+Postgres uses to answer `ILIKE '%query%'` for queries of three or more characters rather than
+scanning every row.
+"""
+
+from sqlalchemy import ColumnElement, or_
+
+__authors__ = ["Kris Jordan"]
+__copyright__ = "Copyright 2024"
+__license__ = "MIT"
+
+
+def contains_text(query: str, *columns: ColumnElement[str]) -> ColumnElement[bool]:
+    """Criteria matching rows where any of the columns contains the query, ignoring case.
+
+    The query is matched literally: `%` and `_` in it are not wildcards.
+
+    Args:
+        query (str): The text to search for.
+        *columns (ColumnElement[str]): The columns to search.
+
+    Returns:
+        ColumnElement[bool]: Criteria for a WHERE clause.
+    """
+    escaped = query.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+    pattern = f"%{escaped}%"
+    return or_(*(column.ilike(pattern, escape="\\") for column in columns))
@@ -3,19 +3,52 @@
 The User Service provides access to the User model and its associated database operations.
 """
 
+from datetime import timedelta
 from fastapi import Depends
-from sqlalchemy import select, or_, func, cast, String
-from sqlalchemy.orm import Session
+from sqlalchemy import select, func, cast, String
+from sqlalchemy.orm import InstrumentedAttribute, Session
 from ..database import db_session
-from ..models import User, UserDetails, Paginated, PaginationParams, PublicUser
+from ..models import (
+    User,
+    UserDetails,
+    Paginated,
+    PaginationParams,
+    PublicUser,
+    CacheStats,
+    CursorPaginated,
+    CursorPaginationParams,
+)
 from ..entities import UserEntity
+from .cache import TTLCache
 from .exceptions import ResourceNotFoundException
+from .pagination import SortKey, paginate_by_cursor, sort_key
 from .permission import PermissionService
+from .search import contains_text
 
 __authors__ = ["Kris Jordan"]
 __copyright__ = "Copyright 2023"
 __license__ = "MIT"
 
+authenticated_users: TTLCache[int, User] = TTLCache(
+    "user.authenticated", ttl=timedelta(seconds=30), maxsize=4096
+)
+"""Registered users resolved from the PIDs of authenticated requests, keyed by PID.
+
+Entries are invalidated when a user is created or updated in this process. The short time-to-live
+bounds how long other workers serve a user that predates such a change."""
+
+USER_SORT_COLUMNS: dict[str, InstrumentedAttribute] = {
+    "id": UserEntity.id,
+    "pid": UserEntity.pid,
+    "onyen": UserEntity.onyen,
+    "email": UserEntity.email,
+    "first_name": UserEntity.first_name,
+    "last_name": UserEntity.last_name,
+    "pronouns": UserEntity.pronouns,
+    "github": UserEntity.github,
+}
+"""The columns users can be ordered by when paginated by cursor, by the name clients request."""
+
 
 class UserService:
     _session: Session
@@ -50,6 +83,54 @@ class UserService:
             user_details = UserDetails(**user_fields)
             return user_details
 
+    def get_authenticated(self, pid: int, fresh: bool = False) -> User | None:
+        """Get the registered User with a PID for an authenticated request.
+
+        Unlike `get`, the user's permissions are not loaded and the user is served from a
+        short-lived, process-wide cache.
+
+        Args:
+            pid: The PID of the user.
+            fresh: Whether to bypass the cache and load the user from the database, refreshing
+                the cached user.
+
+        Returns:
+            User | None: The user or None if not registered.
+        """
+        if fresh:
+            authenticated_users.invalidate(pid)
+        try:
+            user = authenticated_users.get_or_compute(
+                pid, lambda: self._get_registered(pid)
+            )
+        except ResourceNotFoundException:
+            return None
+        # Callers may modify the user they are given, which must not affect the cached user.
+        return user.model_copy()
+
+    def get_authenticated_cache_stats(self, subject: User) -> CacheStats:
+        """Hit and miss counters and lookup latency of the authenticated user cache in this process.
+
+        Args:
+            subject: The user requesting the stats.
+
+        Returns:
+            CacheStats: The counters of the authenticated user cache.
+
+        Raises:
+            PermissionException: If the subject may not read user cache diagnostics.
+        """
+        self._permission.enforce(subject, "user.cache", "user/")
+        return authenticated_users.stats()
+
+    def _get_registered(self, pid: int) -> User:
+        """Get a User by PID, raising ResourceNotFoundException if they are not registered."""
+        query = select(UserEntity).where(UserEntity.pid == pid)
+        user_entity: UserEntity | None = self._session.scalar(query)
+        if user_entity is None:
+            raise ResourceNotFoundException(f"User with PID {pid} not found")
+        return user_entity.to_model()
+
     def get_by_id(self, id: int) -> User:
         """Get a User by their id.
 
@@ -98,12 +179,13 @@ class UserService:
             list[User]: The list of users matching the query.
         """
         statement = select(UserEntity)
-        criteria = or_(
-            UserEntity.first_name.ilike(f"%{query}%"),
-            UserEntity.last_name.ilike(f"%{query}%"),
-            UserEntity.onyen.ilike(f"%{query}%"),
-            UserEntity.email.ilike(f"%{query}%"),
-            cast(UserEntity.pid, String).ilike(f"%{query}%"),
+        criteria = contains_text(
+            query,
+            UserEntity.first_name,
+            UserEntity.last_name,
+            UserEntity.onyen,
+            UserEntity.email,
+            cast(UserEntity.pid, String),
         )
         statement = statement.where(criteria).limit(10)
         entities = self._session.execute(statement).scalars()
@@ -131,12 +213,7 @@ class UserService:
         statement = select(UserEntity)
         length_statement = select(func.count()).select_from(UserEntity)
         if pagination_params.filter != "":
-            query = pagination_params.filter
-            criteria = or_(
-                UserEntity.first_name.ilike(f"%{query}%"),
-                UserEntity.last_name.ilike(f"%{query}%"),
-                UserEntity.onyen.ilike(f"%{query}%"),
-            )
+            criteria = self._filter_criteria(pagination_params.filter)
             statement = statement.where(criteria)
             length_statement = length_statement.where(criteria)
 
@@ -159,6 +236,53 @@ class UserService:
             params=pagination_params,
         )
 
+    def list_by_cursor(
+        self, subject: User, pagination_params: CursorPaginationParams
+    ) -> CursorPaginated[User]:
+        """List Users a page at a time by cursor.
+
+        The subject must have the 'user.list' permission on the 'user/' resource.
+
+        Args:
+            subject: The user performing the action.
+            pagination_params: The cursor pagination parameters.
+
+        Returns:
+            CursorPaginated[User]: The page of users and the cursor of the next page.
+
+        Raises:
+            PermissionException: If the subject does not have the required permission.
+            InvalidCursorException: If the cursor is invalid.
+        """
+        self._permission.enforce(subject, "user.list", "user/")
+
+        statement = select(UserEntity)
+        length_statement = select(func.count()).select_from(UserEntity)
+        if pagination_params.filter != "":
+            criteria = self._filter_criteria(pagination_params.filter)
+            statement = statement.where(criteria)
+            length_statement = length_statement.where(criteria)
+
+        keys: list[SortKey] = []
+        if pagination_params.order_by != "":
+            keys.append(sort_key(USER_SORT_COLUMNS, pagination_params.order_by))
+        keys.append((UserEntity.id, True))
+
+        return paginate_by_cursor(
+            self._session,
+            statement,
+            keys,
+            pagination_params,
+            lambda entities: [entity.to_model() for entity in entities],
+            length_statement,
+        )
+
+    def _filter_criteria(self, query: str):
+        """Criteria matching users whose name or onyen contains the query."""
+        return contains_text(
+            query, UserEntity.first_name, UserEntity.last_name, UserEntity.onyen
+        )
+
     def create(self, subject: User, user: User) -> User:
         """Create a User.
 
@@ -179,6 +303,7 @@ class UserService:
         entity = UserEntity.from_model(user)
         self._session.add(entity)
         self._session.commit()
+        authenticated_users.invalidate(entity.pid)
         return entity.to_model()
 
     def update(self, subject: User, user: User) -> User:
@@ -201,4 +326,5 @@ class UserService:
         entity = self._session.get(UserEntity, user.id)
         entity.update(user)
         self._session.commit()
+        authenticated_users.invalidate(entity.pid)
         return entity.to_model()
@@ -119,6 +119,7 @@ class UserOrgService:
                     )
                 )
                 self._session.commit()
+                self._permission.invalidate(user.id)
                 return True
             else:
                 print("User does not exist.")
@@ -178,6 +179,7 @@ class UserOrgService:
                 )
 
                 self._session.commit()
+                self._permission.invalidate(user.id)
                 return True
             else:
                 print("User does not exist.")
@@ -2,7 +2,12 @@
 
 import pytest
 
-from ....models.pagination import PaginationParams, Paginated
+from ....models.pagination import (
+    PaginationParams,
+    Paginated,
+    CursorPaginated,
+    CursorPaginationParams,
+)
 from ....models.academics.my_courses import (
     TermOverview,
     CourseMemberOverview,
@@ -11,7 +16,11 @@ from ....models.academics.my_courses import (
 )
 from ....models.office_hours.course_site import CourseSite, UpdatedCourseSite
 from ....services.academics.course_site import CourseSiteService
-from ....services.exceptions import CoursePermissionException, ResourceNotFoundException
+from ....services.exceptions import (
+    CoursePermissionException,
+    InvalidCursorException,
+    ResourceNotFoundException,
+)
 
 # Imported fixtures provide dependencies injected for the tests as parameters.
 from .fixtures import course_site_svc
@@ -55,6 +64,43 @@ def test_get_course_site_roster(course_site_svc: CourseSiteService):
     assert roster.length == 5
 
 
+def test_get_course_site_roster_by_cursor(course_site_svc: CourseSiteService):
+    """Ensures that paging through a roster by cursor visits members in roster order."""
+    expected = course_site_svc.get_course_site_roster(
+        user_data.instructor,
+        office_hours_data.comp_110_site.id,
+        PaginationParams(order_by="last_name", page_size=100),
+    )
+
+    pids = []
+    cursor = ""
+    while True:
+        page = course_site_svc.get_course_site_roster_by_cursor(
+            user_data.instructor,
+            office_hours_data.comp_110_site.id,
+            CursorPaginationParams(cursor=cursor, order_by="last_name", page_size=2),
+        )
+        assert isinstance(page, CursorPaginated)
+        assert page.length == (5 if cursor == "" else None)
+        pids += [member.pid for member in page.items]
+        if page.next_cursor is None:
+            break
+        cursor = page.next_cursor
+
+    assert pids == [member.pid for member in expected.items]
+
+
+def test_get_course_site_roster_by_cursor_rejects_unsortable_order_by(
+    course_site_svc: CourseSiteService,
+):
+    with pytest.raises(InvalidCursorException):
+        course_site_svc.get_course_site_roster_by_cursor(
+            user_data.instructor,
+            office_hours_data.comp_110_site.id,
+            CursorPaginationParams(order_by="sections"),
+        )
+
+
 def test_get_course_site_roster_order_by(course_site_svc: CourseSiteService):
     """Ensures that course roster ordering works with pagination."""
     pagination_params = PaginationParams(order_by="last_name")
@@ -16,6 +16,7 @@ from .....models.academics.hiring.application_review import (
     ApplicationReviewOverview,
     ApplicationReviewStatus,
 )
+from .....models.pagination import CursorPaginationParams
 from .....services.academics import HiringService
 from .....services.application import ApplicationService
 from .....services.academics.course_site import CourseSiteService
@@ -303,3 +304,39 @@ def test_get_phd_applicants(hiring_svc: HiringService):
     assert len(applicants) > 0
     for applicant in applicants:
         assert applicant.program_pursued in {"PhD", "PhD (ABD)"}
+
+
+def test_get_hiring_summary_overview_by_cursor(hiring_svc: HiringService):
+    """Ensures that the hiring summary can be paged through by cursor, ordered by last name."""
+    hiring_svc.create_hiring_assignment(
+        user_data.root, hiring_data.new_hiring_assignment
+    )
+    first = hiring_svc.get_hiring_summary_overview_by_cursor(
+        user_data.root,
+        term_data.current_term.id,
+        CursorPaginationParams(page_size=1),
+    )
+    assert first.length == 2
+    assert [item.user.id for item in first.items] == [user_data.ambassador.id]
+    assert first.next_cursor is not None
+
+    second = hiring_svc.get_hiring_summary_overview_by_cursor(
+        user_data.root,
+        term_data.current_term.id,
+        CursorPaginationParams(cursor=first.next_cursor, page_size=1),
+    )
+    assert second.length is None
+    assert [item.user.id for item in second.items] == [user_data.student.id]
+    assert second.next_cursor is None
+
+
+def test_get_hiring_summary_overview_by_cursor_checks_permission(
+    hiring_svc: HiringService,
+):
+    """Ensures that nobody else is able to page through the hiring summary."""
+    with pytest.raises(UserPermissionException):
+        hiring_svc.get_hiring_summary_overview_by_cursor(
+            user_data.ambassador,
+            term_data.current_term.id,
+            CursorPaginationParams(),
+        )
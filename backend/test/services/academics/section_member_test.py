@@ -3,12 +3,17 @@
 import pytest
 
 from fastapi import HTTPException
+from fastapi.testclient import TestClient
+from sqlalchemy.orm import Session
 
 from ....models.office_hours.course_site_details import CourseSiteDetails
 from ....models.academics.section_member import SectionMember
 from ....models.roster_role import RosterRole
 from ....models.pagination import PaginationParams
 
+from ....api.authentication import _generate_token
+from ....database import db_session
+from ....main import app
 from ....services.academics.section_member import SectionMemberService
 from ....services.exceptions import ResourceNotFoundException, CoursePermissionException
 
@@ -107,3 +112,19 @@ def test_create_from_csv_bad_formatting(section_member_svc: SectionMemberService
             csv_data=section_data.bad_roster_csv,
         )
         pytest.fail()
+
+
+def test_get_section_member_by_id_route_needs_only_claims(session: Session):
+    """The route answers a user who is authenticated but not registered, so it never loads the
+    subject from the database."""
+    app.dependency_overrides[db_session] = lambda: session
+    try:
+        response = TestClient(app).get(
+            f"/api/academics/section-member/{section_data.comp110_instructor.id}",
+            headers={"Authorization": f"Bearer {_generate_token('unregistered', 123)}"},
+        )
+    finally:
+        app.dependency_overrides.clear()
+
+    assert response.status_code == 200
+    assert response.json()["id"] == section_data.comp110_instructor.id
@@ -0,0 +1,156 @@
+"""Tests for the in-process TTLCache."""
+
+import pytest
+from datetime import timedelta
+from threading import Event, Thread
+from ...services.cache import TTLCache
+
+__authors__ = ["Kris Jordan"]
+__copyright__ = "Copyright 2024"
+__license__ = "MIT"
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_get_miss_then_hit():
+    cache: TTLCache[str, int] = TTLCache("test", ttl=timedelta(seconds=10))
+    assert cache.get("a") is None
+    cache.put("a", 1)
+    assert cache.get("a") == 1
+
+    stats = cache.stats()
+    assert stats.name == "test"
+    assert stats.hits == 1
+    assert stats.misses == 1
+    assert stats.hit_ratio == 0.5
+
+
+def test_entries_expire():
+    clock = FakeClock()
+    cache: TTLCache[str, int] = TTLCache("test", ttl=timedelta(seconds=10), clock=clock)
+    cache.put("a", 1)
+    clock.now = 9.9
+    assert cache.get("a") == 1
+    clock.now = 10.0
+    assert cache.get("a") is None
+    assert cache.stats().size == 0
+
+
+def test_least_recently_used_evicted():
+    cache: TTLCache[str, int] = TTLCache("test", ttl=timedelta(seconds=10), maxsize=2)
+    cache.put("a", 1)
+    cache.put("b", 2)
+    cache.get("a")
+    cache.put("c", 3)
+    assert cache.get("a") == 1
+    assert cache.get("b") is None
+    assert cache.get("c") == 3
+
+
+def test_get_or_compute():
+    cache: TTLCache[str, int] = TTLCache("test", ttl=timedelta(seconds=10))
+    calls = []
+
+    def compute() -> int:
+        calls.append(1)
+        return 42
+
+    assert cache.get_or_compute("a", compute) == 42
+    assert cache.get_or_compute("a", compute) == 42
+    assert len(calls) == 1
+
+
+def test_get_or_compute_caches_falsy_values():
+    cache: TTLCache[str, list] = TTLCache("test", ttl=timedelta(seconds=10))
+    cache.put("a", [])
+    assert cache.get_or_compute("a", lambda: [1]) == []
+
+
+def test_invalidate_key():
+    cache: TTLCache[str, int] = TTLCache("test", ttl=timedelta(seconds=10))
+    cache.put("a", 1)
+    cache.put("b", 2)
+    cache.invalidate("a")
+    assert cache.get("a") is None
+    assert cache.get("b") == 2
+    assert cache.stats().invalidations == 1
+
+
+def test_invalidate_during_compute_discards_value():
+    cache: TTLCache[str, int] = TTLCache("test", ttl=timedelta(seconds=10))
+
+    def compute() -> int:
+        cache.invalidate()
+        return 1
+
+    assert cache.get_or_compute("a", compute) == 1
+    assert cache.get("a") is None
+
+
+def test_invalidate_key_during_compute_discards_value():
+    """A value computed before its key was invalidated may be stale, so it is not stored."""
+    cache: TTLCache[str, int] = TTLCache("test", ttl=timedelta(seconds=10))
+
+    def compute() -> int:
+        cache.invalidate("a")
+        return 1
+
+    assert cache.get_or_compute("a", compute) == 1
+    assert cache.get("a") is None
+    assert cache.get_or_compute("a", lambda: 2) == 2
+    assert cache.get("a") == 2
+
+
+def test_invalidate_key_between_threads_discards_value():
+    cache: TTLCache[str, int] = TTLCache("test", ttl=timedelta(seconds=10))
+    computing = Event()
+    invalidated = Event()
+
+    def compute() -> int:
+        computing.set()
+        invalidated.wait(timeout=5)
+        return 1
+
+    worker = Thread(target=lambda: cache.get_or_compute("a", compute))
+    worker.start()
+    computing.wait(timeout=5)
+    cache.invalidate("a")
+    invalidated.set()
+    worker.join(timeout=5)
+
+    assert cache.get("a") is None
+
+
+def test_clear_resets_stats():
+    cache: TTLCache[str, int] = TTLCache("test", ttl=timedelta(seconds=10))
+    cache.put("a", 1)
+    cache.get("a")
+    cache.clear()
+    stats = cache.stats()
+    assert stats.hits == 0 and stats.size == 0
+
+
+def test_stats_mean_lookup_latency():
+    cache: TTLCache[str, int] = TTLCache("test", ttl=timedelta(seconds=10))
+    assert cache.stats().mean_lookup_ms == 0.0
+    cache.get_or_compute("a", lambda: 1)
+    cache.get_or_compute("a", lambda: 1)
+    assert cache.stats().mean_lookup_ms > 0.0
+
+
+def test_get_or_compute_exception_not_stored():
+    cache: TTLCache[str, int] = TTLCache("test", ttl=timedelta(seconds=10))
+
+    def compute() -> int:
+        raise ValueError()
+
+    with pytest.raises(ValueError):
+        cache.get_or_compute("a", compute)
+    assert cache.get_or_compute("a", lambda: 1) == 1
+    assert cache.stats().misses == 2
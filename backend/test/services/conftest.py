@@ -9,6 +9,9 @@ from sqlalchemy.exc import OperationalError, ProgrammingError
 from ...database import _engine_str
 from ...env import getenv
 from ... import entities
+from ...services.permission import permission_matchers
+from ...services.user import authenticated_users
+from ...services.event import featured_events
 
 POSTGRES_DATABASE = f'{getenv("POSTGRES_DATABASE")}_test'
 POSTGRES_USER = getenv("POSTGRES_USER")
@@ -51,6 +54,11 @@ def test_engine() -> Engine:
 def session(test_engine: Engine):
     entities.EntityBase.metadata.drop_all(test_engine)
     entities.EntityBase.metadata.create_all(test_engine)
+    # Users, their permissions, and the featured event are cached across sessions, but the database
+    # is recreated for each test.
+    permission_matchers.clear()
+    authenticated_users.clear()
+    featured_events.clear()
     session = Session(test_engine)
     try:
         yield session
@@ -0,0 +1,146 @@
+"""Unit tests for the interval-based seat availability engine."""
+
+from ....services.coworking import availability_engine
+from ....services.coworking.availability_engine import to_epoch, from_epoch
+from ....models.coworking import AvailabilityList, TimeRange
+from . import seat_data
+from .time import *
+
+__authors__ = ["Kris Jordan"]
+__copyright__ = "Copyright 2024"
+__license__ = "MIT"
+
+
+def test_epoch_round_trip(time: dict[str, datetime]):
+    assert from_epoch(to_epoch(time[NOW])) == time[NOW]
+
+
+def test_constrain():
+    assert availability_engine.constrain([(0, 10), (20, 30), (40, 50)], (5, 45)) == [
+        (5, 10),
+        (20, 30),
+        (40, 45),
+    ]
+
+
+def test_constrain_outside_bounds():
+    assert availability_engine.constrain([(0, 10)], (10, 20)) == []
+
+
+def test_subtract_no_blocks():
+    assert availability_engine.subtract([(0, 10)], []) == [(0, 10)]
+
+
+def test_subtract_middle():
+    assert availability_engine.subtract([(0, 10)], [(3, 5)]) == [(0, 3), (5, 10)]
+
+
+def test_subtract_unsorted_overlapping_blocks():
+    assert availability_engine.subtract(
+        [(0, 10), (20, 30)], [(25, 27), (2, 4), (3, 6), (8, 22)]
+    ) == [(0, 2), (6, 8), (22, 25), (27, 30)]
+
+
+def test_subtract_touching_blocks_do_not_remove():
+    assert availability_engine.subtract([(10, 20)], [(0, 10), (20, 30)]) == [(10, 20)]
+
+
+def test_subtract_entire_range():
+    assert availability_engine.subtract([(10, 20), (30, 40)], [(0, 50)]) == []
+
+
+def test_subtract_matches_availability_list(time: dict[str, datetime]):
+    """The engine agrees with AvailabilityList#subtract for the same inputs."""
+    open_hours = [
+        TimeRange(start=time[NOW], end=time[IN_ONE_HOUR]),
+        TimeRange(start=time[IN_TWO_HOURS], end=time[IN_EIGHT_HOURS]),
+    ]
+    blocks = [
+        TimeRange(start=time[IN_TEN_MINUTES], end=time[IN_THIRTY_MINUTES]),
+        TimeRange(start=time[IN_THIRTY_MINUTES], end=time[IN_THREE_HOURS]),
+    ]
+
+    expected = AvailabilityList(availability=open_hours)
+    for block in blocks:
+        expected.subtract(block)
+
+    actual = availability_engine.subtract(
+        [availability_engine.to_interval(time_range) for time_range in open_hours],
+        [availability_engine.to_interval(block) for block in blocks],
+    )
+    assert actual == [
+        availability_engine.to_interval(time_range)
+        for time_range in expected.availability
+    ]
+
+
+def test_drop_shorter_than():
+    minimum = timedelta(microseconds=5)
+    assert availability_engine.drop_shorter_than([(0, 4), (10, 15)], minimum) == [
+        (10, 15)
+    ]
+
+
+def test_seat_availability(time: dict[str, datetime]):
+    open_hours = [
+        availability_engine.to_interval(
+            TimeRange(start=time[NOW], end=time[IN_TWO_HOURS])
+        )
+    ]
+    reserved_seat, open_seat = (
+        seat_data.reservable_seats[0],
+        seat_data.reservable_seats[1],
+    )
+    reservation = availability_engine.to_interval(
+        TimeRange(start=time[NOW], end=time[IN_ONE_HOUR])
+    )
+
+    available_seats = availability_engine.seat_availability(
+        [reserved_seat, open_seat],
+        open_hours,
+        [(reserved_seat.id, reservation)],
+        TEN_MINUTES,
+    )
+
+    assert [seat.id for seat in available_seats] == [reserved_seat.id, open_seat.id]
+    assert available_seats[0].availability[0].start == time[IN_ONE_HOUR]
+    assert available_seats[1].availability[0].start == time[NOW]
+    assert available_seats[1].availability[0].end == time[IN_TWO_HOURS]
+
+
+def test_seat_availability_prunes_short_availability(time: dict[str, datetime]):
+    open_hours = [
+        availability_engine.to_interval(
+            TimeRange(start=time[NOW], end=time[IN_TEN_MINUTES])
+        )
+    ]
+    available_seats = availability_engine.seat_availability(
+        seat_data.reservable_seats, open_hours, [], THIRTY_MINUTES
+    )
+    assert available_seats == []
+
+
+def test_group_by_seat_sorts_blocks():
+    assert availability_engine.group_by_seat(
+        [(1, (5, 6)), (2, (0, 1)), (1, (0, 2))]
+    ) == {
+        1: [(0, 2), (5, 6)],
+        2: [(0, 1)],
+    }
+
+
+def test_remaining_availability_reuses_grouped_blocks():
+    seat = seat_data.reservable_seats[0]
+    blocks_by_seat = availability_engine.group_by_seat([(seat.id, (10, 20))])
+    for open_hours, expected in [
+        ([(0, 30)], [(0, 10), (20, 30)]),
+        ([(15, 40)], [(20, 40)]),
+        ([(10, 20)], None),
+    ]:
+        remaining = availability_engine.remaining_availability(
+            [seat], open_hours, blocks_by_seat, timedelta(0)
+        )
+        if expected is None:
+            assert remaining == []
+        else:
+            assert remaining == [(seat, expected)]
@@ -14,6 +14,10 @@ from ....services.coworking import (
     PolicyService,
     StatusService,
 )
+from ....services.coworking.cache import (
+    operating_hours_calendar,
+    xl_status_snapshot,
+)
 
 __authors__ = [
     "Kris Jordan",
@@ -35,6 +39,7 @@ def permission_svc(session: Session):
 @pytest.fixture()
 def operating_hours_svc(session: Session, permission_svc: PermissionService):
     """OperatingHoursService fixture."""
+    operating_hours_calendar.clear()
     return OperatingHoursService(session, permission_svc)
 
 
@@ -76,6 +81,12 @@ def status_svc():
     operating_hours_mock = create_autospec(OperatingHoursService)
     seat_mock = create_autospec(SeatService)
     reservation_mock = create_autospec(ReservationService)
+    permission_mock = create_autospec(PermissionService)
+    xl_status_snapshot.clear()
     return StatusService(
-        policies_mock, operating_hours_mock, seat_mock, reservation_mock
+        policies_mock,
+        operating_hours_mock,
+        seat_mock,
+        reservation_mock,
+        permission_mock,
     )
@@ -1,8 +1,10 @@
 """Tests for Coworking Operating Hours Service."""
 
 from unittest.mock import create_autospec, call
+from sqlalchemy.orm import Session
 
 from ....services.coworking import OperatingHoursService
+from ....services.coworking.operating_hours_calendar import OperatingHoursCalendar
 from ....models.coworking import OperatingHours, TimeRange
 from ....services.coworking.exceptions import OperatingHoursCannotOverlapException
 from ....services import PermissionService
@@ -11,6 +13,7 @@ from ....services.exceptions import ResourceNotFoundException
 # Imported fixtures provide dependencies injected for the tests as parameters.
 from .fixtures import permission_svc, operating_hours_svc
 from .time import *
+from ..query_counter import count_queries
 
 # Insert fake data entities in database
 from ..core_data import setup_insert_data_fixture as insert_order_0
@@ -116,3 +119,62 @@ def test_delete_permissions(operating_hours_svc: OperatingHoursService):
         "coworking.operating_hours.delete",
         f"coworking/operating_hours/{operating_hours_data.future.id}",
     )
+
+
+def test_schedule_served_from_calendar(
+    operating_hours_svc: OperatingHoursService,
+    session: Session,
+    time: dict[str, datetime],
+):
+    """After the calendar is loaded, schedule lookups of any range issue no queries."""
+    operating_hours_svc.schedule(TimeRange(start=time[NOW], end=time[IN_ONE_HOUR]))
+    other_svc = OperatingHoursService(session, operating_hours_svc._permission_svc)
+    with count_queries(session) as counter:
+        result = other_svc.schedule(
+            TimeRange(start=time[TOMORROW], end=time[TOMORROW] + ONE_DAY)
+        )
+    assert counter.count == 0
+    assert [hours.id for hours in result] == [
+        operating_hours_data.tomorrow.id,
+        operating_hours_data.future.id,
+    ]
+
+
+def test_schedule_reflects_create(
+    operating_hours_svc: OperatingHoursService, time: dict[str, datetime]
+):
+    """Creating operating hours invalidates the calendar and the memoized schedule."""
+    time_range = TimeRange(
+        start=time[NOW] + timedelta(days=7), end=time[NOW] + timedelta(days=7, hours=1)
+    )
+    assert operating_hours_svc.schedule(time_range) == []
+    created = operating_hours_svc.create(user_data.root, time_range)
+    assert operating_hours_svc.schedule(time_range) == [created]
+
+
+def test_schedule_reflects_delete(
+    operating_hours_svc: OperatingHoursService, time: dict[str, datetime]
+):
+    """Deleting operating hours invalidates the calendar and the memoized schedule."""
+    time_range = TimeRange(start=time[NOW], end=time[IN_ONE_HOUR])
+    assert len(operating_hours_svc.schedule(time_range)) == 1
+    operating_hours_svc.delete(user_data.root, operating_hours_data.today)
+    assert operating_hours_svc.schedule(time_range) == []
+
+
+def test_calendar_overlapping_with_overlaps(time: dict[str, datetime]):
+    """Range lookups find long entries that begin before shorter, later entries."""
+    long = OperatingHours(id=1, start=time[NOW], end=time[NOW] + ONE_DAY)
+    short = OperatingHours(id=2, start=time[IN_ONE_HOUR], end=time[IN_TWO_HOURS])
+    calendar = OperatingHoursCalendar([short, long])
+    lookup = TimeRange(start=time[IN_THREE_HOURS], end=time[IN_EIGHT_HOURS])
+    assert calendar.overlapping(lookup) == [long]
+    assert calendar.overlapping(
+        TimeRange(start=time[IN_TWO_HOURS], end=time[IN_THREE_HOURS])
+    ) == [long, short]
+    assert (
+        calendar.overlapping(
+            TimeRange(start=time[NOW] + 2 * ONE_DAY, end=time[NOW] + 3 * ONE_DAY)
+        )
+        == []
+    )
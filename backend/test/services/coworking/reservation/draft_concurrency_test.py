@@ -0,0 +1,182 @@
+"""Tests that concurrent ReservationService#draft_reservation calls never double-book."""
+
+from concurrent.futures import ThreadPoolExecutor
+from time import perf_counter
+
+from sqlalchemy import Engine, create_engine, func, select
+from sqlalchemy.orm import Session
+
+from .....entities.coworking import ReservationEntity
+from .....models import User
+from .....models.coworking import ReservationRequest, ReservationState
+from .....models.room import RoomPartial
+from .....services import PermissionService
+from .....services.coworking import (
+    OperatingHoursService,
+    PolicyService,
+    ReservationService,
+    SeatService,
+)
+from .....services.coworking.cache import operating_hours_calendar
+from .....services.coworking.reservation import ReservationException
+
+# Imported fixtures provide dependencies injected for the tests as parameters.
+from ..time import *
+
+# Import the setup_teardown fixture explicitly to load entities in database.
+# The order in which these fixtures run is dependent on their imported alias.
+# Since there are relationship dependencies between the entities, order matters.
+from ...core_data import setup_insert_data_fixture as insert_order_0
+from ..operating_hours_data import fake_data_fixture as insert_order_1
+from ...room_data import fake_data_fixture as insert_order_2
+from ..seat_data import fake_data_fixture as insert_order_3
+from .reservation_data import fake_data_fixture as insert_order_4
+
+# Import the fake model data in a namespace for test assertions
+from ...core_data import user_data
+from ... import room_data
+from .. import seat_data
+
+__authors__ = ["Kris Jordan"]
+__copyright__ = "Copyright 2024"
+__license__ = "MIT"
+
+DRAFTS = 200
+WORKERS = 20
+P99_LATENCY_LIMIT = 5.0  # seconds
+
+USERS = [
+    user_data.root,
+    user_data.ambassador,
+    user_data.user,
+    user_data.instructor,
+    user_data.uta,
+    user_data.student,
+    user_data.leader,
+    user_data.president,
+]
+
+
+def _draft(
+    engine: Engine, subject: User, request: ReservationRequest
+) -> tuple[bool, float]:
+    """Drafts a reservation in its own session, as a separate request would.
+
+    Returns:
+        tuple[bool, float]: Whether the draft succeeded and how long it took in seconds.
+    """
+    with Session(engine) as session:
+        permission_svc = PermissionService(session)
+        reservation_svc = ReservationService(
+            session,
+            permission_svc,
+            PolicyService(),
+            OperatingHoursService(session, permission_svc),
+            SeatService(session),
+        )
+        started = perf_counter()
+        try:
+            reservation_svc.draft_reservation(subject, request)
+            succeeded = True
+        except ReservationException:
+            succeeded = False
+        return succeeded, perf_counter() - started
+
+
+def _draft_concurrently(
+    test_engine: Engine, requests: list[tuple[User, ReservationRequest]]
+) -> list[tuple[bool, float]]:
+    operating_hours_calendar.clear()
+    engine = create_engine(test_engine.url, pool_size=WORKERS, max_overflow=0)
+    try:
+        with ThreadPoolExecutor(max_workers=WORKERS) as executor:
+            return list(
+                executor.map(
+                    lambda user_request: _draft(engine, *user_request), requests
+                )
+            )
+    finally:
+        engine.dispose()
+
+
+def _p99(latencies: list[float]) -> float:
+    return sorted(latencies)[int(len(latencies) * 0.99) - 1]
+
+
+def _active_reservations(session: Session, *criteria) -> int:
+    return session.scalar(
+        select(func.count(ReservationEntity.id)).where(
+            ReservationEntity.state.not_in(
+                [ReservationState.CANCELLED, ReservationState.CHECKED_OUT]
+            ),
+            *criteria,
+        )
+    )
+
+
+def test_concurrent_room_drafts_book_room_once(
+    session: Session, test_engine: Engine, time: dict[str, datetime]
+):
+    start = time[NOW] + timedelta(days=3)
+    end = start + ONE_HOUR
+    requests = [
+        (
+            USERS[i % len(USERS)],
+            ReservationRequest(
+                start=start,
+                end=end,
+                users=[USERS[i % len(USERS)]],
+                seats=[],
+                room=RoomPartial(id=room_data.pair_a.id),
+            ),
+        )
+        for i in range(DRAFTS)
+    ]
+
+    results = _draft_concurrently(test_engine, requests)
+
+    assert sum(succeeded for succeeded, _ in results) == 1
+    assert (
+        _active_reservations(
+            session,
+            ReservationEntity.room_id == room_data.pair_a.id,
+            ReservationEntity.start < end,
+            ReservationEntity.end > start,
+        )
+        == 1
+    )
+    assert _p99([latency for _, latency in results]) < P99_LATENCY_LIMIT
+
+
+def test_concurrent_seat_drafts_book_seat_once(
+    session: Session, test_engine: Engine, time: dict[str, datetime]
+):
+    seat = seat_data.reservable_seats[0]
+    start = time[NOW] + timedelta(days=3)
+    end = start + ONE_HOUR
+    requests = [
+        (
+            USERS[i % len(USERS)],
+            ReservationRequest(
+                start=start,
+                end=end,
+                users=[USERS[i % len(USERS)]],
+                seats=[seat],
+            ),
+        )
+        for i in range(DRAFTS)
+    ]
+
+    results = _draft_concurrently(test_engine, requests)
+
+    assert sum(succeeded for succeeded, _ in results) == 1
+    assert (
+        _active_reservations(
+            session,
+            ReservationEntity.seats.any(id=seat.id),
+            ReservationEntity.start < end,
+            ReservationEntity.end > start,
+        )
+        == 1
+    )
+    assert _p99([latency for _, latency in results]) < P99_LATENCY_LIMIT
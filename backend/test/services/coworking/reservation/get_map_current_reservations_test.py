@@ -1,10 +1,14 @@
 """Tests for ReservationService#get_map_reservations_for_date and helper functions."""
 
+import pytest
 from backend.models.coworking.availability import RoomState
 from backend.models.coworking.reservation import ReservationState
 from datetime import date
 
+from sqlalchemy.orm import Session
+from .....entities import RoomEntity
 from .....services.coworking import ReservationService
+from .....services.coworking.room_slot_grid import RoomSlotGrid
 
 # Imported fixtures provide dependencies injected for the tests as parameters.
 # Dependent fixtures (seat_svc) are required to be imported in the testing module.
@@ -16,6 +20,7 @@ from ..fixtures import (
     operating_hours_svc,
 )
 from ..time import *
+from ...query_counter import count_queries
 
 # Import the setup_teardown fixture explicitly to load entities in database.
 # The order in which these fixtures run is dependent on their imported alias.
@@ -40,7 +45,31 @@ __copyright__ = "Copyright 2023-24"
 __license__ = "MIT"
 
 
-def test_transform_date_map_for_unavailable_simple(reservation_svc: ReservationService):
+def _grid_from_date_map(date_map: dict[str, list[int]]) -> RoomSlotGrid:
+    """Builds a RoomSlotGrid holding the states of a sample date map."""
+    start = datetime.now().replace(hour=10, minute=0, second=0, microsecond=0)
+    slot_count = len(next(iter(date_map.values())))
+    grid = RoomSlotGrid(list(date_map.keys()), start, slot_count)
+    for room_id, states in date_map.items():
+        for idx, state in enumerate(states):
+            grid.fill(
+                room_id,
+                start + timedelta(minutes=30 * idx),
+                start + timedelta(minutes=30 * (idx + 1)),
+                RoomState(state),
+            )
+    return grid
+
+
+def _gray_out_subject_columns(grid: RoomSlotGrid) -> None:
+    grid.replace_in_columns(
+        grid.columns_with(RoomState.SUBJECT_RESERVED),
+        RoomState.AVAILABLE,
+        RoomState.UNAVAILABLE,
+    )
+
+
+def test_transform_date_map_for_unavailable_simple():
     """
     Validates the transformation of the date map to indicate unavailable time slots.
 
@@ -64,13 +93,12 @@ def test_transform_date_map_for_unavailable_simple(reservation_svc: ReservationS
         "SN139": [0, 0, 3, 3],
     }
 
-    reservation_svc._transform_date_map_for_unavailable(sample_date_map_1)
-    assert sample_date_map_1 == expected_transformed_date_map_1
+    grid = _grid_from_date_map(sample_date_map_1)
+    _gray_out_subject_columns(grid)
+    assert grid.to_map() == expected_transformed_date_map_1
 
 
-def test_transform_date_map_for_unavailable_complex(
-    reservation_svc: ReservationService,
-):
+def test_transform_date_map_for_unavailable_complex():
     sample_date_map_2 = {
         "SN135": [0, 0, 0, 0, 0, 0, 1, 1, 1, 1],
         "SN137": [0, 0, 1, 1, 4, 4, 4, 4, 0, 0],
@@ -83,40 +111,80 @@ def test_transform_date_map_for_unavailable_complex(
         "SN139": [0, 4, 4, 1, 1, 3, 3, 3, 0, 0],
     }
 
-    reservation_svc._transform_date_map_for_unavailable(sample_date_map_2)
-    assert expected_transformed_date_map_2 == sample_date_map_2
-
+    grid = _grid_from_date_map(sample_date_map_2)
+    _gray_out_subject_columns(grid)
+    assert expected_transformed_date_map_2 == grid.to_map()
+
+
+def test_grid_fill_for_office_hours():
+    start = datetime(year=2024, month=5, day=1, hour=10, minute=0)
+    grid = RoomSlotGrid(["SN135", "SN137", "SN141"], start, 16)
+    office_hours = {
+        "SN137": [
+            (
+                datetime(year=2024, month=5, day=1, hour=15, minute=0).time(),
+                datetime(year=2024, month=5, day=1, hour=16, minute=0).time(),
+            )
+        ],
+        "SN141": [
+            (
+                datetime(year=2024, month=5, day=1, hour=9, minute=0).time(),
+                datetime(year=2024, month=5, day=1, hour=16, minute=0).time(),
+            )
+        ],
+    }
+    for room_id, hours in office_hours.items():
+        for oh_start, oh_end in hours:
+            grid.fill(room_id, oh_start, oh_end, RoomState.UNAVAILABLE)
+
+    assert grid.to_map() == {
+        "SN135": [0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0],
+        "SN137": [0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 3, 3, 0, 0, 0, 0],
+        "SN141": [3, 3, 3, 3, 3, 3, 3, 3, 3, 3, 3, 3, 0, 0, 0, 0],
+    }
 
-# Failed test but it's not our resonsibility to fix it
-# def test_transform_date_map_for_office_hours(reservation_svc: ReservationService):
-#     date = datetime(year=2024, month=5, day=1)
-#     start = datetime(year=2024, month=5, day=1, hour=10, minute=0)
-#     reserved_date_map = {
-#         'SN135': [0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0],
-#         'SN137': [0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0],
-#         'SN141': [0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0]
-#     }
 
-#     expected_transformed_date_map = {
-#         'SN135': [0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0],
-#         'SN137': [0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 3, 3, 0, 0, 0, 0],
-#         'SN141': [3, 3, 3, 3, 3, 3, 3, 3, 3, 3, 3, 3, 0, 0, 0, 0]
-#     }
+def test_grid_fill_clamps_to_bounds():
+    start = datetime.now().replace(hour=10, minute=0, second=0, microsecond=0)
+    grid = RoomSlotGrid(["SN135"], start, 4)
+    grid.fill(
+        "SN135",
+        start - timedelta(hours=2),
+        start + timedelta(minutes=30),
+        RoomState.RESERVED,
+    )
+    grid.fill(
+        "SN135",
+        start + timedelta(hours=1, minutes=30),
+        start + timedelta(hours=5),
+        RoomState.RESERVED,
+    )
+    grid.fill("SN999", start, start + timedelta(hours=2), RoomState.RESERVED)
+    assert grid.to_map() == {"SN135": [1, 0, 0, 1]}
 
-#     reservation_svc._transform_date_map_for_officehours(date, reserved_date_map, start, 16)
-#     assert reserved_date_map == expected_transformed_date_map
 
+def test_idx_calculation():
+    oh_start = datetime.now().replace(hour=10, minute=0, second=0, microsecond=0)
+    grid = RoomSlotGrid([], oh_start, 16)
 
-def test_idx_calculation(reservation_svc: ReservationService):
     time_1 = datetime.now().replace(hour=10, minute=12)
-    oh_start = datetime.now().replace(hour=10, minute=0)
-    assert reservation_svc._idx_calculation(time_1, oh_start) == 0
+    assert grid.index(time_1) == 0
 
     time_2 = datetime.now().replace(hour=12, minute=30)
-    assert reservation_svc._idx_calculation(time_2, oh_start) == 5
+    assert grid.index(time_2) == 5
 
     time_3 = datetime.now().replace(hour=13, minute=40)
-    assert reservation_svc._idx_calculation(time_3, oh_start) == 7
+    assert grid.index(time_3) == 7
+
+
+def test_idx_calculation_quarter_hour_slots():
+    oh_start = datetime.now().replace(hour=10, minute=0, second=0, microsecond=0)
+    grid = RoomSlotGrid([], oh_start, 32, timedelta(minutes=15))
+    assert grid.index(datetime.now().replace(hour=10, minute=14)) == 0
+    assert grid.index(datetime.now().replace(hour=12, minute=30)) == 10
+    assert (
+        grid.index(datetime(year=2024, month=5, day=1, hour=13, minute=40).time()) == 14
+    )
 
 
 def test_round_idx_calculation(reservation_svc: ReservationService):
@@ -144,16 +212,41 @@ def test_round_idx_calculation_2(reservation_svc: ReservationService):
     assert rounded_down.hour == 10 and rounded_down.minute == 30
 
 
-def test_query_confirmed_reservations_by_date_and_room(
+def test_query_confirmed_reservations_by_date_for_rooms(
+    reservation_svc: ReservationService, time: dict[str, datetime]
+):
+    """Test getting all room reservations for a particular date in a single query."""
+    reservations = reservation_svc._query_confirmed_reservations_by_date_for_rooms(
+        time[NOW] + timedelta(days=2), ["SN135", "SN137"], user_data.user
+    )
+    assert len(reservations) == 1
+    room_id, start, end, is_subject = reservations[0]
+    assert room_id == "SN135"
+    assert start == reservation_data.reservation_6.start
+    assert end == reservation_data.reservation_6.end
+    assert is_subject
+
+
+def test_query_confirmed_reservations_by_date_for_rooms_other_user(
     reservation_svc: ReservationService, time: dict[str, datetime]
 ):
-    """Test getting all reservations for a particular date."""
-    reservations = reservation_svc._query_confirmed_reservations_by_date_and_room(
-        time[NOW] + timedelta(days=2), "SN135"
+    """Reservations held by other users are not flagged as the subject's."""
+    reservations = reservation_svc._query_confirmed_reservations_by_date_for_rooms(
+        time[NOW] + timedelta(days=2), ["SN135"], user_data.root
     )
     assert len(reservations) == 1
-    assert reservations[0].id == 6
-    assert reservations[0].room.id == "SN135"
+    assert reservations[0][3] is False
+
+
+def test_query_confirmed_reservations_by_date_for_rooms_no_rooms(
+    reservation_svc: ReservationService, time: dict[str, datetime]
+):
+    assert (
+        reservation_svc._query_confirmed_reservations_by_date_for_rooms(
+            time[NOW], [], user_data.user
+        )
+        == []
+    )
 
 
 def test_get_reservable_rooms(reservation_svc: ReservationService):
@@ -164,14 +257,29 @@ def test_get_reservable_rooms(reservation_svc: ReservationService):
     assert rooms[3].id == "SN141" and rooms[3].reservable is True
 
 
-def test_query_xl_reservations_by_date_for_user(
+def test_query_confirmed_reservations_by_date_for_rooms_xl(
+    reservation_svc: ReservationService, time: dict[str, datetime]
+):
+    """The subject's own XL reservations are reported under the XL's room ID."""
+    reservations = reservation_svc._query_confirmed_reservations_by_date_for_rooms(
+        time[NOW], [], user_data.user, xl_room_id="SN156"
+    )
+    assert len(reservations) > 0
+    for room_id, start, end, is_subject in reservations:
+        assert room_id == "SN156"
+        assert is_subject
+
+
+def test_query_confirmed_reservations_by_date_for_rooms_xl_other_user(
     reservation_svc: ReservationService, time: dict[str, datetime]
 ):
-    reservations = reservation_svc._query_xl_reservations_by_date_for_user(
-        time[NOW], user_data.user
+    """XL reservations the subject is not party to are excluded."""
+    assert (
+        reservation_svc._query_confirmed_reservations_by_date_for_rooms(
+            time[NOW], [], user_data.instructor, xl_room_id="SN156"
+        )
+        == []
     )
-    assert reservations[0].room is None
-    assert reservations[0].users[0].first_name == "Sally"
 
 
 def test_get_map_reserved_times_by_date(
@@ -205,6 +313,26 @@ def test_get_map_reserved_times_by_date(
     )
 
 
+def test_get_map_reserved_times_by_date_quarter_hour_slots(
+    reservation_svc: ReservationService, time: dict[str, datetime]
+):
+    """Finer slots lay out the same operating hours at a finer granularity."""
+    test_time = time[NOW] + timedelta(days=2)
+    quarter_hour = reservation_svc.get_map_reserved_times_by_date(
+        test_time, user_data.user, timedelta(minutes=15)
+    )
+
+    assert quarter_hour.operating_hours_start.minute % 15 == 0
+    assert quarter_hour.operating_hours_end.minute % 15 == 0
+    assert quarter_hour.number_of_time_slots == (
+        quarter_hour.operating_hours_end - quarter_hour.operating_hours_start
+    ) // timedelta(minutes=15)
+    for states in quarter_hour.reserved_date_map.values():
+        assert len(states) == quarter_hour.number_of_time_slots
+    assert RoomState.SUBJECT_RESERVED in quarter_hour.reserved_date_map["SN135"]
+    assert RoomState.SUBJECT_RESERVED not in quarter_hour.reserved_date_map["SN139"]
+
+
 def test_get_map_reserved_times_by_date_outside_operating_hours(
     reservation_svc: ReservationService, time: dict[str, datetime]
 ):
@@ -242,3 +370,79 @@ def test_get_map_reserved_times_by_date_today_dynamic(
 
     # We only see 6 time slots rather than 8 because operating hours started an hour ago
     assert reservation_details.number_of_time_slots == 6
+
+
+def test_get_map_reserved_times_by_date_constant_queries(
+    reservation_svc: ReservationService, session: Session, time: dict[str, datetime]
+):
+    """The number of queries issued to build the map does not grow with the number of rooms."""
+    test_time = time[NOW] + timedelta(days=2)
+    # Load the operating hours calendar, which is shared by later calls.
+    reservation_svc.get_map_reserved_times_by_date(test_time, user_data.user)
+    with count_queries(session) as baseline:
+        reservation_svc.get_map_reserved_times_by_date(test_time, user_data.user)
+
+    for i in range(25):
+        session.add(
+            RoomEntity(
+                id=f"BENCH{i:03}",
+                building="Sitterson",
+                room=f"{i:03}",
+                nickname=f"Benchmark Room {i}",
+                capacity=4,
+                reservable=True,
+            )
+        )
+    session.commit()
+
+    with count_queries(session) as scaled:
+        reservation_details = reservation_svc.get_map_reserved_times_by_date(
+            test_time, user_data.user
+        )
+
+    assert len(reservation_details.reserved_date_map) == 29
+    assert scaled.count == baseline.count
+
+
+def test_get_map_reserved_times_by_date_range(
+    reservation_svc: ReservationService, time: dict[str, datetime]
+):
+    """Each day of a range matches the map of that day requested on its own."""
+    reservation_maps = reservation_svc.get_map_reserved_times_by_date_range(
+        time[NOW], 4, user_data.user
+    )
+
+    assert len(reservation_maps) == 4
+    for day, reservation_map in enumerate(reservation_maps):
+        assert reservation_map == reservation_svc.get_map_reserved_times_by_date(
+            time[NOW] + timedelta(days=day), user_data.user
+        )
+
+
+def test_get_map_reserved_times_by_date_range_constant_queries(
+    reservation_svc: ReservationService, session: Session, time: dict[str, datetime]
+):
+    """The number of queries issued to build the maps does not grow with the number of days."""
+    # Load the operating hours calendar, which is shared by later calls.
+    reservation_svc.get_map_reserved_times_by_date_range(time[NOW], 1, user_data.user)
+    with count_queries(session) as one_day:
+        reservation_svc.get_map_reserved_times_by_date_range(
+            time[NOW], 1, user_data.user
+        )
+
+    with count_queries(session) as one_week:
+        reservation_maps = reservation_svc.get_map_reserved_times_by_date_range(
+            time[NOW], 7, user_data.user
+        )
+
+    assert len(reservation_maps) == 7
+    assert one_week.count == one_day.count
+
+
+def test_get_map_reserved_times_by_date_range_invalid_days(
+    reservation_svc: ReservationService, time: dict[str, datetime]
+):
+    with pytest.raises(ValueError):
+        reservation_svc.get_map_reserved_times_by_date_range(
+            time[NOW], 0, user_data.user
+        )
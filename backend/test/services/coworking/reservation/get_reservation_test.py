@@ -62,22 +62,22 @@ def test_get_non_existent_reservation(
 
 def test_get_reservation_enforces_permissions(reservation_svc: ReservationService):
     permission_svc = create_autospec(PermissionService)
-    permission_svc.check.return_value = False
+    permission_svc.check_many.return_value = [False, False]
     reservation_svc._permission_svc = permission_svc
     with pytest.raises(UserPermissionException):
         reservation_svc.get_reservation(
             user_data.user, reservation_data.reservation_4.id
         )
-        calls = [
-            call(
-                user_data.user,
-                "coworking.reservation.read",
-                f"user/{reservation_data.reservation_4.users[0].id}",
-            ),
-            call(
-                user_data.user,
-                "coworking.reservation.read",
-                f"user/{reservation_data.reservation_4.users[1].id}",
-            ),
-        ]
-        permission_svc.check.assert_has_calls(calls)
+    permission_svc.check_many.assert_called_once_with(
+        user_data.user,
+        "coworking.reservation.read",
+        [f"user/{user.id}" for user in reservation_data.reservation_4.users],
+    )
+
+
+def test_get_reservation_with_read_permission(reservation_svc: ReservationService):
+    """Ambassadors may read reservations they are not party to."""
+    reservation = reservation_svc.get_reservation(
+        user_data.ambassador, reservation_data.reservation_1.id
+    )
+    assert reservation.id == reservation_data.reservation_1.id
@@ -1,10 +1,22 @@
 """Tests for ReservationService#get_map_reservations_for_date and helper functions."""
 
+import pytest
 from backend.models.coworking.availability import RoomState
 from backend.models.coworking.reservation import ReservationState
 from datetime import date
+from sqlalchemy import delete, select, update
+from sqlalchemy.orm import Session
 
+from .....models.coworking import (
+    ReservationPartial,
+    ReservationRequest,
+    TimeRange,
+)
+from .....models.room import RoomPartial
+from .....entities import UserEntity
+from .....entities.coworking import ReservationEntity, RoomReservationUsageEntity
 from .....services.coworking import ReservationService
+from .....services.coworking.reservation import ReservationException
 
 # Imported fixtures provide dependencies injected for the tests as parameters.
 # Dependent fixtures (seat_svc) are required to be imported in the testing module.
@@ -39,16 +51,223 @@ __authors__ = [
 __copyright__ = "Copyright 2024"
 __license__ = "MIT"
 
+
 def test_get_total_time_user_reservations_student(reservation_svc: ReservationService):
     hours = reservation_svc.get_total_time_user_reservations(user_data.user)
     assert hours == "4.5"
 
 
-def test_get_total_time_user_reservations_ambassador(reservation_svc: ReservationService):
+def test_get_total_time_user_reservations_ambassador(
+    reservation_svc: ReservationService,
+):
     hours = reservation_svc.get_total_time_user_reservations(user_data.ambassador)
     assert hours == "6"
 
 
 def test_get_total_time_user_reservations_root(reservation_svc: ReservationService):
     hours = reservation_svc.get_total_time_user_reservations(user_data.root)
-    assert hours == "6"
\ No newline at end of file
+    assert hours == "6"
+
+
+def test_get_total_time_user_reservations_reads_ledger(
+    session: Session, reservation_svc: ReservationService
+):
+    session.execute(delete(RoomReservationUsageEntity))
+    assert reservation_svc.get_total_time_user_reservations(user_data.user) == "6"
+    assert reservation_svc.reconcile_room_reservation_usage() == 2
+    assert reservation_svc.get_total_time_user_reservations(user_data.user) == "4.5"
+
+
+def _ledger(session: Session) -> set[tuple]:
+    return set(
+        session.execute(
+            select(
+                RoomReservationUsageEntity.user_id,
+                RoomReservationUsageEntity.day,
+                RoomReservationUsageEntity.duration,
+            ).where(RoomReservationUsageEntity.duration > timedelta())
+        ).all()
+    )
+
+
+def test_room_reservation_usage_matches_reconciliation(
+    session: Session, reservation_svc: ReservationService, time: dict[str, datetime]
+):
+    draft = reservation_svc.draft_reservation(
+        user_data.user,
+        ReservationRequest(
+            start=time[NOW] + timedelta(days=3),
+            end=time[NOW] + timedelta(days=3) + ONE_HOUR,
+            users=[user_data.user],
+            seats=[],
+            room=RoomPartial(id="SN139"),
+        ),
+    )
+    reservation_svc.change_reservation(
+        user_data.user,
+        ReservationPartial(id=draft.id, state=ReservationState.CONFIRMED),
+    )
+    reservation_svc.change_reservation(
+        user_data.user,
+        ReservationPartial(
+            id=reservation_data.reservation_6.id, state=ReservationState.CANCELLED
+        ),
+    )
+    reservation_svc.sweep_state_transitions()
+    session.delete(session.get(ReservationEntity, draft.id))
+    session.commit()
+    maintained = _ledger(session)
+
+    reservation_svc.reconcile_room_reservation_usage()
+    assert _ledger(session) == maintained
+
+
+def test_get_total_time_user_reservations_after_draft(
+    reservation_svc: ReservationService, time: dict[str, datetime]
+):
+    assert reservation_svc.get_total_time_user_reservations(user_data.user) == "4.5"
+    reservation_svc.draft_reservation(
+        user_data.user,
+        ReservationRequest(
+            start=time[NOW] + timedelta(days=3),
+            end=time[NOW] + timedelta(days=3) + ONE_HOUR,
+            users=[user_data.user],
+            seats=[],
+            room=RoomPartial(id="SN139"),
+        ),
+    )
+    assert reservation_svc.get_total_time_user_reservations(user_data.user) == "3.5"
+
+
+def test_get_total_time_user_reservations_after_cancel(
+    reservation_svc: ReservationService,
+):
+    assert reservation_svc.get_total_time_user_reservations(user_data.root) == "6"
+    assert reservation_svc.get_total_time_user_reservations(user_data.user) == "4.5"
+    reservation_svc.change_reservation(
+        user_data.user,
+        ReservationPartial(
+            id=reservation_data.reservation_6.id, state=ReservationState.CANCELLED
+        ),
+    )
+    assert reservation_svc.get_total_time_user_reservations(user_data.user) == "6"
+    assert reservation_svc.get_total_time_user_reservations(user_data.root) == "6"
+
+
+def test_check_user_reservation_duration(
+    reservation_svc: ReservationService, time: dict[str, datetime]
+):
+    within_limit = TimeRange(
+        start=time[NOW], end=time[NOW] + timedelta(hours=4, minutes=30)
+    )
+    assert reservation_svc._check_user_reservation_duration(
+        user_data.user, within_limit
+    )
+    over_limit = TimeRange(start=time[NOW], end=time[NOW] + timedelta(hours=5))
+    assert not reservation_svc._check_user_reservation_duration(
+        user_data.user, over_limit
+    )
+
+
+def test_check_user_reservation_duration_excludes_expired_drafts(
+    session: Session, reservation_svc: ReservationService, time: dict[str, datetime]
+):
+    draft = reservation_svc.draft_reservation(
+        user_data.user,
+        ReservationRequest(
+            start=time[NOW] + timedelta(days=3),
+            end=time[NOW] + timedelta(days=3) + ONE_HOUR,
+            users=[user_data.user],
+            seats=[],
+            room=RoomPartial(id="SN139"),
+        ),
+    )
+    session.execute(
+        update(ReservationEntity)
+        .where(ReservationEntity.id == draft.id)
+        .values(created_at=time[AN_HOUR_AGO])
+    )
+    session.commit()
+
+    within_limit = TimeRange(
+        start=time[NOW], end=time[NOW] + timedelta(hours=4, minutes=30)
+    )
+    assert reservation_svc._check_user_reservation_duration(
+        user_data.user, within_limit
+    )
+    expired = session.get(ReservationEntity, draft.id, populate_existing=True)
+    assert expired.state == ReservationState.DRAFT
+
+
+def test_draft_reservation_persists_expired_drafts(
+    session: Session, reservation_svc: ReservationService, time: dict[str, datetime]
+):
+    expired = ReservationEntity(
+        state=ReservationState.DRAFT,
+        start=time[NOW] + timedelta(days=3),
+        end=time[NOW] + timedelta(days=3) + ONE_HOUR,
+        walkin=False,
+        room_id="SN139",
+        users=[session.get(UserEntity, user_data.user.id)],
+        seats=[],
+        created_at=time[AN_HOUR_AGO],
+    )
+    session.add(expired)
+    session.commit()
+
+    with pytest.raises(ReservationException):
+        reservation_svc.draft_reservation(
+            user_data.user,
+            ReservationRequest(
+                start=reservation_data.reservation_6.start,
+                end=reservation_data.reservation_6.end,
+                users=[user_data.user],
+                seats=[],
+                room=RoomPartial(id="SN139"),
+            ),
+        )
+    session.rollback()
+    session.refresh(expired)
+    assert expired.state == ReservationState.DRAFT
+
+    reservation_svc.draft_reservation(
+        user_data.user,
+        ReservationRequest(
+            start=time[NOW] + timedelta(days=4),
+            end=time[NOW] + timedelta(days=4) + ONE_HOUR,
+            users=[user_data.user],
+            seats=[],
+            room=RoomPartial(id="SN139"),
+        ),
+    )
+    session.refresh(expired)
+    assert expired.state == ReservationState.CANCELLED
+
+
+def test_get_total_time_user_reservations_window_bounds(
+    session: Session, reservation_svc: ReservationService, time: dict[str, datetime]
+):
+    """Only reservations overlapping the time from a day ago to the end of the reservation
+    window count, even those starting on the window's first or last day."""
+    window_start = time[NOW] - ONE_DAY
+    window_end = time[NOW] + timedelta(weeks=1)
+    for start, end in [
+        (window_start - 2 * ONE_HOUR, window_start - ONE_HOUR),
+        (window_start - ONE_HOUR, window_start + THIRTY_MINUTES),
+        (window_end + ONE_MINUTE, window_end + ONE_HOUR),
+    ]:
+        session.add(
+            ReservationEntity(
+                state=ReservationState.DRAFT,
+                start=start,
+                end=end,
+                walkin=False,
+                room_id="SN139",
+                users=[session.get(UserEntity, user_data.user.id)],
+                seats=[],
+                created_at=time[NOW],
+            )
+        )
+    session.commit()
+
+    assert reservation_svc.get_total_time_user_reservations(user_data.user) == "3"
@@ -1,5 +1,7 @@
 """ReservationService#seat_availability tests"""
 
+from sqlalchemy.orm import Session
+
 from .....services.coworking import ReservationService, PolicyService
 from .....models.coworking import (
     TimeRange,
@@ -15,6 +17,7 @@ from ..fixtures import (
     operating_hours_svc,
 )
 from ..time import *
+from ...query_counter import count_queries
 
 # Import the setup_teardown fixture explicitly to load entities in database.
 # The order in which these fixtures run is dependent on their imported alias.
@@ -145,3 +148,76 @@ def test_seat_availability_xl_closing_soon(
     )
     available_seats = reservation_svc.seat_availability(seat_data.seats, near_closing)
     assert len(available_seats) == 0
+
+
+def test_best_seat_availability_matches_seat_availability(
+    reservation_svc: ReservationService, time: dict[str, datetime]
+):
+    """The best seat of each window is ordered like the first seat of seat_availability."""
+    windows = [
+        TimeRange(start=time[NOW], end=time[IN_THIRTY_MINUTES]),
+        TimeRange(start=time[IN_ONE_HOUR], end=time[IN_TWO_HOURS]),
+        TimeRange(start=time[NOW] + ONE_DAY, end=time[NOW] + ONE_DAY + ONE_HOUR),
+    ]
+    best_seats = reservation_svc.best_seat_availability(seat_data.seats, windows)
+
+    assert len(best_seats) == len(windows)
+    for window, best_seat in zip(windows, best_seats):
+        expected = reservation_svc.seat_availability(
+            seat_data.seats, window.model_copy()
+        )[0]
+        assert best_seat is not None
+        # Windows starting in the past are bounded by the current time of each call.
+        best, first = best_seat.availability[0], expected.availability[0]
+        assert abs(best.start - first.start) < TIME_EPSILON
+        assert best.end == first.end
+        assert best_seat.reservable == expected.reservable
+
+
+def test_best_seat_availability_unavailable_windows(
+    reservation_svc: ReservationService, time: dict[str, datetime]
+):
+    """Windows in the past, while closed, or too short have no best seat."""
+    windows = [
+        TimeRange(start=time[THIRTY_MINUTES_AGO], end=time[NOW]),
+        TimeRange(
+            start=operating_hours_data.today.end,
+            end=operating_hours_data.today.end + ONE_HOUR,
+        ),
+        TimeRange(start=time[NOW], end=time[NOW] + ONE_MINUTE),
+        TimeRange(start=time[NOW], end=time[IN_THIRTY_MINUTES]),
+    ]
+    best_seats = reservation_svc.best_seat_availability(seat_data.seats, windows)
+    assert best_seats[:3] == [None, None, None]
+    assert best_seats[3] is not None
+
+
+def test_best_seat_availability_excludes_reserved_seats(
+    reservation_svc: ReservationService,
+):
+    """A seat reserved throughout a window is never the best seat of that window."""
+    reservation = reservation_data.reservation_1
+    reserved_seat = reservation.seats[0]
+    window = TimeRange(start=reservation.start, end=reservation.end)
+    best_seats = reservation_svc.best_seat_availability([reserved_seat], [window])
+    assert best_seats == [None]
+
+
+def test_best_seat_availability_single_query_per_resource(
+    reservation_svc: ReservationService, session: Session, time: dict[str, datetime]
+):
+    """The number of queries does not grow with the number of windows."""
+    windows = [
+        TimeRange(
+            start=time[NOW] + i * THIRTY_MINUTES,
+            end=time[NOW] + (i + 1) * THIRTY_MINUTES,
+        )
+        for i in range(12)
+    ]
+    # Load the operating hours calendar, which is shared by later calls.
+    reservation_svc.best_seat_availability(seat_data.seats, windows[:1])
+    with count_queries(session) as one_window:
+        reservation_svc.best_seat_availability(seat_data.seats, windows[:1])
+    with count_queries(session) as many_windows:
+        reservation_svc.best_seat_availability(seat_data.seats, windows)
+    assert many_windows.count == one_window.count
@@ -1,4 +1,4 @@
-"""ReservationService#_state_transition tests"""
+"""ReservationService#sweep_state_transitions and time-based read filtering tests"""
 
 import pytest
 from unittest.mock import create_autospec
@@ -50,105 +50,137 @@ __copyright__ = "Copyright 2023"
 __license__ = "MIT"
 
 
-def test_state_transition_reservation_entities_by_time_noop(
-    session: Session, reservation_svc: ReservationService, time: dict[str, datetime]
+def _state(session: Session, reservation: Reservation) -> ReservationState:
+    return session.get(ReservationEntity, reservation.id, populate_existing=True).state
+
+
+def test_sweep_state_transitions_noop(
+    session: Session, reservation_svc: ReservationService
 ):
-    entities: list[ReservationEntity] = [
-        session.get(ReservationEntity, reservation.id)
-        for reservation in reservation_data.active_reservations
-    ]
-    collected = reservation_svc._state_transition_reservation_entities_by_time(
-        time[NOW], entities
-    )
-    assert collected is not entities
-    assert collected == entities
+    cutoff = reservation_data.reservation_7.start
+    assert reservation_svc.sweep_state_transitions(cutoff) == 0
+    for reservation in reservation_data.reservations:
+        assert _state(session, reservation) == reservation.state
 
 
-def test_state_transition_reservation_entities_by_time_expired_active(
+def test_sweep_state_transitions_expired_active(
     session: Session, reservation_svc: ReservationService
 ):
-    entities: list[ReservationEntity] = [
-        session.get(ReservationEntity, reservation.id)
-        for reservation in reservation_data.active_reservations
-    ]
-    cutoff = entities[0].end
-    collected = reservation_svc._state_transition_reservation_entities_by_time(
-        cutoff, entities
+    cutoff = reservation_data.reservation_1.end
+    assert reservation_svc.sweep_state_transitions(cutoff) >= 1
+    assert (
+        _state(session, reservation_data.reservation_1) == ReservationState.CHECKED_OUT
     )
 
-    assert len(collected) == len(entities) - 1
-    reservation = session.get(ReservationEntity, entities[0].id, populate_existing=True)
-    assert reservation.state == ReservationState.CHECKED_OUT
-
 
-def test_state_transition_reservation_entities_by_time_active_draft(
+def test_sweep_state_transitions_active_draft(
     session: Session, reservation_svc: ReservationService, policy_svc: PolicyService
 ):
-    entities: list[ReservationEntity] = [
-        session.get(ReservationEntity, reservation.id)
-        for reservation in reservation_data.draft_reservations
-    ]
-    cutoff = entities[0].created_at + policy_svc.reservation_draft_timeout()
-    collected = reservation_svc._state_transition_reservation_entities_by_time(
-        cutoff, entities
-    )
-    assert len(collected) == len(entities)
-    assert collected[0].state == ReservationState.DRAFT
+    draft = reservation_data.reservation_5
+    entity = session.get(ReservationEntity, draft.id)
+    cutoff = entity.created_at + policy_svc.reservation_draft_timeout()
+    reservation_svc.sweep_state_transitions(cutoff)
+    assert _state(session, draft) == ReservationState.DRAFT
 
 
-def test_state_transition_reservation_entities_by_time_expired_draft(
+def test_sweep_state_transitions_expired_draft(
     session: Session, reservation_svc: ReservationService, policy_svc: PolicyService
 ):
     policy_mock = create_autospec(PolicyService)
     policy_mock.reservation_draft_timeout.return_value = (
         policy_svc.reservation_draft_timeout()
     )
+    policy_mock.reservation_checkin_timeout.return_value = (
+        policy_svc.reservation_checkin_timeout()
+    )
     reservation_svc._policy_svc = policy_mock
 
-    entities: list[ReservationEntity] = [
-        session.get(ReservationEntity, reservation.id)
-        for reservation in reservation_data.draft_reservations
-    ]
+    draft = reservation_data.reservation_5
+    entity = session.get(ReservationEntity, draft.id)
     cutoff = (
-        entities[0].created_at
+        entity.created_at
         + policy_svc.reservation_draft_timeout()
         + timedelta(seconds=1)
     )
-    collected = reservation_svc._state_transition_reservation_entities_by_time(
-        cutoff, entities
-    )
-    assert len(collected) == len(entities) - 1
-
-    reservation = session.get(ReservationEntity, entities[0].id, populate_existing=True)
-    assert reservation.state == ReservationState.CANCELLED
+    reservation_svc.sweep_state_transitions(cutoff)
+    assert _state(session, draft) == ReservationState.CANCELLED
 
     policy_mock.reservation_draft_timeout.assert_called_once()
 
 
-def test_state_transition_reservation_entities_by_time_checkin_timeout(
+def test_sweep_state_transitions_checkin_timeout(
     session: Session, reservation_svc: ReservationService, policy_svc: PolicyService
 ):
     policy_mock = create_autospec(PolicyService)
+    policy_mock.reservation_draft_timeout.return_value = (
+        policy_svc.reservation_draft_timeout()
+    )
     policy_mock.reservation_checkin_timeout.return_value = (
         policy_svc.reservation_checkin_timeout()
     )
     reservation_svc._policy_svc = policy_mock
 
-    entities: list[ReservationEntity] = [
-        session.get(ReservationEntity, reservation.id)
-        for reservation in reservation_data.confirmed_reservations
-    ]
+    confirmed = reservation_data.reservation_4
     cutoff = (
-        entities[0].start
+        confirmed.start
         + policy_svc.reservation_checkin_timeout()
         + timedelta(seconds=1)
     )
-    collected = reservation_svc._state_transition_reservation_entities_by_time(
-        cutoff, entities
+    reservation_svc.sweep_state_transitions(cutoff)
+    assert _state(session, confirmed) == ReservationState.CANCELLED
+
+    policy_mock.reservation_checkin_timeout.assert_called_once()
+
+
+def test_sweep_state_transitions_checkin_timeout_boundary(
+    session: Session, reservation_svc: ReservationService, policy_svc: PolicyService
+):
+    confirmed = reservation_data.reservation_4
+    cutoff = confirmed.start + policy_svc.reservation_checkin_timeout()
+    reservation_svc.sweep_state_transitions(cutoff)
+    assert _state(session, confirmed) == ReservationState.CONFIRMED
+
+
+def test_sweep_state_transitions_ignores_final_states(
+    session: Session, reservation_svc: ReservationService
+):
+    reservation_svc.sweep_state_transitions(
+        reservation_data.reservation_6.end + ONE_DAY
+    )
+    assert (
+        _state(session, reservation_data.reservation_2) == ReservationState.CHECKED_OUT
     )
-    assert len(collected) == len(entities) - 1
+    assert _state(session, reservation_data.reservation_3) == ReservationState.CANCELLED
 
-    reservation = session.get(ReservationEntity, entities[0].id, populate_existing=True)
-    assert reservation.state == ReservationState.CANCELLED
 
-    policy_mock.reservation_checkin_timeout.assert_called_once()
+def test_reads_filter_expired_without_writing(
+    session: Session, reservation_svc: ReservationService
+):
+    """Reads exclude reservations past their check-in timeout but leave persisting to the sweeper."""
+    # reservation_7 is a room reservation confirmed for an hour ago that was never checked in.
+    reservations = reservation_svc.get_current_reservations_for_user(
+        user_data.root, user_data.root
+    )
+    assert reservation_data.reservation_7.id not in [
+        reservation.id for reservation in reservations
+    ]
+    assert len(session.dirty) == 0
+    assert _state(session, reservation_data.reservation_7) == ReservationState.CONFIRMED
+
+    reservation_svc.sweep_state_transitions()
+    assert _state(session, reservation_data.reservation_7) == ReservationState.CANCELLED
+
+
+def test_get_seat_reservations_filters_expired(
+    reservation_svc: ReservationService,
+):
+    """Checked in reservations are excluded once they end, even before being swept."""
+    reservation_svc._policy_svc = create_autospec(PolicyService)
+    reservation_svc._policy_svc.reservation_draft_timeout.return_value = ONE_DAY
+    reservation_svc._policy_svc.reservation_checkin_timeout.return_value = ONE_DAY
+    reservation_1 = reservation_data.reservation_1
+    reservations = reservation_svc.get_seat_reservations(
+        reservation_1.seats,
+        TimeRange(start=reservation_1.start, end=reservation_1.end),
+    )
+    assert [reservation.id for reservation in reservations] == [reservation_1.id]
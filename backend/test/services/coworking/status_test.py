@@ -2,6 +2,7 @@
 
 from .fixtures import status_svc
 from ....services.coworking.status import StatusService
+from ....services.coworking.cache import xl_status_snapshot
 from ....models.coworking.availability import SeatAvailability
 from datetime import timedelta
 
@@ -18,9 +19,8 @@ from .seat_data import fake_data_fixture as insert_order_3
 from .reservation.reservation_data import fake_data_fixture as insert_order_4
 
 
-def test_status_dispatch(status_svc: StatusService):
-    # Hard-wire mock responses to all dispatched methods
-    # We test these methods elsewhere
+def _mock_dispatch(status_svc: StatusService) -> list[SeatAvailability]:
+    """Hard-wire mock responses to all dispatched methods."""
     status_svc._reservation_svc.get_current_reservations_for_user.return_value = [
         reservation_data.reservation_1
     ]
@@ -44,6 +44,13 @@ def test_status_dispatch(status_svc: StatusService):
         )
     ]
     status_svc._reservation_svc.seat_availability.return_value = seat_availability
+    return seat_availability
+
+
+def test_status_dispatch(status_svc: StatusService):
+    # Hard-wire mock responses to all dispatched methods
+    # We test these methods elsewhere
+    seat_availability = _mock_dispatch(status_svc)
 
     # Call the method
     status = status_svc.get_coworking_status(user_data.root)
@@ -59,3 +66,71 @@ def test_status_dispatch(status_svc: StatusService):
     assert status.my_reservations == [reservation_data.reservation_1]
     assert status.seat_availability == seat_availability
     assert status.operating_hours == [operating_hours_data.today]
+
+
+def test_status_snapshot_shared_between_users(status_svc: StatusService):
+    """Subsequent status requests only look up the subject's reservations."""
+    seat_availability = _mock_dispatch(status_svc)
+
+    status_svc.get_coworking_status(user_data.root)
+    status = status_svc.get_coworking_status(user_data.user)
+
+    status_svc._reservation_svc.seat_availability.assert_called_once()
+    status_svc._operating_hours_svc.schedule.assert_called_once()
+    status_svc._reservation_svc.get_current_reservations_for_user.assert_called_with(
+        user_data.user, user_data.user
+    )
+    assert status.seat_availability == seat_availability
+
+    stats = xl_status_snapshot.stats()
+    assert stats.hits == 1
+    assert stats.misses == 1
+
+
+def test_status_snapshot_keyed_by_policies(status_svc: StatusService):
+    """Users given different policies do not share a snapshot."""
+    _mock_dispatch(status_svc)
+    reservation_windows = {
+        user_data.root.id: timedelta(weeks=2),
+        user_data.user.id: timedelta(weeks=1),
+    }
+    status_svc._policies_svc.reservation_window.side_effect = (
+        lambda subject: reservation_windows[subject.id]
+    )
+    status_svc._operating_hours_svc.schedule.side_effect = (
+        lambda time_range: [operating_hours_data.today]
+        * (time_range.end - time_range.start).days
+    )
+
+    root_status = status_svc.get_coworking_status(user_data.root)
+    user_status = status_svc.get_coworking_status(user_data.user)
+    status_svc.get_coworking_status(user_data.user)
+
+    assert status_svc._operating_hours_svc.schedule.call_count == 2
+    assert len(root_status.operating_hours) == 14
+    assert len(user_status.operating_hours) == 7
+    assert xl_status_snapshot.stats().hits == 1
+
+
+def test_status_snapshot_invalidated(status_svc: StatusService):
+    _mock_dispatch(status_svc)
+
+    status_svc.get_coworking_status(user_data.root)
+    xl_status_snapshot.invalidate()
+    status_svc.get_coworking_status(user_data.root)
+
+    assert status_svc._reservation_svc.seat_availability.call_count == 2
+    assert xl_status_snapshot.stats().invalidations == 1
+
+
+def test_get_cache_stats(status_svc: StatusService):
+    _mock_dispatch(status_svc)
+    status_svc.get_coworking_status(user_data.root)
+
+    stats = status_svc.get_cache_stats(user_data.root)
+
+    status_svc._permission_svc.enforce.assert_called_once_with(
+        user_data.root, "coworking.status.cache", "coworking/status"
+    )
+    assert stats.misses == 1
+    assert stats.size == 1
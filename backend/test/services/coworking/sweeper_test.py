@@ -0,0 +1,58 @@
+"""Tests for the background ReservationSweeper."""
+
+from sqlalchemy import delete, select
+from sqlalchemy.orm import Session
+
+from ....entities.coworking import ReservationEntity, RoomReservationUsageEntity
+from ....models.coworking import ReservationState
+from ....services.coworking.sweeper import ReservationSweeper
+
+# Since there are relationship dependencies between the entities, order matters.
+from .time import *
+from ..core_data import setup_insert_data_fixture as insert_order_0
+from .operating_hours_data import fake_data_fixture as insert_order_1
+from ..room_data import fake_data_fixture as insert_order_2
+from .seat_data import fake_data_fixture as insert_order_3
+from .reservation.reservation_data import fake_data_fixture as insert_order_4
+
+from .reservation import reservation_data
+from ..core_data import user_data
+
+__authors__ = ["Kris Jordan"]
+__copyright__ = "Copyright 2024"
+__license__ = "MIT"
+
+
+def test_sweep(session: Session):
+    """reservation_7 is confirmed for an hour ago and was never checked in."""
+    sweeper = ReservationSweeper(session.get_bind())
+    assert sweeper.sweep() == 1
+
+    reservation = session.get(
+        ReservationEntity, reservation_data.reservation_7.id, populate_existing=True
+    )
+    assert reservation.state == ReservationState.CANCELLED
+
+
+def test_start_stop(session: Session):
+    sweeper = ReservationSweeper(session.get_bind(), interval=timedelta(seconds=60))
+    sweeper.start()
+    sweeper.stop()
+
+    reservation = session.get(
+        ReservationEntity, reservation_data.reservation_7.id, populate_existing=True
+    )
+    assert reservation.state == ReservationState.CANCELLED
+
+
+def test_reconcile(session: Session):
+    """reservation_6 and reservation_7 are room reservations counting against the limit."""
+    session.execute(delete(RoomReservationUsageEntity))
+    session.commit()
+
+    sweeper = ReservationSweeper(session.get_bind())
+    assert sweeper.reconcile() == 2
+    assert set(session.scalars(select(RoomReservationUsageEntity.user_id))) == {
+        user_data.user.id,
+        user_data.root.id,
+    }
@@ -3,10 +3,13 @@
 # PyTest
 import pytest
 from unittest.mock import create_autospec
+from sqlalchemy import Engine, select
+from sqlalchemy.orm import Session
 from backend.models.pagination import PaginationParams
 
 from backend.services.exceptions import (
     EventRegistrationException,
+    InvalidCursorException,
     UserPermissionException,
     ResourceNotFoundException,
 )
@@ -17,8 +20,17 @@ from ....models.coworking.time_range import TimeRange
 from ..coworking.time import *
 
 # Tested Dependencies
-from ....models import EventDraft, EventOverview, EventPaginationParams
-from ....services import EventService
+from ....entities import EventEntity, EventRegistrationEntity, UserEntity
+from ....models import (
+    EventDraft,
+    EventOverview,
+    EventPaginationParams,
+    EventCursorPaginationParams,
+    PublicUser,
+    RegistrationType,
+)
+from ....services import EventService, PermissionService
+from ....services.event import EXPORT_BATCH_SIZE
 
 # Injected Service Fixtures
 from ..fixtures import (
@@ -48,6 +60,7 @@ from ..user_data import root, ambassador, user
 from ..organization import organization_test_data
 
 from .event_demo_data import date_maker
+from ..query_counter import count_queries
 
 # Test Functions
 
@@ -90,6 +103,112 @@ def test_list_filter(event_svc_integration: EventService):
     assert len(fetched_events.items) == 1
 
 
+def test_list_filter_by_organization(event_svc_integration: EventService):
+    """Test that events can be filtered by the slug of their organization."""
+    all_events = event_svc_integration.get_paginated_events(
+        EventPaginationParams(), ambassador
+    )
+    fetched_events = event_svc_integration.get_paginated_events(
+        EventPaginationParams(filter="CSSG"), ambassador
+    )
+    assert len(fetched_events.items) == len(all_events.items) > 0
+    for event in fetched_events.items:
+        assert event.organization_slug == organization_test_data.cssg.slug
+
+    pagination_params = EventPaginationParams(filter="not an organization")
+    fetched_events = event_svc_integration.get_paginated_events(
+        pagination_params, ambassador
+    )
+    assert len(fetched_events.items) == 0
+
+
+def _insert_registered_events(session: Session, count: int) -> None:
+    """Inserts events with an organizer and several attendees each."""
+    for i in range(count):
+        entity = EventEntity.from_draft_model(event_one, organization_test_data.cssg.id)
+        entity.name = f"Registered Event {i}"
+        session.add(entity)
+        session.flush()
+        for registered, registration_type in [
+            (root, RegistrationType.ORGANIZER),
+            (ambassador, RegistrationType.ATTENDEE),
+            (user, RegistrationType.ATTENDEE),
+        ]:
+            session.add(
+                EventRegistrationEntity(
+                    event_id=entity.id,
+                    user_id=registered.id,
+                    registration_type=registration_type,
+                )
+            )
+    session.flush()
+    session.execute(EventRegistrationEntity.recount_registrations())
+    session.commit()
+
+
+def test_list_query_count_is_constant(
+    session: Session, event_svc_integration: EventService
+):
+    """Test that listing events issues the same number of queries regardless of page size."""
+    _insert_registered_events(session, 30)
+    query_counts = []
+    for page_size in [5, 30]:
+        session.expire_all()
+        with count_queries(session) as counter:
+            page = event_svc_integration.get_paginated_events(
+                EventPaginationParams(order_by="id", page_size=page_size), ambassador
+            )
+        assert len(page.items) == page_size
+        query_counts.append(counter.count)
+    assert query_counts[0] == query_counts[1] <= 5
+
+
+def test_list_summarizes_registrations(
+    session: Session, event_svc_integration: EventService
+):
+    """Test that listed events summarize registrations as individually loaded events do."""
+    _insert_registered_events(session, 3)
+    page = event_svc_integration.get_paginated_events(
+        EventPaginationParams(order_by="id", page_size=10), ambassador
+    )
+    entities = session.scalars(select(EventEntity).order_by(EventEntity.id)).all()
+    assert page.items == [entity.to_overview_model(ambassador) for entity in entities]
+    assert page.items[-1].number_registered == 2
+    assert [organizer.id for organizer in page.items[-1].organizers] == [root.id]
+    assert page.items[-1].user_registration_type == RegistrationType.ATTENDEE
+
+
+def test_get_events_by_cursor(session: Session, event_svc_integration: EventService):
+    """Test that paging through events by cursor visits each event once in order."""
+    _insert_registered_events(session, 7)
+    expected = session.scalars(
+        select(EventEntity).order_by(EventEntity.start.desc(), EventEntity.id.desc())
+    ).all()
+
+    names = []
+    params = EventCursorPaginationParams(
+        order_by="start", ascending="false", page_size=4
+    )
+    while True:
+        page = event_svc_integration.get_events_by_cursor(params, ambassador)
+        names += [event.name for event in page.items]
+        if page.next_cursor is None:
+            break
+        params = params.model_copy(update={"cursor": page.next_cursor})
+
+    assert names == [entity.name for entity in expected]
+
+
+def test_get_events_by_cursor_rejects_unsortable_order_by(
+    event_svc_integration: EventService,
+):
+    for order_by in ["nonexistent", "organization", "to_model"]:
+        with pytest.raises(InvalidCursorException):
+            event_svc_integration.get_events_by_cursor(
+                EventCursorPaginationParams(order_by=order_by), ambassador
+            )
+
+
 def test_create_enforces_permission(event_svc_integration: EventService):
     """Test that the service enforces permissions when attempting to create an event."""
 
@@ -534,3 +653,203 @@ def test_get_event_status(event_svc_integration: EventService):
     assert status is not None
     assert status.featured is not None
     assert len(status.registered) == 1
+
+
+def test_get_event_status_unauthenticated_is_cached(
+    session: Session, event_svc_integration: EventService
+):
+    """Test that the featured event is served from the cache after it is selected."""
+    status = event_svc_integration.get_event_status_unauthenticated()
+    with count_queries(session) as counter:
+        assert event_svc_integration.get_event_status_unauthenticated() == status
+    assert counter.count == 0
+    assert status.featured is not None
+    assert status.featured.user_registration_type is None
+
+
+def test_get_event_status_featured_registration(event_svc_integration: EventService):
+    """Test that the cached featured event reflects the subject's registration for it."""
+    event_svc_integration.get_event_status_unauthenticated()
+    status = event_svc_integration.get_event_status(user)
+    assert status.featured is not None
+    featured = event_svc_integration.get_by_id(status.featured.id, user)
+    assert status.featured == featured
+    assert status.featured.user_registration_type is not None
+
+
+def test_get_event_status_query_count_is_constant(
+    session: Session, event_svc_integration: EventService
+):
+    """Test that the registered events are loaded with the same queries however many there are."""
+    event_svc_integration.get_event_status(user)
+    _insert_registered_events(session, 1)
+    session.expire_all()
+    with count_queries(session) as counter:
+        few = event_svc_integration.get_event_status(user)
+    _insert_registered_events(session, 10)
+    session.expire_all()
+    with count_queries(session) as more_counter:
+        many = event_svc_integration.get_event_status(user)
+    assert len(many.registered) == len(few.registered) + 10
+    assert counter.count == more_counter.count
+
+
+def test_create_invalidates_featured_event(event_svc_integration: EventService):
+    """Test that a newly created upcoming event can be featured immediately."""
+    event_svc_integration.get_event_status_unauthenticated()
+    soonest = to_add.model_copy(
+        update={
+            "start": datetime.now() + timedelta(minutes=5),
+            "end": datetime.now() + timedelta(minutes=65),
+        }
+    )
+    created_event = event_svc_integration.create(root, soonest)
+    status = event_svc_integration.get_event_status_unauthenticated()
+    assert status.featured is not None
+    assert status.featured.id == created_event.id
+
+
+def test_delete_invalidates_featured_event(event_svc_integration: EventService):
+    """Test that a deleted event is no longer featured."""
+    featured = event_svc_integration.get_event_status_unauthenticated().featured
+    assert featured is not None
+    event_svc_integration.delete(root, featured.id)
+    status = event_svc_integration.get_event_status_unauthenticated()
+    assert status.featured is None or status.featured.id != featured.id
+
+
+def test_register_counts_registration(event_svc_integration: EventService):
+    """Test that registering and unregistering maintain the event's registration count."""
+    event_details = event_svc_integration.get_by_id(event_one.id, root)
+    event_svc_integration.register(root, root, event_details)
+    registered = event_svc_integration.get_by_id(event_one.id, root)
+    assert registered.number_registered == event_details.number_registered + 1
+
+    event_svc_integration.unregister(root, root, registered)
+    unregistered = event_svc_integration.get_by_id(event_one.id, root)
+    assert unregistered.number_registered == event_details.number_registered
+
+
+def test_register_twice_counts_registration_once(event_svc_integration: EventService):
+    """Test that an idempotent second registration does not count again."""
+    event_details = event_svc_integration.get_by_id(event_one.id, root)
+    event_svc_integration.register(root, root, event_details)
+    event_svc_integration.register(root, root, event_details)
+    registered = event_svc_integration.get_by_id(event_one.id, root)
+    assert registered.number_registered == event_details.number_registered + 1
+
+
+def test_update_organizer_uncounts_attendee(event_svc_integration: EventService):
+    """Test that an attendee made an organizer no longer counts as registered."""
+    event_details = event_svc_integration.get_by_id(event_one.id, root)
+    draft = EventDraft.model_validate(event_details.model_dump())
+    draft.organizers.append(PublicUser.model_validate(ambassador.model_dump()))
+    event_svc_integration.update(root, draft)
+    updated = event_svc_integration.get_by_id(event_one.id, root)
+    assert updated.number_registered == event_details.number_registered - 1
+
+
+def test_update_organizer_keeps_concurrent_registrations(
+    test_engine: Engine, event_svc_integration: EventService, monkeypatch
+):
+    """Test that uncounting a promoted attendee keeps a registration committed meanwhile."""
+    event_details = event_svc_integration.get_by_id(event_one.id, root)
+    draft = EventDraft.model_validate(event_details.model_dump())
+    draft.organizers.append(PublicUser.model_validate(ambassador.model_dump()))
+
+    permission = event_svc_integration._permission
+    enforce = permission.enforce
+
+    def register_concurrently_then_enforce(*args):
+        monkeypatch.setattr(permission, "enforce", enforce)
+        with Session(test_engine) as other_session:
+            other_svc = EventService(other_session, PermissionService(other_session))
+            other_svc.register(root, root, event_details)
+        enforce(*args)
+
+    monkeypatch.setattr(permission, "enforce", register_concurrently_then_enforce)
+    event_svc_integration.update(root, draft)
+
+    updated = event_svc_integration.get_by_id(event_one.id, root)
+    assert updated.number_registered == event_details.number_registered
+
+
+def test_unregister_twice_uncounts_registration_once(
+    event_svc_integration: EventService, monkeypatch
+):
+    """Test that a second, concurrent unregister of the same registration does not uncount it again."""
+    event_details = event_svc_integration.get_by_id(event_one.id, root)
+    registration = event_svc_integration.get_registration(
+        ambassador, ambassador, event_details
+    )
+    event_svc_integration.unregister(ambassador, ambassador, event_details)
+
+    # The second unregister found the registration before the first deleted it.
+    monkeypatch.setattr(
+        event_svc_integration, "get_registration", lambda *args: registration
+    )
+    event_svc_integration.unregister(ambassador, ambassador, event_details)
+
+    unregistered = event_svc_integration.get_by_id(event_one.id, root)
+    assert unregistered.number_registered == event_details.number_registered - 1
+
+
+def test_export_registrations_as_organizer(event_svc_integration: EventService):
+    """Test that an organizer can export the registrations of their event."""
+    rows = list(event_svc_integration.export_registrations(user, event_one.id))
+    assert [(row.onyen, row.registration_type) for row in rows] == [
+        (user.onyen, RegistrationType.ORGANIZER.name),
+        (ambassador.onyen, RegistrationType.ATTENDEE.name),
+    ]
+
+
+def test_export_registrations_as_admin(event_svc_integration: EventService):
+    """Test that an administrator can export the registrations of any event."""
+    rows = list(event_svc_integration.export_registrations(root, event_one.id))
+    assert len(rows) == 2
+
+
+def test_export_registrations_enforces_permission_when_called(
+    event_svc_integration: EventService,
+):
+    """Test that permission is checked before any registration is read."""
+    with pytest.raises(UserPermissionException):
+        event_svc_integration.export_registrations(ambassador, event_one.id)
+
+
+def test_export_registrations_of_missing_event(event_svc_integration: EventService):
+    with pytest.raises(ResourceNotFoundException):
+        event_svc_integration.export_registrations(root, 404)
+
+
+def test_export_registrations_in_batches(
+    session: Session, event_svc_integration: EventService
+):
+    """Test that exports larger than a batch include every registration in order."""
+    count = EXPORT_BATCH_SIZE * 2 + 1
+    attendees = [
+        UserEntity(
+            pid=900000000 + i,
+            onyen=f"export{i:05}",
+            email=f"export{i}@unc.edu",
+            first_name="Export",
+            last_name=f"{i:05}",
+        )
+        for i in range(count)
+    ]
+    session.add_all(attendees)
+    session.flush()
+    session.add_all(
+        EventRegistrationEntity(
+            event_id=event_two.id,
+            user_id=attendee.id,
+            registration_type=RegistrationType.ATTENDEE,
+        )
+        for attendee in attendees
+    )
+    session.commit()
+
+    rows = event_svc_integration.export_registrations(root, event_two.id)
+    onyens = [row.onyen for row in rows]
+    assert onyens == sorted(onyens)
+    assert len(onyens) == count
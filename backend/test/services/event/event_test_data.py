@@ -272,6 +272,8 @@ def insert_fake_data(session: Session):
     for registration in registrations:
         registration_entity = EventRegistrationEntity.from_new_model(registration)
         session.add(registration_entity)
+    session.flush()
+    session.execute(EventRegistrationEntity.recount_registrations())
 
     # Reset table IDs to prevent ID conflicts
     reset_table_id_seq(session, EventEntity, EventEntity.id, len(events) + 1)
@@ -0,0 +1,95 @@
+"""Tests that concurrent EventService#register calls never oversell an event."""
+
+from concurrent.futures import ThreadPoolExecutor
+
+from sqlalchemy import Engine, create_engine, func, select
+from sqlalchemy.orm import Session
+
+from ....entities import EventEntity, EventRegistrationEntity, UserEntity
+from ....models import EventOverview, RegistrationType, User
+from ....services import EventService, PermissionService
+from ....services.exceptions import EventRegistrationException
+
+# Explicitly import Data Fixture to load entities in database
+from ..core_data import setup_insert_data_fixture
+
+# Data Models for Fake Data Inserted in Setup
+from ..organization import organization_test_data
+from .event_test_data import event_one
+
+__authors__ = ["Kris Jordan"]
+__copyright__ = "Copyright 2024"
+__license__ = "MIT"
+
+REGISTRATIONS = 500
+WORKERS = 20
+REGISTRATION_LIMIT = 100
+
+
+def _insert_attendees(session: Session) -> list[User]:
+    entities = [
+        UserEntity(
+            pid=800000000 + i,
+            onyen=f"attendee{i}",
+            email=f"attendee{i}@unc.edu",
+            first_name="Attendee",
+            last_name=str(i),
+        )
+        for i in range(REGISTRATIONS)
+    ]
+    session.add_all(entities)
+    session.commit()
+    return [entity.to_model() for entity in entities]
+
+
+def _insert_event(session: Session) -> EventOverview:
+    entity = EventEntity.from_draft_model(event_one, organization_test_data.cssg.id)
+    entity.registration_limit = REGISTRATION_LIMIT
+    session.add(entity)
+    session.commit()
+    return entity.to_overview_model()
+
+
+def _register(engine: Engine, attendee: User, event: EventOverview) -> bool:
+    """Registers an attendee in its own session, as a separate request would.
+
+    Returns:
+        bool: Whether the registration succeeded.
+    """
+    with Session(engine) as session:
+        event_svc = EventService(session, PermissionService(session))
+        try:
+            event_svc.register(attendee, attendee, event)
+            return True
+        except EventRegistrationException:
+            return False
+
+
+def test_concurrent_registrations_do_not_oversell(
+    session: Session, test_engine: Engine
+):
+    attendees = _insert_attendees(session)
+    event = _insert_event(session)
+
+    engine = create_engine(test_engine.url, pool_size=WORKERS, max_overflow=0)
+    try:
+        with ThreadPoolExecutor(max_workers=WORKERS) as executor:
+            results = list(
+                executor.map(
+                    lambda attendee: _register(engine, attendee, event), attendees
+                )
+            )
+    finally:
+        engine.dispose()
+
+    assert sum(results) == REGISTRATION_LIMIT
+    registered = session.scalar(
+        select(func.count()).where(
+            EventRegistrationEntity.event_id == event.id,
+            EventRegistrationEntity.registration_type == RegistrationType.ATTENDEE,
+        )
+    )
+    assert registered == REGISTRATION_LIMIT
+    assert (
+        session.get_one(EventEntity, event.id).number_registered == REGISTRATION_LIMIT
+    )
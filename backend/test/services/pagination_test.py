@@ -0,0 +1,104 @@
+"""Tests for keyset (cursor) pagination of queries."""
+
+import pytest
+from sqlalchemy import select, update
+from sqlalchemy.orm import Session
+
+from ...entities import UserEntity
+from ...models import CursorPaginationParams
+from ...models.coworking import RoomState
+from ...services.exceptions import InvalidCursorException
+from ...services.pagination import (
+    SortKey,
+    decode_cursor,
+    encode_cursor,
+    paginate_by_cursor,
+    sort_key,
+)
+
+# Data Setup and Injected Service Fixtures
+from .core_data import setup_insert_data_fixture
+
+# Data Models for Fake Data Inserted in Setup
+from .user_data import users
+
+__authors__ = ["Kris Jordan"]
+__copyright__ = "Copyright 2024"
+__license__ = "MIT"
+
+
+def _paginate_all(session: Session, keys: list[SortKey], page_size: int) -> list[int]:
+    ids = []
+    params = CursorPaginationParams(order_by="test", page_size=page_size)
+    while True:
+        page = paginate_by_cursor(
+            session,
+            select(UserEntity),
+            keys,
+            params,
+            lambda entities: [entity.id for entity in entities],
+        )
+        ids += page.items
+        if page.next_cursor is None:
+            return ids
+        params = params.model_copy(update={"cursor": page.next_cursor})
+
+
+def test_encode_decode_cursor():
+    keys = [(UserEntity.last_name, True), (UserEntity.id, True)]
+    cursor = encode_cursor("last_name", ["Student", 3])
+    assert decode_cursor(cursor, "last_name", keys) == ["Student", 3]
+
+
+def test_decode_cursor_rejects_other_ordering():
+    keys = [(UserEntity.id, True)]
+    with pytest.raises(InvalidCursorException):
+        decode_cursor(encode_cursor("", [3]), "last_name", keys)
+
+
+def test_decode_cursor_rejects_malformed_cursor():
+    keys = [(UserEntity.id, True)]
+    for cursor in ["not a cursor", encode_cursor("", []), "e30="]:
+        with pytest.raises(InvalidCursorException):
+            decode_cursor(cursor, "", keys)
+
+
+def test_sort_key():
+    columns = {"last_name": UserEntity.last_name}
+    assert sort_key(columns, "last_name", False) == (UserEntity.last_name, False)
+    for order_by in ["first_name", "roles", "to_model", "__class__"]:
+        with pytest.raises(InvalidCursorException):
+            sort_key(columns, order_by)
+
+
+def test_encode_cursor_of_enum():
+    assert encode_cursor("", [RoomState.RESERVED]) == encode_cursor(
+        "", [RoomState.RESERVED.value]
+    )
+
+
+def test_paginate_by_unique_key(session: Session):
+    ids = _paginate_all(session, [(UserEntity.id, False)], page_size=3)
+    assert ids == sorted((user.id for user in users), reverse=True)
+
+
+def test_paginate_by_nullable_key_in_mixed_directions(session: Session):
+    """Nulls are ordered last and rows tied on the first key are ordered by the second."""
+    avatars = {users[0].id: "b", users[1].id: "a", users[2].id: "b"}
+    for id, avatar in avatars.items():
+        session.execute(
+            update(UserEntity).where(UserEntity.id == id).values(github_avatar=avatar)
+        )
+    session.commit()
+
+    ids = _paginate_all(
+        session,
+        [(UserEntity.github_avatar, False), (UserEntity.id, True)],
+        page_size=2,
+    )
+
+    expected = sorted(
+        (user.id for user in users),
+        key=lambda id: (id not in avatars, -ord(avatars.get(id, "a")), id),
+    )
+    assert ids == expected
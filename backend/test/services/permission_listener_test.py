@@ -0,0 +1,83 @@
+"""Tests for the background PermissionCacheListener."""
+
+from datetime import timedelta
+from time import monotonic, sleep
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+
+from ...services import PermissionService
+from ...services.permission import PERMISSIONS_CHANGED_CHANNEL, permission_matchers
+from ...services.permission_listener import PermissionCacheListener
+
+# Data Setup and Injected Service Fixtures
+from .core_data import setup_insert_data_fixture
+from .fixtures import permission_svc
+
+# Data Models for Fake Data Inserted in Setup
+from .user_data import leader, root
+
+__authors__ = ["Kris Jordan"]
+__copyright__ = "Copyright 2024"
+__license__ = "MIT"
+
+TIMEOUT = timedelta(seconds=5)
+
+
+def _notify(session: Session, payload: str) -> None:
+    """Publishes a permission change as another process would."""
+    session.execute(select(func.pg_notify(PERMISSIONS_CHANGED_CHANNEL, payload)))
+    session.commit()
+
+
+def _wait_until_evicted(user_id: int) -> bool:
+    deadline = monotonic() + TIMEOUT.total_seconds()
+    while monotonic() < deadline:
+        if permission_matchers.get(user_id) is None:
+            return True
+        sleep(0.01)
+    return False
+
+
+def test_notification_invalidates_user(
+    session: Session, permission_svc: PermissionService
+):
+    permission_svc.check(leader, "organization.update", "organization/cssg")
+    permission_svc.check(root, "user.delete", "user/1")
+    listener = PermissionCacheListener(
+        session.get_bind(), poll_interval=timedelta(milliseconds=50)
+    )
+    listener.start()
+    try:
+        assert listener.wait_until_listening(TIMEOUT)
+        _notify(session, str(leader.id))
+        assert _wait_until_evicted(leader.id)
+        assert permission_matchers.get(root.id) is not None
+    finally:
+        listener.stop()
+
+
+def test_notification_invalidates_all_users(
+    session: Session, permission_svc: PermissionService
+):
+    listener = PermissionCacheListener(
+        session.get_bind(), poll_interval=timedelta(milliseconds=50)
+    )
+    listener.start()
+    try:
+        assert listener.wait_until_listening(TIMEOUT)
+        permission_svc.check(leader, "organization.update", "organization/cssg")
+        permission_svc.check(root, "user.delete", "user/1")
+        _notify(session, "")
+        assert _wait_until_evicted(leader.id)
+        assert _wait_until_evicted(root.id)
+    finally:
+        listener.stop()
+
+
+def test_start_stop(session: Session):
+    listener = PermissionCacheListener(
+        session.get_bind(), poll_interval=timedelta(milliseconds=50)
+    )
+    listener.start()
+    assert listener.wait_until_listening(TIMEOUT)
+    listener.stop()
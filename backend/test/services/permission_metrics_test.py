@@ -0,0 +1,93 @@
+"""Tests for the instrumentation of the PermissionService."""
+
+import pytest
+
+from ...services import PermissionService
+from ...services.exceptions import UserPermissionException
+from ...services.permission_metrics import (
+    RequestPermissionMetrics,
+    RoutePermissionMetrics,
+    measure_request,
+    route_permission_metrics,
+)
+
+# Data Setup and Injected Service Fixtures
+from .core_data import setup_insert_data_fixture
+from .fixtures import permission_svc
+
+# Data Models for Fake Data Inserted in Setup
+from .user_data import ambassador, root, user
+
+__authors__ = ["Kris Jordan"]
+__copyright__ = "Copyright 2024"
+__license__ = "MIT"
+
+
+def test_measure_request_counts_checks_and_queries(permission_svc: PermissionService):
+    with measure_request() as metrics:
+        permission_svc.check(ambassador, "checkin.create", "checkin")
+        permission_svc.check(ambassador, "checkin.delete", "checkin")
+        permission_svc.check_many(ambassador, "user.get", ["user/1", "user/2"])
+    assert metrics.checks == 4
+    assert metrics.queries == 1
+    assert metrics.matching_seconds > 0
+
+
+def test_measure_request_counts_enforce(permission_svc: PermissionService):
+    with measure_request() as metrics:
+        with pytest.raises(UserPermissionException):
+            permission_svc.enforce(user, "checkin.create", "checkin")
+    assert metrics.checks == 1
+
+
+def test_measure_request_counts_only_its_own_work(permission_svc: PermissionService):
+    permission_svc.check(root, "checkin.create", "checkin")
+    with measure_request() as metrics:
+        permission_svc.check(root, "checkin.create", "checkin")
+    assert metrics.checks == 1
+    assert metrics.queries == 0
+
+
+def test_unmeasured_checks_are_not_recorded(permission_svc: PermissionService):
+    with measure_request() as metrics:
+        ...
+    permission_svc.check(root, "checkin.create", "checkin")
+    assert metrics.checks == 0
+
+
+def test_route_permission_metrics():
+    metrics = RoutePermissionMetrics()
+    light = RequestPermissionMetrics()
+    light.checks = 1
+    heavy = RequestPermissionMetrics()
+    heavy.checks, heavy.queries, heavy.matching_seconds = 8, 2, 0.001
+    metrics.record("GET /api/light", light)
+    metrics.record("GET /api/heavy", heavy)
+    metrics.record("GET /api/heavy", light)
+
+    heavy_totals, light_totals = metrics.snapshot()
+    assert heavy_totals.route == "GET /api/heavy"
+    assert heavy_totals.requests == 2
+    assert heavy_totals.checks == 9
+    assert heavy_totals.queries == 2
+    assert heavy_totals.matching_ms == pytest.approx(1.0)
+    assert heavy_totals.checks_per_request == 4.5
+    assert heavy_totals.queries_per_request == 1.0
+    assert light_totals.route == "GET /api/light"
+
+    metrics.clear()
+    assert metrics.snapshot() == []
+
+
+def test_get_metrics(permission_svc: PermissionService):
+    route_permission_metrics.clear()
+    route_permission_metrics.record("GET /api/events", RequestPermissionMetrics())
+    assert [totals.route for totals in permission_svc.get_metrics(root)] == [
+        "GET /api/events"
+    ]
+    route_permission_metrics.clear()
+
+
+def test_get_metrics_enforces_permission(permission_svc: PermissionService):
+    with pytest.raises(UserPermissionException):
+        permission_svc.get_metrics(ambassador)
@@ -1,10 +1,22 @@
 """Tests for the PermissionService class."""
 
 import pytest
+import re
+from random import Random
+from sqlalchemy import select
+from sqlalchemy.orm import Session
 
 # Tested Dependencies
+from ...entities import (
+    PermissionEntity,
+    RoleEntity,
+    UserEntity,
+    UserEffectivePermissionEntity,
+)
 from ...models import Permission, User
-from ...services import PermissionService
+from ...services import PermissionService, UserPermissionException
+from ...services.permission import permission_matchers
+from ...services.permission_matcher import GlobTrie, PermissionMatcher
 
 # Data Setup and Injected Service Fixtures
 from .core_data import setup_insert_data_fixture
@@ -14,6 +26,7 @@ from .fixtures import permission_svc
 from .role_data import ambassador_role, acm_leader_role, cssg_leader_role, root_role
 from .user_data import root, ambassador, user, leader, president, student
 from .permission_data import ambassador_permission
+from .query_counter import count_queries
 
 __authors__ = ["Kris Jordan"]
 __copyright__ = "Copyright 2023"
@@ -136,48 +149,320 @@ def test_root_resource_access(permission_svc: PermissionService):
     assert permission_svc.check(root, "user.delete", "user/1")
 
 
-def test_check_catch_all_permission(permission_svc: PermissionService):
+def test_check_catch_all_permission():
     """Tests that you can create a user with all permissions"""
     p = Permission(action="*", resource="*")
-    assert permission_svc._check_permission(p, "permission.grant", "*")
-    assert permission_svc._check_permission(p, "permission.grant", "checkin")
-    assert permission_svc._check_permission(p, "permission.revoke", "checkin.*")
-    assert permission_svc._check_permission(p, "checkin.delete", "checkin/1")
+    assert PermissionMatcher([p]).check("permission.grant", "*")
+    assert PermissionMatcher([p]).check("permission.grant", "checkin")
+    assert PermissionMatcher([p]).check("permission.revoke", "checkin.*")
+    assert PermissionMatcher([p]).check("checkin.delete", "checkin/1")
 
 
-def test_check_catch_all_resource_permission(permission_svc: PermissionService):
+def test_check_catch_all_resource_permission():
     """Tests that that all resource permissions can be given to a user using *"""
     p = Permission(action="permission.grant", resource="*")
-    assert permission_svc._check_permission(p, "permission.grant", "*")
-    assert permission_svc._check_permission(p, "permission.grant", "checkin")
-    assert (
-        permission_svc._check_permission(p, "permission.revoke", "checkin.*") is False
-    )
-    assert permission_svc._check_permission(p, "checkin.delete", "checkin/1") is False
+    assert PermissionMatcher([p]).check("permission.grant", "*")
+    assert PermissionMatcher([p]).check("permission.grant", "checkin")
+    assert PermissionMatcher([p]).check("permission.revoke", "checkin.*") is False
+    assert PermissionMatcher([p]).check("checkin.delete", "checkin/1") is False
 
 
-def test_check_specific_resource_permission(permission_svc: PermissionService):
+def test_check_specific_resource_permission():
     """Tests giving a specific resource permission to a user"""
     p = Permission(action="permission.grant", resource="checkin*")
-    assert permission_svc._check_permission(p, "permission.grant", "*") is False
-    assert permission_svc._check_permission(p, "permission.grant", "checkin")
-    assert (
-        permission_svc._check_permission(p, "permission.revoke", "checkin.*") is False
-    )
-    assert permission_svc._check_permission(p, "checkin.delete", "checkin/1") is False
+    assert PermissionMatcher([p]).check("permission.grant", "*") is False
+    assert PermissionMatcher([p]).check("permission.grant", "checkin")
+    assert PermissionMatcher([p]).check("permission.revoke", "checkin.*") is False
+    assert PermissionMatcher([p]).check("checkin.delete", "checkin/1") is False
 
 
-def test_check_specific_permission(permission_svc: PermissionService):
+def test_check_specific_permission():
     """Tests that you can create a user with a specific permission"""
     p = Permission(action="checkin.delete", resource="checkin/*")
-    assert permission_svc._check_permission(p, "checkin.delete", "checkin/1")
-    assert permission_svc._check_permission(p, "checkin.delete", "checkin/12")
-    assert permission_svc._check_permission(p, "checkin.create", "checkin/12") is False
-    assert (
-        permission_svc._check_permission(p, "permission.revoke", "checkin.*") is False
-    )
+    assert PermissionMatcher([p]).check("checkin.delete", "checkin/1")
+    assert PermissionMatcher([p]).check("checkin.delete", "checkin/12")
+    assert PermissionMatcher([p]).check("checkin.create", "checkin/12") is False
+    assert PermissionMatcher([p]).check("permission.revoke", "checkin.*") is False
 
 
 def test_get_user_roles_permissions(permission_svc: PermissionService):
     """Test covers an edge case of _get_user_roles_permissions when user does not exist"""
     assert permission_svc._get_user_roles_permissions(User(id=423)) == []
+
+
+def test_check_loads_permissions_once(
+    session: Session, permission_svc: PermissionService
+):
+    """Tests that repeated checks for a subject are answered with a single query"""
+    with count_queries(session) as counter:
+        for i in range(20):
+            permission_svc.check(leader, "organization.update", "organization/cssg")
+            permission_svc.check(leader, "organization.update", f"organization/{i}")
+            permission_svc.check(ambassador, "coworking.reservation.read", f"user/{i}")
+    assert counter.count == 2
+
+
+def test_check_after_role_membership_invalidated(
+    session: Session, permission_svc: PermissionService
+):
+    """Tests that invalidating a subject reloads their role permissions"""
+    assert permission_svc.check(user, "checkin.create", "checkin") is False
+    role = session.get(RoleEntity, ambassador_role.id)
+    role.users.append(session.get(UserEntity, user.id))
+    session.commit()
+    assert permission_svc.check(user, "checkin.create", "checkin") is False
+    permission_svc.invalidate(user.id)
+    assert permission_svc.check(user, "checkin.create", "checkin")
+
+
+def test_matcher_exact_permission():
+    matcher = PermissionMatcher(
+        [Permission(action="checkin.delete", resource="checkin/1")]
+    )
+    assert matcher.check("checkin.delete", "checkin/1")
+    assert matcher.check("checkin.delete", "checkin/12") is False
+    assert matcher.check("checkin.deleted", "checkin/1") is False
+
+
+def test_matcher_prefix_permissions():
+    matcher = PermissionMatcher(
+        [
+            Permission(action="coworking.*", resource="checkin/*"),
+            Permission(action="organization.update", resource="organization/*"),
+        ]
+    )
+    assert matcher.check("coworking.reservation.read", "checkin/1")
+    assert matcher.check("coworking.", "checkin/")
+    assert matcher.check("coworking", "checkin/1") is False
+    assert matcher.check("organization.update", "organization/cssg")
+    assert matcher.check("organization.update", "user/1") is False
+
+
+def test_matcher_inner_wildcard_permission():
+    matcher = PermissionMatcher(
+        [Permission(action="*.delete", resource="organization/*/event/*")]
+    )
+    assert matcher.check("checkin.delete", "organization/cssg/event/1")
+    assert matcher.check("checkin.delete", "organization/cssg/1") is False
+    assert matcher.check("checkin.update", "organization/cssg/event/1") is False
+
+
+def test_matcher_treats_pattern_characters_literally():
+    matcher = PermissionMatcher([Permission(action="user.get", resource="user/1")])
+    assert matcher.check("user.get", "user/1")
+    assert matcher.check("userxget", "user/1") is False
+
+
+def test_matcher_dot_matches_only_dot():
+    """Regression: `.` in a pattern is literal, where the regexes the matcher replaced matched any character"""
+    matcher = PermissionMatcher([Permission(action="a.b", resource="a.b")])
+    assert matcher.check("a.b", "a.b")
+    assert matcher.check("axb", "a.b") is False
+    assert matcher.check("a.b", "axb") is False
+
+
+def test_check_shares_permissions_across_services(
+    session: Session, permission_svc: PermissionService
+):
+    """Tests that a later request's checks are answered from the process-wide cache"""
+    permission_svc.check(leader, "organization.update", "organization/cssg")
+    with count_queries(session) as counter:
+        other_svc = PermissionService(session)
+        assert other_svc.check(leader, "organization.update", "organization/cssg")
+        assert other_svc.check(leader, "organization.update", "user/1") is False
+    assert counter.count == 0
+
+
+def test_grant_invalidates_shared_permissions(
+    session: Session, permission_svc: PermissionService
+):
+    """Tests that a grant is seen by later requests"""
+    assert (
+        PermissionService(session).check(ambassador, "checkin.delete", "checkin")
+        is False
+    )
+    p = Permission(action="checkin.delete", resource="*")
+    permission_svc.grant(root, ambassador_role, p)
+    assert PermissionService(session).check(ambassador, "checkin.delete", "checkin")
+
+
+def test_revoke_invalidates_shared_permissions(
+    session: Session, permission_svc: PermissionService
+):
+    """Tests that a revocation is seen by later requests"""
+    assert PermissionService(session).check(ambassador, "checkin.create", "checkin")
+    permission_svc.revoke(root, ambassador_permission[0])
+    assert (
+        PermissionService(session).check(ambassador, "checkin.create", "checkin")
+        is False
+    )
+
+
+def test_get_cache_stats(permission_svc: PermissionService):
+    permission_svc.check(leader, "organization.update", "organization/cssg")
+    stats = permission_svc.get_cache_stats(root)
+    assert stats.name == "permission.matchers"
+    assert stats.size == 2
+    assert permission_matchers.get(leader.id) is not None
+
+
+def test_get_cache_stats_unauthorized(permission_svc: PermissionService):
+    with pytest.raises(UserPermissionException):
+        permission_svc.get_cache_stats(user)
+
+
+def test_glob_trie_matches_every_pattern():
+    trie = GlobTrie()
+    for pattern in ["*", "a*", "*a", "a**b", "*a*a*", "ab", ""]:
+        trie.setdefault(pattern, pattern)
+    assert set(trie.matches("ab")) == {"*", "a*", "a**b", "ab"}
+    assert set(trie.matches("aa")) == {"*", "a*", "*a", "*a*a*"}
+    assert set(trie.matches("")) == {"*", ""}
+    assert set(trie.matches("b")) == {"*"}
+
+
+def test_glob_trie_setdefault_keeps_first_value():
+    trie = GlobTrie()
+    assert trie.setdefault("user/*", 1) == 1
+    assert trie.setdefault("user/*", 2) == 1
+    assert trie.setdefault("user/**", 3) == 1
+
+
+def test_matcher_agrees_with_regex_over_many_grants():
+    """Tests the compiled matcher against matching each permission with a regex"""
+    rng = Random(0)
+    parts = ["organization", "event", "user", "*", "a", "1"]
+    pattern = lambda: "".join(rng.choice(parts) for _ in range(rng.randint(1, 4)))
+    permissions = [Permission(action=pattern(), resource=pattern()) for _ in range(300)]
+    expand = lambda p: re.compile(".*".join(re.escape(s) for s in p.split("*")))
+    compiled = [(expand(p.action), expand(p.resource)) for p in permissions]
+    matcher = PermissionMatcher(permissions)
+    for _ in range(500):
+        action = pattern().replace("*", "x")
+        resource = pattern().replace("*", "/")
+        expected = any(
+            a.fullmatch(action) and r.fullmatch(resource) for a, r in compiled
+        )
+        assert matcher.check(action, resource) == expected
+
+
+def test_check_many(session: Session, permission_svc: PermissionService):
+    """Tests that a batch of resources is checked against a single permission load"""
+    resources = ["organization/cssg", "organization/acm", "organization/cssg", ""]
+    with count_queries(session) as counter:
+        assert permission_svc.check_many(leader, "organization.update", resources) == [
+            True,
+            False,
+            True,
+            False,
+        ]
+    assert counter.count == 1
+
+
+def test_check_many_agrees_with_check(permission_svc: PermissionService):
+    resources = [f"user/{i}" for i in range(5)] + ["checkin", "checkin/1"]
+    for subject in [root, ambassador, user]:
+        for action in ["checkin.create", "coworking.reservation.read"]:
+            assert permission_svc.check_many(subject, action, resources) == [
+                permission_svc.check(subject, action, resource)
+                for resource in resources
+            ]
+
+
+def test_filter_permitted(permission_svc: PermissionService):
+    organizations = ["cssg", "acm", "cads"]
+    assert permission_svc.filter_permitted(
+        leader,
+        "organization.update",
+        organizations,
+        lambda slug: f"organization/{slug}",
+    ) == ["cssg"]
+    assert (
+        permission_svc.filter_permitted(
+            user, "organization.update", organizations, lambda slug: slug
+        )
+        == []
+    )
+
+
+def _effective_permission_ids(session: Session, subject: User) -> set[int]:
+    return set(
+        session.scalars(
+            select(UserEffectivePermissionEntity.permission_id).where(
+                UserEffectivePermissionEntity.user_id == subject.id
+            )
+        )
+    )
+
+
+def test_effective_permissions_follow_grants(
+    session: Session, permission_svc: PermissionService
+):
+    """Tests that user and role grants and revocations maintain effective permissions"""
+    p = Permission(action="checkin.delete", resource="*")
+    permission_svc.grant(root, ambassador_role, p)
+    permission_svc.grant(root, user, p)
+    granted = session.scalars(
+        select(PermissionEntity.id).where(PermissionEntity.action == "checkin.delete")
+    ).all()
+    assert len(granted) == 2
+    assert granted[0] in _effective_permission_ids(session, ambassador)
+    assert granted[1] in _effective_permission_ids(session, user)
+    for permission_id in granted:
+        permission_svc.revoke(
+            root, Permission(id=permission_id, action="", resource="")
+        )
+    assert not set(granted) & _effective_permission_ids(session, ambassador)
+    assert not set(granted) & _effective_permission_ids(session, user)
+
+
+def test_effective_permissions_follow_role_membership(
+    session: Session, permission_svc: PermissionService
+):
+    """Tests that joining and leaving a role maintain effective permissions"""
+    ambassador_ids = {permission.id for permission in ambassador_permission}
+    role = session.get(RoleEntity, ambassador_role.id)
+    role.users.append(session.get(UserEntity, user.id))
+    session.commit()
+    assert ambassador_ids <= _effective_permission_ids(session, user)
+    role.users.remove(session.get(UserEntity, user.id))
+    session.commit()
+    assert not ambassador_ids & _effective_permission_ids(session, user)
+
+
+def test_get_permitted_users(permission_svc: PermissionService):
+    """Tests that the holders of a permission are found in SQL"""
+    users = permission_svc.get_permitted_users(
+        root, "organization.update", "organization/cssg"
+    )
+    assert {u.id for u in users} == {root.id, leader.id}
+    users = permission_svc.get_permitted_users(root, "checkin.create", "checkin")
+    assert {u.id for u in users} == {root.id, ambassador.id}
+
+
+def test_get_permitted_users_matches_literally(permission_svc: PermissionService):
+    """Tests that LIKE wildcards in patterns are matched as literal characters"""
+    permission_svc.grant(root, user, Permission(action="user.get", resource="a_b%"))
+    holders = lambda resource: {
+        u.id for u in permission_svc.get_permitted_users(root, "user.get", resource)
+    }
+    assert user.id in holders("a_b%")
+    assert user.id not in holders("axbyz")
+
+
+def test_get_permitted_users_matches_wildcards(permission_svc: PermissionService):
+    """Tests that patterns are found by the prefix of the resource before their first wildcard"""
+    permission_svc.grant(
+        root, user, Permission(action="user.*", resource="organization/*/events")
+    )
+    holders = lambda resource: {
+        u.id for u in permission_svc.get_permitted_users(root, "user.get", resource)
+    }
+    assert {root.id, user.id} <= holders("organization/acm/events")
+    assert user.id not in holders("organization/acm")
+    assert user.id not in holders("org/acm/events")
+
+
+def test_get_permitted_users_enforces_permission(permission_svc: PermissionService):
+    with pytest.raises(UserPermissionException):
+        permission_svc.get_permitted_users(user, "user.get", "user/1")
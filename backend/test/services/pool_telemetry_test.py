@@ -0,0 +1,102 @@
+"""Tests for the connection pool's configuration and telemetry."""
+
+import pytest
+from sqlalchemy import Engine, create_engine, text
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+
+from ...database import _pool_options
+from ...pool_telemetry import InstrumentedQueuePool
+
+__authors__ = ["Kris Jordan"]
+__copyright__ = "Copyright 2024"
+__license__ = "MIT"
+
+
+@pytest.fixture()
+def pool_engine(test_engine: Engine):
+    engine = create_engine(
+        test_engine.url,
+        poolclass=InstrumentedQueuePool,
+        pool_size=1,
+        max_overflow=0,
+        pool_timeout=0.05,
+    )
+    yield engine
+    engine.dispose()
+
+
+def test_pool_options_default_to_sqlalchemy_defaults(monkeypatch):
+    for variable in [
+        "POSTGRES_POOL_SIZE",
+        "POSTGRES_MAX_OVERFLOW",
+        "POSTGRES_POOL_TIMEOUT",
+        "POSTGRES_POOL_RECYCLE",
+        "POSTGRES_POOL_PRE_PING",
+        "POSTGRES_STATEMENT_TIMEOUT",
+    ]:
+        monkeypatch.delenv(variable, raising=False)
+    options = _pool_options()
+    assert options["pool_size"] == 5
+    assert options["max_overflow"] == 10
+    assert options["pool_timeout"] == 30
+    assert options["pool_recycle"] == -1
+    assert options["pool_pre_ping"] is False
+    assert "connect_args" not in options
+
+
+def test_pool_options_from_environment(monkeypatch, test_engine: Engine):
+    monkeypatch.setenv("POSTGRES_POOL_SIZE", "20")
+    monkeypatch.setenv("POSTGRES_MAX_OVERFLOW", "0")
+    monkeypatch.setenv("POSTGRES_POOL_PRE_PING", "true")
+    monkeypatch.setenv("POSTGRES_STATEMENT_TIMEOUT", "1500")
+    options = _pool_options()
+    assert options["pool_size"] == 20
+    assert options["max_overflow"] == 0
+    assert options["pool_pre_ping"] is True
+
+    engine = create_engine(test_engine.url, **options)
+    try:
+        with engine.connect() as connection:
+            assert connection.scalar(text("SHOW statement_timeout")) == "1500ms"
+    finally:
+        engine.dispose()
+
+
+def test_telemetry_counts_checkouts_and_connects(pool_engine: Engine):
+    for _ in range(3):
+        with pool_engine.connect() as connection:
+            connection.execute(text("SELECT 1"))
+
+    stats = pool_engine.pool.telemetry.snapshot(pool_engine.pool)
+    assert stats.checkouts == 3
+    assert stats.connects == 1
+    assert stats.timeouts == 0
+    assert stats.checked_out == 0
+    assert stats.checked_in == 1
+    assert stats.max_wait_ms >= stats.mean_wait_ms > 0
+
+
+def test_telemetry_counts_timeouts(pool_engine: Engine):
+    with pool_engine.connect():
+        with pytest.raises(PoolTimeoutError):
+            pool_engine.connect()
+        stats = pool_engine.pool.telemetry.snapshot(pool_engine.pool)
+
+    assert stats.checked_out == 1
+    assert stats.checkouts == 1
+    assert stats.timeouts == 1
+    assert stats.max_wait_ms >= 50
+
+
+def test_telemetry_survives_dispose(pool_engine: Engine):
+    telemetry = pool_engine.pool.telemetry
+    with pool_engine.connect():
+        pass
+    pool_engine.dispose()
+    with pool_engine.connect():
+        pass
+
+    assert pool_engine.pool.telemetry is telemetry
+    stats = telemetry.snapshot(pool_engine.pool)
+    assert stats.checkouts == 2
+    assert stats.connects == 2
@@ -0,0 +1,47 @@
+"""Helper for asserting on the number of SQL statements a block of code issues.
+
+Performance-sensitive service methods are expected to issue a constant number of
+queries regardless of how much data they process. This helper listens to the
+engine a session is bound to and counts the statements executed within a block."""
+
+from contextlib import contextmanager
+from typing import Iterator
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+__authors__ = ["Kris Jordan"]
+__copyright__ = "Copyright 2024"
+__license__ = "MIT"
+
+
+class QueryCounter:
+    """Tracks the SQL statements executed while a `count_queries` block is active."""
+
+    def __init__(self):
+        self.statements: list[str] = []
+
+    @property
+    def count(self) -> int:
+        return len(self.statements)
+
+
+@contextmanager
+def count_queries(session: Session) -> Iterator[QueryCounter]:
+    """Count the SQL statements issued through a session's engine within a block.
+
+    Args:
+        session (Session): The session whose bound engine should be observed.
+
+    Yields:
+        QueryCounter: Populated with each statement as it is executed."""
+    counter = QueryCounter()
+    engine = session.get_bind()
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, many):
+        counter.statements.append(statement)
+
+    event.listen(engine, "before_cursor_execute", before_cursor_execute)
+    try:
+        yield counter
+    finally:
+        event.remove(engine, "before_cursor_execute", before_cursor_execute)
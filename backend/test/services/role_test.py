@@ -116,3 +116,17 @@ def test_remove_member(role_svc: RoleService):
     assert role_svc.is_member(root, ambassador_role.id, ambassador.id)
     role_svc.remove_member(root, ambassador_role.id, ambassador.id)
     assert not role_svc.is_member(root, ambassador_role.id, ambassador.id)
+
+
+def test_add_member_invalidates_permissions(
+    role_svc: RoleService, permission_svc_mock: PermissionService
+):
+    role_svc.add_member(root, ambassador_role.id, user)
+    permission_svc_mock.invalidate.assert_called_with(user.id)
+
+
+def test_remove_member_invalidates_permissions(
+    role_svc: RoleService, permission_svc_mock: PermissionService
+):
+    role_svc.remove_member(root, ambassador_role.id, ambassador.id)
+    permission_svc_mock.invalidate.assert_called_with(ambassador.id)
@@ -0,0 +1,55 @@
+"""Tests for the criteria shared by the services' search and filter boxes."""
+
+import pytest
+from sqlalchemy import select, text
+from sqlalchemy.orm import Session
+
+from ...entities import TRIGRAM_INDEXED_COLUMNS, UserEntity
+from ...services.search import contains_text
+
+# Data Setup and Injected Service Fixtures
+from .core_data import setup_insert_data_fixture
+
+# Data Models for Fake Data Inserted in Setup
+from .user_data import ambassador, root, user
+
+__authors__ = ["Kris Jordan"]
+__copyright__ = "Copyright 2024"
+__license__ = "MIT"
+
+
+def _search(session: Session, query: str) -> set[str]:
+    statement = select(UserEntity.onyen).where(
+        contains_text(query, UserEntity.first_name, UserEntity.last_name)
+    )
+    return set(session.scalars(statement))
+
+
+def test_contains_text_matches_substrings_ignoring_case(session: Session):
+    assert _search(session, "AMBASS") == {ambassador.onyen}
+    assert _search(session, "oo") == {root.onyen}
+
+
+def test_contains_text_matches_any_column(session: Session):
+    assert {user.onyen, ambassador.onyen} <= _search(session, "s")
+    assert _search(session, "Sally") == {user.onyen}
+
+
+def test_contains_text_matches_wildcards_literally(session: Session):
+    assert _search(session, "%") == set()
+    assert _search(session, "_") == set()
+    assert _search(session, "\\") == set()
+
+
+def test_trigram_indexes(session: Session):
+    """Every searched column is indexed when the database server ships pg_trgm."""
+    available = session.execute(
+        text("SELECT 1 FROM pg_available_extensions WHERE name = 'pg_trgm'")
+    ).first()
+    if available is None:
+        pytest.skip("pg_trgm is not available on this database server")
+
+    indexes = set(session.scalars(text("SELECT indexname FROM pg_indexes")))
+    for table, columns in TRIGRAM_INDEXED_COLUMNS.items():
+        for column in columns:
+            assert f"{table}__{column}_trgm_idx" in indexes
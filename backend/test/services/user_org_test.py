@@ -161,6 +161,36 @@ def test_remove_member_from_cssg(
     )
 
 
+def test_remove_member_revokes_cached_permissions(
+    session, user_org_svc_integration: UserOrgService
+):
+    """Each request has its own PermissionService, sharing the process' compiled permissions."""
+    user_org_svc_integration.add_membership(root, student, organization_test_data.cssg)
+    assert PermissionService(session).check(
+        student, "organization.get_all_users", "organization/cssg"
+    )
+
+    user_org_svc_integration.remove_membership(
+        root, student, organization_test_data.cssg
+    )
+    assert not PermissionService(session).check(
+        student, "organization.get_all_users", "organization/cssg"
+    )
+
+
+def test_add_member_grants_over_cached_denial(
+    session, user_org_svc_integration: UserOrgService
+):
+    assert not PermissionService(session).check(
+        student, "organization.get_all_users", "organization/cssg"
+    )
+
+    user_org_svc_integration.add_membership(root, student, organization_test_data.cssg)
+    assert PermissionService(session).check(
+        student, "organization.get_all_users", "organization/cssg"
+    )
+
+
 def test_add_new_member_to_cssg(
     permission_svc: PermissionService, user_org_svc_integration: UserOrgService
 ):
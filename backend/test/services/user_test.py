@@ -1,12 +1,16 @@
 """Tests for the UserService class."""
 
 import pytest
+from sqlalchemy import update
+from sqlalchemy.orm import Session
 
 # Tested Dependencies
 from ...models.user import User, NewUser
-from ...models.pagination import PaginationParams
+from ...models.pagination import PaginationParams, CursorPaginationParams
+from ...entities import UserEntity
 from ...services import UserService, PermissionService
-from ...services.exceptions import ResourceNotFoundException
+from ...services.exceptions import ResourceNotFoundException, InvalidCursorException
+from ...services.user import authenticated_users
 
 # Data Setup and Injected Service Fixtures
 from .core_data import setup_insert_data_fixture
@@ -15,6 +19,7 @@ from .fixtures import user_svc, user_svc_integration, permission_svc_mock
 # Data Models for Fake Data Inserted in Setup
 from .user_data import root, ambassador, user
 from . import user_data
+from .query_counter import count_queries
 from .permission_data import (
     ambassador_checkin_create_permission,
     ambassador_coworking_reservation_permission,
@@ -45,6 +50,66 @@ def test_get_nonexistent(user_svc_integration: UserService):
     assert user_svc_integration.get(423) is None
 
 
+def test_get_authenticated(session: Session, user_svc: UserService):
+    """Test that an authenticated user is resolved with one query and then served from cache."""
+    with count_queries(session) as counter:
+        first = user_svc.get_authenticated(ambassador.pid)
+        second = user_svc.get_authenticated(ambassador.pid)
+    assert counter.count == 1
+    assert first == second == ambassador
+    assert authenticated_users.stats().hits == 1
+
+
+def test_get_authenticated_returns_copies(user_svc: UserService):
+    """Test that modifying a returned user does not modify the cached user."""
+    user_svc.get_authenticated(ambassador.pid).first_name = "Changed"
+    assert (
+        user_svc.get_authenticated(ambassador.pid).first_name == ambassador.first_name
+    )
+
+
+def test_get_authenticated_nonexistent_not_cached(user_svc: UserService):
+    """Test that an unregistered PID is not remembered once the user registers."""
+    new_user = NewUser(pid=123456789, onyen="new_user", email="new_user@unc.edu")
+    assert user_svc.get_authenticated(new_user.pid) is None
+    user_svc.create(new_user, new_user)
+    assert user_svc.get_authenticated(new_user.pid) is not None
+
+
+def test_get_authenticated_after_update(user_svc: UserService):
+    """Test that updating a user invalidates their cached authenticated user."""
+    user = user_svc.get_authenticated(ambassador.pid)
+    user.first_name = "Andy"
+    user_svc.update(ambassador, user)
+    assert user_svc.get_authenticated(ambassador.pid).first_name == "Andy"
+
+
+def test_get_authenticated_fresh(session: Session, user_svc: UserService):
+    """Test that a fresh authenticated user is loaded from the database and refreshes the cache."""
+    user_svc.get_authenticated(ambassador.pid)
+    session.execute(
+        update(UserEntity)
+        .where(UserEntity.pid == ambassador.pid)
+        .values(first_name="Andy")
+    )
+    assert (
+        user_svc.get_authenticated(ambassador.pid).first_name == ambassador.first_name
+    )
+    assert user_svc.get_authenticated(ambassador.pid, fresh=True).first_name == "Andy"
+    assert user_svc.get_authenticated(ambassador.pid).first_name == "Andy"
+
+
+def test_get_authenticated_cache_stats(
+    user_svc: UserService, permission_svc_mock: PermissionService
+):
+    user_svc.get_authenticated(ambassador.pid)
+    stats = user_svc.get_authenticated_cache_stats(root)
+    assert stats.name == "user.authenticated"
+    assert stats.misses == 1
+    assert stats.size == 1
+    permission_svc_mock.enforce.assert_called_with(root, "user.cache", "user/")
+
+
 def test_get_by_id(user_svc_integration: UserService):
     """Test that a user can be retrieved by their ID"""
     user = user_svc_integration.get_by_id(ambassador.id)  # type: ignore
@@ -295,3 +360,81 @@ def test_update_profile_then_accept_community_agreement(user_svc: UserService):
     assert updated_user.accepted_community_agreement == False
     updated_user.accepted_community_agreement = True
     assert updated_user.accepted_community_agreement == True
+
+
+def _list_all_by_cursor(
+    user_svc: UserService, params: CursorPaginationParams
+) -> list[User]:
+    users = []
+    while True:
+        page = user_svc.list_by_cursor(root, params)
+        users += page.items
+        if page.next_cursor is None:
+            return users
+        params = params.model_copy(update={"cursor": page.next_cursor})
+
+
+def test_list_by_cursor(user_svc: UserService):
+    """Test that paging through users by cursor visits each user once in order."""
+    first = user_svc.list_by_cursor(root, CursorPaginationParams(page_size=3))
+    assert first.length == len(user_data.users)
+    assert first.next_cursor is not None
+
+    users = _list_all_by_cursor(user_svc, CursorPaginationParams(page_size=3))
+    assert [user.id for user in users] == sorted(user.id for user in user_data.users)
+
+
+def test_list_by_cursor_order_by(user_svc: UserService):
+    """Test that paging by cursor follows the requested ordering, breaking ties by id."""
+    users = _list_all_by_cursor(
+        user_svc, CursorPaginationParams(order_by="last_name", page_size=2)
+    )
+    assert [(user.last_name, user.id) for user in users] == sorted(
+        (user.last_name, user.id) for user in user_data.users
+    )
+
+
+def test_list_by_cursor_filter(user_svc: UserService):
+    """Test that paging by cursor applies the filter to every page and the length."""
+    params = CursorPaginationParams(filter="student", page_size=1)
+    first = user_svc.list_by_cursor(root, params)
+    assert first.length == 2
+    users = _list_all_by_cursor(user_svc, params)
+    assert {user.onyen for user in users} == {"user", "stewie"}
+
+
+def test_list_by_cursor_later_pages_omit_length(user_svc: UserService):
+    first = user_svc.list_by_cursor(root, CursorPaginationParams(page_size=3))
+    second = user_svc.list_by_cursor(
+        root, CursorPaginationParams(cursor=first.next_cursor, page_size=3)
+    )
+    assert second.length is None
+
+
+def test_list_by_cursor_rejects_cursor_of_other_ordering(user_svc: UserService):
+    first = user_svc.list_by_cursor(root, CursorPaginationParams(page_size=3))
+    with pytest.raises(InvalidCursorException):
+        user_svc.list_by_cursor(
+            root,
+            CursorPaginationParams(
+                cursor=first.next_cursor, order_by="last_name", page_size=3
+            ),
+        )
+
+
+def test_list_by_cursor_rejects_malformed_cursor(user_svc: UserService):
+    with pytest.raises(InvalidCursorException):
+        user_svc.list_by_cursor(root, CursorPaginationParams(cursor="not a cursor"))
+
+
+def test_list_by_cursor_rejects_unsortable_order_by(user_svc: UserService):
+    for order_by in ["nonexistent", "roles", "to_model"]:
+        with pytest.raises(InvalidCursorException):
+            user_svc.list_by_cursor(root, CursorPaginationParams(order_by=order_by))
+
+
+def test_list_by_cursor_enforces_permission(
+    user_svc: UserService, permission_svc_mock: PermissionService
+):
+    user_svc.list_by_cursor(root, CursorPaginationParams())
+    permission_svc_mock.enforce.assert_called_with(root, "user.list", "user/")